@@ -1,5 +1,5 @@
 import streamlit as st
-from modules.auth.auth_utils import check_auth
+from modules.auth.auth_utils import check_auth, is_admin
 
 # App Configuration
 st.set_page_config(
@@ -19,6 +19,8 @@ def setup_sidebar():
             st.page_link("pages/2_ATS_Score.py", label="ATS Score", icon="🎯")
             st.page_link("pages/3_Resume_Builder.py", label="Resume Builder", icon="📝")
             st.page_link("pages/4_Past_Resumes.py", label="Past Resumes", icon="📚")
+            if is_admin():
+                st.page_link("pages/5_Performance.py", label="Performance", icon="⏱️")
             
             st.divider()
             
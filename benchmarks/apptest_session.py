@@ -0,0 +1,16 @@
+"""AppTest entry script used by the load test to run one app script per session.
+
+The load test stores the target script and the simulated identity in session
+state before the first run. The identity is copied into the script run
+context, which is where ``st.user`` reads from, so every simulated session
+can be a different logged-in user.
+"""
+import runpy
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+identity = st.session_state.get("_loadtest_user")
+if identity:
+    get_script_run_ctx().user_info.update(identity)
+
+runpy.run_path(st.session_state["_loadtest_script"], run_name="__main__")
@@ -0,0 +1,721 @@
+"""In-process stand-ins for Supabase (PostgREST + Storage) and the OpenAI API.
+
+``FakeServices`` starts one threaded HTTP server on localhost that speaks just
+enough of each protocol for ``DatabaseClient`` and the OpenAI SDK:
+
+* ``/rest/v1/<table>``  select / insert / upsert / update / delete with
+  ``eq``, ``neq``, ``in``, ``is``, ``gt``, ``gte``, ``lt``, ``lte`` filters,
+  ``order`` and ``limit``, and single-object responses
+* ``/rest/v1/rpc/<function>``  the database functions in
+  ``modules.database.config.FUNCTIONS``
+* ``/storage/v1/object/<bucket>/<path>``  upload (raw or multipart) and download
+* ``/v1/chat/completions``  replays recorded responses after a configurable delay
+
+``FakeRedis`` is a separate TCP server speaking enough of the Redis protocol
+(PING, AUTH, SELECT, GET, SET with EX/PX, DEL, DBSIZE, FLUSHDB) for the shared
+cache's ``RedisBackend``.
+
+Nothing here is meant to be a faithful PostgREST implementation; it exists so
+benchmarks and load tests can exercise the real client code paths offline.
+"""
+import base64
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+from urllib.parse import parse_qsl, unquote, urlparse
+
+from modules.utils.job_descriptions import job_description_hash
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# create_client() only accepts keys shaped like a JWT
+FAKE_SUPABASE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.benchmark"
+FAKE_OPENAI_KEY = "sk-benchmark"
+
+# Shared cache backends FakeServices can point the app at
+CACHE_BACKENDS = ("none", "memory", "sqlite", "redis")
+
+# 1x1 PNG used as every seeded user's stored avatar thumbnail
+TINY_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR4nGPwd3v6HwAE3AJ6zM4FjgAAAABJRU5ErkJggg=="
+)
+
+def load_fixture(name):
+    """Read a fixture file, parsing JSON fixtures."""
+    path = os.path.join(FIXTURES_DIR, name)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f) if name.endswith(".json") else f.read()
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+class FakeDatabase:
+    """Thread-safe in-memory tables and storage buckets."""
+
+    def __init__(self):
+        self.tables = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def seed(self, table, rows):
+        with self.lock:
+            for row in rows:
+                self._insert_row(table, dict(row))
+
+    def _insert_row(self, table, row):
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", _now())
+        row.setdefault("updated_at", row["created_at"])
+        self.tables.setdefault(table, []).append(row)
+        return row
+
+    # PostgREST filters -------------------------------------------------
+
+    @staticmethod
+    def _matches(row, filters):
+        for column, expression in filters:
+            negate = expression.startswith("not.")
+            if negate:
+                expression = expression[4:]
+            operator, _, operand = expression.partition(".")
+            value = row.get(column)
+            if operator == "eq":
+                result = value is not None and str(value) == operand
+            elif operator == "neq":
+                result = value is None or str(value) != operand
+            elif operator == "in":
+                options = [option.strip().strip('"') for option in operand.strip("()").split(",")]
+                result = value is not None and str(value) in options
+            elif operator == "is":
+                result = value is None if operand == "null" else str(value).lower() == operand
+            elif operator in ("gt", "gte", "lt", "lte"):
+                if value is None:
+                    result = False
+                else:
+                    left, right = str(value), operand
+                    try:
+                        left, right = float(left), float(right)
+                    except ValueError:
+                        pass
+                    result = {
+                        "gt": left > right, "gte": left >= right,
+                        "lt": left < right, "lte": left <= right,
+                    }[operator]
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            if result == negate:
+                return False
+        return True
+
+    @staticmethod
+    def _project(row, select):
+        if not select or select == "*":
+            return dict(row)
+        columns = [column.strip() for column in select.split(",")]
+        return {column: row.get(column) for column in columns}
+
+    def select(self, table, filters, select="*", order=None, limit=None):
+        with self.lock:
+            rows = [dict(row) for row in self.tables.get(table, []) if self._matches(row, filters)]
+        for clause in reversed((order or "").split(",") if order else []):
+            column, _, direction = clause.partition(".")
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column) or ""), reverse=direction.startswith("desc"))
+        if limit is not None:
+            rows = rows[:limit]
+        return [self._project(row, select) for row in rows]
+
+    def insert(self, table, rows, on_conflict=None, resolution=None):
+        inserted = []
+        with self.lock:
+            existing_rows = self.tables.setdefault(table, [])
+            for row in rows:
+                row = dict(row)
+                key = on_conflict or "id"
+                current = next(
+                    (existing for existing in existing_rows
+                     if key in row and existing.get(key) == row[key]),
+                    None,
+                )
+                if current is not None:
+                    if resolution == "ignore-duplicates":
+                        continue
+                    if resolution == "merge-duplicates":
+                        current.update(row)
+                        current["updated_at"] = _now()
+                        inserted.append(dict(current))
+                        continue
+                    raise FakeConflict(f"duplicate key value violates unique constraint on {table}.{key}")
+                inserted.append(dict(self._insert_row(table, row)))
+        return inserted
+
+    def update(self, table, filters, values):
+        updated = []
+        with self.lock:
+            for row in self.tables.get(table, []):
+                if self._matches(row, filters):
+                    row.update(values)
+                    row["updated_at"] = _now()
+                    updated.append(dict(row))
+        return updated
+
+    def delete(self, table, filters):
+        with self.lock:
+            rows = self.tables.get(table, [])
+            deleted = [dict(row) for row in rows if self._matches(row, filters)]
+            self.tables[table] = [row for row in rows if not self._matches(row, filters)]
+        return deleted
+
+    # Database functions ------------------------------------------------
+
+    def rpc(self, name, params):
+        handler = getattr(self, f"_rpc_{name}", None)
+        if handler is None:
+            raise FakeNotFound(f"Could not find the function public.{name}")
+        return handler(**params)
+
+    def _rpc_merge_profile_data(self, p_user_id, p_sections):
+        with self.lock:
+            for row in self.tables.get("users", []):
+                if str(row.get("id")) == str(p_user_id):
+                    profile = dict(row.get("profile_data") or {})
+                    profile.update(p_sections)
+                    row["profile_data"] = profile
+                    if "basics" in p_sections:
+                        basics = p_sections["basics"] or {}
+                        row["full_name"] = basics.get("fullName")
+                        row["avatar_url"] = basics.get("avatar_url")
+                    row["updated_at"] = _now()
+                    return [dict(row)]
+        return []
+
+    def _rpc_merge_job_description_derived(self, p_hash, p_values):
+        with self.lock:
+            for row in self.tables.get("job_descriptions", []):
+                if row.get("hash") == p_hash:
+                    row["derived"] = dict(row.get("derived") or {}, **p_values)
+                    row["updated_at"] = _now()
+                    return [dict(row)]
+        return []
+
+    def _rpc_skill_vocabulary(self, p_min_users=2):
+        with self.lock:
+            users = defaultdict(set)
+            for row in self.tables.get("users", []):
+                skills = (row.get("profile_data") or {}).get("skills") or {}
+                for category, values in skills.items():
+                    for value in values if isinstance(values, list) else []:
+                        if str(value).strip():
+                            users[(category, str(value).strip())].add(row.get("id"))
+        return [
+            {"category": category, "skill": skill, "users": len(ids)}
+            for (category, skill), ids in users.items() if len(ids) >= max(p_min_users, 2)
+        ]
+
+    def _rpc_update_resume_sections(self, p_resume_id, p_sections):
+        with self.lock:
+            for row in self.tables.get("resumes", []):
+                if str(row.get("id")) == str(p_resume_id):
+                    content = dict(row.get("resume_content") or {})
+                    sections = list(content.get("sections") or [])
+                    for index, section in p_sections.items():
+                        sections[int(index)] = section
+                    content["sections"] = sections
+                    row["resume_content"] = content
+                    row["updated_at"] = _now()
+                    return [dict(row)]
+        return []
+
+    # Storage -----------------------------------------------------------
+
+    def upload(self, bucket, path, data, upsert=False):
+        with self.lock:
+            objects = self.buckets.setdefault(bucket, {})
+            if path in objects and not upsert:
+                raise FakeConflict("The resource already exists")
+            objects[path] = data
+
+    def download(self, bucket, path):
+        with self.lock:
+            data = self.buckets.get(bucket, {}).get(path)
+        if data is None:
+            raise FakeNotFound("Object not found")
+        return data
+
+class FakeConflict(Exception):
+    pass
+
+class FakeNotFound(Exception):
+    pass
+
+class FakeUnavailable(Exception):
+    pass
+
+class FakeOpenAI:
+    """Replays recorded chat completions with a configurable delay.
+
+    Each recorded response has a ``match`` substring that is looked up in the
+    request's messages; the first match wins and the last entry acts as the
+    default. The delay is ``latency_ms`` plus ``ms_per_token`` for every
+    completion token, approximating a streaming provider's total time.
+
+    To exercise retries and hedging, ``slow_fraction`` of responses take an
+    extra ``slow_ms`` and ``error_fraction`` of requests fail with a 503.
+
+    Prompt caching is approximated like OpenAI's: once a prompt is at least
+    1024 tokens long, the prefix it shares with a recent prompt is reported as
+    ``cached_tokens`` in 128-token steps.
+    """
+
+    CACHE_MIN_TOKENS = 1024
+    CACHE_STEP_TOKENS = 128
+
+    def __init__(self, responses=None, latency_ms=0.0, ms_per_token=0.0,
+                 slow_fraction=0.0, slow_ms=0.0, error_fraction=0.0):
+        self.responses = responses if responses is not None else load_fixture("llm_responses.json")
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+        self.slow_fraction = slow_fraction
+        self.slow_ms = slow_ms
+        self.error_fraction = error_fraction
+        self._recent_prompts = deque(maxlen=256)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def count_tokens(text):
+        # Roughly four characters per token for English text
+        return max(1, len(text) // 4)
+
+    def cached_tokens(self, prompt):
+        """Tokens of the prompt's longest prefix shared with a recent prompt."""
+        if self.count_tokens(prompt) < self.CACHE_MIN_TOKENS:
+            return 0
+        with self._lock:
+            shared = max((len(os.path.commonprefix([prompt, seen])) for seen in self._recent_prompts), default=0)
+            self._recent_prompts.append(prompt)
+        tokens = shared // 4
+        if tokens < self.CACHE_MIN_TOKENS:
+            return 0
+        return tokens - tokens % self.CACHE_STEP_TOKENS
+
+    def complete(self, body):
+        if self.error_fraction and random.random() < self.error_fraction:
+            raise FakeUnavailable("The server is overloaded, please retry")
+        messages = body.get("messages", [])
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        recorded = next(
+            (response for response in self.responses if response.get("match", "") in prompt),
+            self.responses[-1],
+        )
+        content = recorded["content"]
+        if not isinstance(content, str):
+            content = json.dumps(content)
+
+        prompt_tokens = self.count_tokens(prompt)
+        completion_tokens = self.count_tokens(content)
+        delay = (self.latency_ms + self.ms_per_token * completion_tokens) / 1000
+        if self.slow_fraction and random.random() < self.slow_fraction:
+            delay += self.slow_ms / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": self.cached_tokens(prompt)},
+            },
+        }
+
+def _parse_multipart(content_type, body):
+    """Return the first file part of a multipart/form-data body."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    for part in message.iter_parts():
+        if part.get_filename() is not None or part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    return b""
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs
+    # add ~40 ms to every keep-alive request
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def services(self):
+        return self.server.services
+
+    # Plumbing ----------------------------------------------------------
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _json_body(self):
+        body = self._body()
+        return json.loads(body) if body else {}
+
+    def _send(self, status, payload=None, content_type="application/json"):
+        if isinstance(payload, (bytes, bytearray)):
+            data = bytes(payload)
+        elif payload is None:
+            data = b""
+        else:
+            data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message, code=None):
+        self._send(status, {"message": message, "code": code, "error": message, "statusCode": str(status)})
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        try:
+            if path.startswith("/rest/v1/"):
+                self._rest(method, path[len("/rest/v1/"):], url.query)
+            elif path.startswith("/storage/v1/object/"):
+                self._storage(method, path[len("/storage/v1/object/"):])
+            elif path == "/v1/chat/completions" and method == "POST":
+                self.services.requests["llm"] += 1
+                self._send(200, self.services.openai.complete(self._json_body()))
+            else:
+                self._error(404, f"No route for {method} {path}")
+        except FakeNotFound as e:
+            self._error(404, str(e), "PGRST202")
+        except FakeConflict as e:
+            self._error(409, str(e), "23505")
+        except FakeUnavailable as e:
+            self._error(503, str(e))
+        except (ValueError, TypeError) as e:
+            self._error(400, str(e))
+
+    do_GET = lambda self: self._dispatch("GET")
+    do_POST = lambda self: self._dispatch("POST")
+    do_PATCH = lambda self: self._dispatch("PATCH")
+    do_PUT = lambda self: self._dispatch("PUT")
+    do_DELETE = lambda self: self._dispatch("DELETE")
+    do_HEAD = lambda self: self._dispatch("HEAD")
+
+    # PostgREST ---------------------------------------------------------
+
+    def _rest(self, method, resource, query):
+        database = self.services.database
+        self.services.requests["db"] += 1
+        if resource.startswith("rpc/"):
+            result = database.rpc(resource[len("rpc/"):], self._json_body())
+            return self._send(200, result)
+
+        params = parse_qsl(query, keep_blank_values=True)
+        reserved = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+        filters = [(key, value) for key, value in params if key not in reserved]
+        options = {key: value for key, value in params if key in reserved}
+        prefer = self.headers.get("Prefer", "")
+
+        if method in ("GET", "HEAD"):
+            limit = int(options["limit"]) if "limit" in options else None
+            rows = database.select(resource, filters, options.get("select", "*"), options.get("order"), limit)
+        elif method == "POST":
+            body = self._json_body()
+            rows = body if isinstance(body, list) else [body]
+            resolution = None
+            if "resolution=ignore-duplicates" in prefer:
+                resolution = "ignore-duplicates"
+            elif "resolution=merge-duplicates" in prefer:
+                resolution = "merge-duplicates"
+            rows = database.insert(resource, rows, options.get("on_conflict"), resolution)
+        elif method == "PATCH":
+            rows = database.update(resource, filters, self._json_body())
+        elif method == "DELETE":
+            rows = database.delete(resource, filters)
+        else:
+            return self._error(405, f"{method} not allowed")
+
+        if "return=minimal" in prefer:
+            return self._send(201 if method == "POST" else 204)
+        if "application/vnd.pgrst.object+json" in self.headers.get("Accept", ""):
+            if len(rows) != 1:
+                return self._error(406, "JSON object requested, multiple (or no) rows returned", "PGRST116")
+            return self._send(200, rows[0])
+        self._send(201 if method == "POST" else 200, rows)
+
+    # Storage -----------------------------------------------------------
+
+    def _storage(self, method, object_path):
+        database = self.services.database
+        self.services.requests["storage"] += 1
+        bucket, _, path = object_path.partition("/")
+        if method == "GET":
+            return self._send(200, database.download(bucket, path), "application/octet-stream")
+        if method in ("POST", "PUT"):
+            body = self._body()
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith("multipart/form-data"):
+                body = _parse_multipart(content_type, body)
+            upsert = method == "PUT" or self.headers.get("x-upsert", "").lower() == "true"
+            database.upload(bucket, path, body, upsert=upsert)
+            return self._send(200, {"Key": f"{bucket}/{path}", "Id": str(uuid.uuid4())})
+        if method == "DELETE":
+            with database.lock:
+                database.buckets.get(bucket, {}).pop(path, None)
+            return self._send(200, [{"name": path}])
+        self._error(405, f"{method} not allowed")
+
+class FakeRedis:
+    """Redis-protocol key/value server for the shared cache, on a background thread.
+
+    Usage::
+
+        with FakeRedis() as redis:
+            override_settings(cache_backend="redis", cache_url=redis.url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.data = {}
+        self.lock = threading.Lock()
+        self.commands = Counter()
+        self._server = ThreadingTCPServer((host, port), _RedisHandler)
+        self._server.daemon_threads = True
+        self._server.store = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def _live(self, key):
+        """Value of key, dropping it if it has expired. Called with the lock held."""
+        entry = self.data.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[1] if entry else None
+
+    def execute(self, args):
+        command = args[0].decode().upper()
+        self.commands[command] += 1
+        with self.lock:
+            if command == "PING":
+                return "+PONG"
+            if command in ("AUTH", "SELECT"):
+                return "+OK"
+            if command == "GET":
+                return self._live(args[1])
+            if command == "SET":
+                expires_at = None
+                options = [arg.decode().upper() for arg in args[3:]]
+                for index, option in enumerate(options[:-1]):
+                    if option == "EX":
+                        expires_at = time.monotonic() + int(options[index + 1])
+                    elif option == "PX":
+                        expires_at = time.monotonic() + int(options[index + 1]) / 1000
+                self.data[args[1]] = (expires_at, args[2])
+                return "+OK"
+            if command == "DEL":
+                return sum(self.data.pop(key, None) is not None for key in args[1:])
+            if command == "DBSIZE":
+                return sum(self._live(key) is not None for key in list(self.data))
+            if command == "FLUSHDB":
+                self.data.clear()
+                return "+OK"
+        return f"-ERR unknown command '{command}'"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-redis", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class _RedisHandler(StreamRequestHandler):
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, as typed into telnet
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+            reply = self.server.store.execute(args)
+            if reply is None:
+                self.wfile.write(b"$-1\r\n")
+            elif isinstance(reply, int):
+                self.wfile.write(f":{reply}\r\n".encode())
+            elif isinstance(reply, bytes):
+                self.wfile.write(f"${len(reply)}\r\n".encode() + reply + b"\r\n")
+            else:
+                self.wfile.write(f"{reply}\r\n".encode())
+
+class FakeServices:
+    """Run the Supabase and OpenAI stand-ins on a background thread.
+
+    Usage::
+
+        with FakeServices(llm_latency_ms=200) as services:
+            override_settings(**services.settings())
+            ...
+    """
+
+    def __init__(self, llm_latency_ms=0.0, llm_ms_per_token=0.0, responses=None, host="127.0.0.1", port=0,
+                 llm_slow_fraction=0.0, llm_slow_ms=0.0, llm_error_fraction=0.0, cache="memory"):
+        self.cache = cache
+        # The shared cache runs against FakeRedis when asked for "redis"
+        self.redis = FakeRedis(host) if cache == "redis" else None
+        self.database = FakeDatabase()
+        self.openai = FakeOpenAI(
+            responses, llm_latency_ms, llm_ms_per_token,
+            llm_slow_fraction, llm_slow_ms, llm_error_fraction
+        )
+        self.requests = Counter()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.services = self
+        self._thread = None
+        # Scratch space for local state such as the background job table
+        self._data_dir = tempfile.mkdtemp(prefix="resume-bench-")
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def settings(self):
+        """Settings overrides that point the app at these stand-ins."""
+        return {
+            "supabase_url": self.url,
+            "supabase_key": FAKE_SUPABASE_KEY,
+            "openai_api_key": FAKE_OPENAI_KEY,
+            "openai_base_url": f"{self.url}/v1",
+            "jobs_db_path": os.path.join(self._data_dir, "jobs.sqlite3"),
+            "cache_backend": self.cache,
+            "cache_url": {
+                "sqlite": os.path.join(self._data_dir, "cache.sqlite3"),
+                "redis": self.redis.url if self.redis else "",
+            }.get(self.cache, ""),
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        if self.redis:
+            self.redis.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self.redis:
+            self.redis.stop()
+        shutil.rmtree(self._data_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def make_text_pdf(lines):
+    """Build a minimal single-page PDF containing ``lines`` of Helvetica text."""
+    def escape(text):
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    stream_lines = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+    for line in lines:
+        stream_lines.append(f"({escape(line.encode('latin-1', 'replace').decode('latin-1'))}) Tj T*")
+    stream_lines.append("ET")
+    stream = "\n".join(stream_lines).encode("latin-1")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(output)
+
+def seed_demo_data(database, user_ids, resumes_per_user=5):
+    """Give every user the fixture profile, an avatar and a few saved resumes."""
+    profile = load_fixture("profile.json")
+    resume = load_fixture("resume.md")
+    job_description = load_fixture("job_description.txt")
+    job_hash = job_description_hash(job_description)
+    if not database.select("job_descriptions", [("hash", f"eq.{job_hash}")]):
+        database.seed("job_descriptions", [{"hash": job_hash, "content": job_description, "derived": {}}])
+    for user_id in user_ids:
+        database.seed("users", [{
+            "id": user_id,
+            "email": f"{user_id}@example.com",
+            "full_name": profile["basics"]["fullName"],
+            "profile_data": profile,
+        }])
+        database.upload("avatars", f"{user_id}/avatar", TINY_PNG, upsert=True)
+        database.seed("resumes", [{
+            "user_id": user_id,
+            "title": f"Senior Backend Engineer #{number} @ Acme",
+            "company": "Acme",
+            "job_description_hash": job_hash,
+            "resume_content": resume,
+            "format_type": "Chronological",
+            "tone": "Professional",
+            "tags": [],
+        } for number in range(resumes_per_user)])
@@ -0,0 +1,119 @@
+"""Measure per-module import cost in fresh interpreters.
+
+Each module is imported in its own ``python -X importtime`` subprocess so
+results are not skewed by modules another import already loaded. Run from the
+project root:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 5 --json import_times.json
+    python -m benchmarks.import_time --budget-ms 800
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Application modules first, then the heavy third-party dependencies they defer
+DEFAULT_MODULES = [
+    "app",
+    "modules.auth.auth_utils",
+    "modules.database.config",
+    "modules.database.client",
+    "modules.utils.ui_utils",
+    "modules.utils.avatar_utils",
+    "modules.utils.pdf_utils",
+    "modules.ai.ai_utils",
+    "streamlit",
+    "supabase",
+    "openai",
+    "PyPDF2",
+    "spire.doc",
+]
+
+# Modules that make up the anonymous landing page's cold start
+COLD_START_MODULES = ["app"]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_import(module, python=sys.executable):
+    """Return the cumulative import time of ``module`` in microseconds."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise RuntimeError(f"import {module} failed: {error}")
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or parts[2].strip() != module:
+            continue
+        try:
+            return int(parts[1].strip())
+        except ValueError:
+            continue
+    raise RuntimeError(f"no importtime entry for {module}")
+
+def run(modules, repeat):
+    """Measure every module ``repeat`` times and summarise in milliseconds."""
+    results = {}
+    for module in modules:
+        samples = []
+        try:
+            for _ in range(repeat):
+                samples.append(measure_import(module) / 1000)
+        except RuntimeError as e:
+            results[module] = {"error": str(e)}
+            continue
+        results[module] = {
+            "min_ms": round(min(samples), 2),
+            "median_ms": round(statistics.median(samples), 2),
+            "samples": len(samples),
+        }
+    return results
+
+def print_report(results):
+    width = max(len(module) for module in results)
+    print(f"{'module'.ljust(width)}  {'min ms':>10}  {'median ms':>10}")
+    ordered = sorted(results.items(), key=lambda item: item[1].get("median_ms", -1), reverse=True)
+    for module, stats in ordered:
+        if "error" in stats:
+            print(f"{module.ljust(width)}  {stats['error']}")
+        else:
+            print(f"{module.ljust(width)}  {stats['min_ms']:>10.2f}  {stats['median_ms']:>10.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="modules to measure (default: app modules and heavy dependencies)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    parser.add_argument("--budget-ms", type=float, help="fail when the cold-start modules exceed this median import time")
+    args = parser.parse_args(argv)
+
+    results = run(args.modules or DEFAULT_MODULES, max(1, args.repeat))
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+
+    if args.budget_ms is not None:
+        over_budget = [
+            module for module in COLD_START_MODULES
+            if results.get(module, {}).get("median_ms", float("inf")) > args.budget_ms
+        ]
+        if over_budget:
+            print(f"Cold-start budget of {args.budget_ms} ms exceeded by: {', '.join(over_budget)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""Drive many concurrent simulated sessions through the app with Streamlit's AppTest.
+
+Every session is a separate AppTest instance with its own logged-in identity,
+running scripted interactions (form fills, button clicks, uploads) on
+``app.py`` and the pages under ``pages/``, against the local Supabase and
+OpenAI stand-ins from ``benchmarks.fakes``. All sessions share this process,
+as they would share one Streamlit server replica, so the rerun latencies show
+where synchronous LLM and Spire.Doc calls start to queue up.
+
+    python -m benchmarks.load_test --sessions 1 5 10 25 --iterations 3
+    python -m benchmarks.load_test --scenarios ats builder --llm-latency-ms 1500
+    python -m benchmarks.load_test --sessions 10 --output load.json
+    python -m benchmarks.load_test --scenarios ats --llm-latency-ms 300 --llm-slow-fraction 0.05 --llm-slow-ms 3000
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.fakes import CACHE_BACKENDS, FakeServices, load_fixture, make_text_pdf, seed_demo_data
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_SCRIPT = os.path.join(PROJECT_ROOT, "benchmarks", "apptest_session.py")
+
+class RSSSampler:
+    """Track the peak resident set size of this process on a background thread."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def current():
+        """Current RSS in bytes, or 0 when the platform offers no cheap way to read it."""
+        try:
+            with open("/proc/self/statm", "r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            import psutil
+            return psutil.Process().memory_info().rss
+        except ImportError:
+            return 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self.current()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+class Session:
+    """One simulated browser session: an AppTest plus its timing records."""
+
+    def __init__(self, user_id, services, timeout, recorder):
+        self.user_id = user_id
+        self.services = services
+        self.timeout = timeout
+        self.recorder = recorder
+        self.at = None
+        self.scenario = None
+
+    def identity(self):
+        return {
+            "is_logged_in": True,
+            "sub": self.user_id,
+            "email": f"{self.user_id}@example.com",
+            "name": "Load Test User",
+            "picture": f"{self.services.url}/storage/v1/object/avatars/{self.user_id}/avatar",
+        }
+
+    def open(self, script, scenario, logged_in=True):
+        from streamlit.testing.v1 import AppTest
+
+        self.scenario = scenario
+        self.at = AppTest.from_file(ENTRY_SCRIPT, default_timeout=self.timeout)
+        self.at.session_state["_loadtest_script"] = os.path.join(PROJECT_ROOT, script)
+        if logged_in:
+            self.at.session_state["_loadtest_user"] = self.identity()
+        self.run("open")
+        return self.at
+
+    def run(self, step):
+        start = time.perf_counter()
+        error = None
+        try:
+            self.at.run()
+            if self.at.exception:
+                error = self.at.exception[0].message
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.recorder.record(self.scenario, step, (time.perf_counter() - start) * 1000, error)
+        return self.at
+
+    def click(self, label, step):
+        self.widget(self.at.button, label).click()
+        return self.run(step)
+
+    def download(self, label, step):
+        """Click a download button whose file is generated on demand, as the browser would."""
+        from streamlit.runtime.media_file_storage import MediaFileStorageError
+
+        start = time.perf_counter()
+        error = None
+        try:
+            file_id = self.widget(self.at.get("download_button"), label).proto.deferred_file_id
+            for runtime in reversed(list(RECENT_RUNTIMES)):
+                try:
+                    runtime.media_file_mgr.execute_deferred(file_id)
+                    break
+                except MediaFileStorageError as e:
+                    # Also raised when the callable fails, which must not be skipped
+                    if "not found" not in str(e):
+                        raise
+            else:
+                raise LookupError(f"No runtime holds the download for {label!r}")
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.recorder.record(self.scenario, step, (time.perf_counter() - start) * 1000, error)
+
+    @staticmethod
+    def widget(widgets, label):
+        for widget in widgets:
+            if widget.label == label:
+                return widget
+        raise LookupError(f"No widget labelled {label!r}")
+
+class Recorder:
+    """Thread-safe collection of rerun latencies."""
+
+    def __init__(self):
+        self.samples = []
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, scenario, step, elapsed_ms, error=None):
+        with self.lock:
+            if elapsed_ms is not None:
+                self.samples.append((scenario, step, elapsed_ms))
+            if error:
+                self.errors[f"{scenario}/{step}: {error.splitlines()[0][:120]}"] += 1
+
+RECENT_RUNTIMES = deque(maxlen=64)
+
+def share_apptest_runtime():
+    """Keep AppTest's mock Runtime visible to every concurrent session.
+
+    AppTest installs a process-global ``Runtime._instance`` before each run and
+    clears it afterwards, which is fine for one test at a time but pulls the
+    runtime out from under other sessions running in parallel. Falling back to
+    the most recently installed runtime mirrors a real server, where all
+    sessions share one Runtime. Recent runtimes are remembered in
+    RECENT_RUNTIMES, since a concurrent run may have registered a session's
+    deferred downloads with any of them. Every run also gets its own session
+    id instead of AppTest's fixed one, so one session's page cannot revoke
+    the downloads another registered on the same runtime.
+    """
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    original_init = LocalScriptRunner.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self._session_id = f"load-test-{uuid.uuid4().hex}"
+
+    LocalScriptRunner.__init__ = init
+
+    def instance(cls):
+        if cls._instance is not None and (not RECENT_RUNTIMES or RECENT_RUNTIMES[-1] is not cls._instance):
+            RECENT_RUNTIMES.append(cls._instance)
+        if not RECENT_RUNTIMES:
+            raise RuntimeError("Runtime hasn't been created!")
+        return RECENT_RUNTIMES[-1]
+
+    def exists(cls):
+        return cls._instance is not None or bool(RECENT_RUNTIMES)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+
+# Scenarios ------------------------------------------------------------------
+
+JOB_DESCRIPTION = load_fixture("job_description.txt")
+RESUME_PDF = make_text_pdf(load_fixture("resume.md").splitlines())
+
+def scenario_landing(session, iteration):
+    session.open("app.py", "landing", logged_in=False)
+
+def scenario_dashboard(session, iteration):
+    session.open("pages/0_Dashboard.py", "dashboard")
+
+def scenario_profile(session, iteration):
+    at = session.open("pages/1_Profile.py", "profile")
+    session.widget(at.text_input, "Phone Number").input(f"+1 555 {iteration:04d}")
+    session.click("Save Profile", "save")
+
+def scenario_ats(session, iteration):
+    at = session.open("pages/2_ATS_Score.py", "ats")
+    session.widget(at.text_input, "Job Title").input("Senior Backend Engineer")
+    session.widget(at.text_input, "Company Name").input("Acme")
+    session.widget(at.text_area, "Paste the job description here").input(JOB_DESCRIPTION)
+    at.file_uploader[0].upload("resume.pdf", RESUME_PDF, "application/pdf")
+    session.run("fill")
+    session.click("Analyze Resume", "analyze")
+
+def scenario_builder(session, iteration):
+    at = session.open("pages/3_Resume_Builder.py", "builder")
+    session.widget(at.text_input, "Job Title").input("Senior Backend Engineer")
+    # A new company each iteration, so the job queue cannot serve a deduplicated result
+    session.widget(at.text_input, "Company Name").input(f"Acme {iteration}")
+    session.widget(at.text_area, "Paste the job description here").input(JOB_DESCRIPTION)
+    session.click("Analyze", "generate")
+    session.click("Accept & Continue", "accept")
+
+def scenario_improve(session, iteration):
+    at = session.open("pages/3_Resume_Builder.py", "improve")
+    session.widget(at.text_input, "Job Title").input("Senior Backend Engineer")
+    session.widget(at.text_input, "Company Name").input(f"Acme {iteration}")
+    session.widget(at.text_area, "Paste the job description here").input(JOB_DESCRIPTION)
+    session.click("Analyze", "generate")
+    session.click("Suggest Improvements", "open_feedback")
+    session.widget(at.text_area, "Describe what you want to improve or change:").input(
+        f"Shorten the professional summary (round {iteration})"
+    )
+    session.click("Submit Improvements", "edit")
+
+def scenario_past_resumes(session, iteration):
+    session.open("pages/4_Past_Resumes.py", "past_resumes")
+    session.download("Download", "download")
+
+SCENARIOS = {
+    "landing": scenario_landing,
+    "dashboard": scenario_dashboard,
+    "profile": scenario_profile,
+    "ats": scenario_ats,
+    "builder": scenario_builder,
+    "improve": scenario_improve,
+    "past_resumes": scenario_past_resumes,
+}
+
+# Runner ---------------------------------------------------------------------
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+def latency_stats(samples):
+    if not samples:
+        return {}
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.50), 2),
+        "p95_ms": round(percentile(samples, 0.95), 2),
+        "p99_ms": round(percentile(samples, 0.99), 2),
+        "mean_ms": round(statistics.fmean(samples), 2),
+    }
+
+def run_session(index, services, scenarios, iterations, timeout, recorder):
+    session = Session(f"load-user-{index}", services, timeout, recorder)
+    for iteration in range(iterations):
+        # Stagger the scenario order so sessions do not move in lockstep
+        for offset in range(len(scenarios)):
+            name = scenarios[(index + offset) % len(scenarios)]
+            try:
+                SCENARIOS[name](session, iteration)
+            except Exception as e:
+                recorder.record(name, "script", None, f"{type(e).__name__}: {e}")
+
+def run_level(session_count, services, scenarios, iterations, timeout):
+    recorder = Recorder()
+    baseline_rss = RSSSampler.current()
+    with RSSSampler() as sampler:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=session_count, thread_name_prefix="session") as pool:
+            futures = [
+                pool.submit(run_session, index, services, scenarios, iterations, timeout, recorder)
+                for index in range(session_count)
+            ]
+            for future in futures:
+                future.result()
+        wall_seconds = time.perf_counter() - start
+
+    by_step = defaultdict(list)
+    for scenario, step, elapsed_ms in recorder.samples:
+        by_step[f"{scenario}/{step}"].append(elapsed_ms)
+    all_samples = [elapsed_ms for _, _, elapsed_ms in recorder.samples]
+    return {
+        "sessions": session_count,
+        "wall_seconds": round(wall_seconds, 3),
+        "reruns": len(all_samples),
+        "throughput_reruns_per_s": round(len(all_samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency": latency_stats(all_samples),
+        "steps": {step: latency_stats(samples) for step, samples in sorted(by_step.items())},
+        "peak_rss_mb": round(sampler.peak / 2**20, 1),
+        "rss_growth_per_session_mb": round(max(0, sampler.peak - baseline_rss) / 2**20 / session_count, 2),
+        "errors": dict(recorder.errors),
+    }
+
+def print_level(level):
+    latency = level["latency"]
+    print(
+        f"{level['sessions']:>8} {level['reruns']:>7} {level['throughput_reruns_per_s']:>10.2f} "
+        f"{latency.get('p50_ms', 0):>9.1f} {latency.get('p95_ms', 0):>9.1f} {latency.get('p99_ms', 0):>9.1f} "
+        f"{level['peak_rss_mb']:>9.1f} {level['rss_growth_per_session_mb']:>9.2f} {sum(level['errors'].values()):>7}"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25], help="concurrent session counts to test")
+    parser.add_argument("--iterations", type=int, default=2, help="passes over the scenario list per session")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="fixed delay per fake LLM response")
+    parser.add_argument("--llm-ms-per-token", type=float, default=0.0, help="extra fake LLM delay per completion token")
+    parser.add_argument("--llm-slow-fraction", type=float, default=0.0, help="share of fake LLM responses that are slow")
+    parser.add_argument("--llm-slow-ms", type=float, default=0.0, help="extra delay of a slow fake LLM response")
+    parser.add_argument("--llm-error-fraction", type=float, default=0.0, help="share of fake LLM requests that fail with a 503")
+    parser.add_argument("--cache", choices=CACHE_BACKENDS, default="memory", help="shared cache backend")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-rerun AppTest timeout in seconds")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--verbose", action="store_true", help="print per-step latencies and errors")
+    args = parser.parse_args(argv)
+
+    # Session state is seeded outside a script run, which Streamlit warns about on every session
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+    share_apptest_runtime()
+    with FakeServices(args.llm_latency_ms, args.llm_ms_per_token, llm_slow_fraction=args.llm_slow_fraction,
+                      llm_slow_ms=args.llm_slow_ms, llm_error_fraction=args.llm_error_fraction,
+                      cache=args.cache) as services:
+        from modules.config.settings import override_settings
+        override_settings(**services.settings())
+        seed_demo_data(services.database, [f"load-user-{index}" for index in range(max(args.sessions))], 5)
+
+        print(f"{'sessions':>8} {'reruns':>7} {'reruns/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MB':>9} {'MB/sess':>9} {'errors':>7}")
+        levels = []
+        for session_count in args.sessions:
+            level = run_level(session_count, services, args.scenarios, args.iterations, args.timeout)
+            levels.append(level)
+            print_level(level)
+            if args.verbose:
+                for step, stats in level["steps"].items():
+                    print(f"    {step:<28} p50 {stats['p50_ms']:>9.1f}  p95 {stats['p95_ms']:>9.1f}  n={stats['count']}")
+                for error, count in level["errors"].items():
+                    print(f"    error x{count}: {error}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "config": {
+                    "iterations": args.iterations,
+                    "scenarios": args.scenarios,
+                    "llm_latency_ms": args.llm_latency_ms,
+                    "llm_ms_per_token": args.llm_ms_per_token,
+                    "llm_slow_fraction": args.llm_slow_fraction,
+                    "llm_slow_ms": args.llm_slow_ms,
+                    "llm_error_fraction": args.llm_error_fraction,
+                    "cache": args.cache,
+                },
+                "levels": levels,
+            }, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
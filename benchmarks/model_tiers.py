@@ -0,0 +1,193 @@
+"""Compare LLM model tiers per task on latency, tokens and agreement with the strongest tier.
+
+Each task runs the app's own prompts on the recorded fixtures (sample resume,
+job description and profile) once per tier, with validation fallback turned
+off so every response comes from the tier being measured. Agreement is
+measured against the last tier listed: matching fields for parsed resumes,
+word-level similarity for text. Use the results to decide ``llm_task_tiers``.
+
+    python -m benchmarks.model_tiers --runs 3
+    python -m benchmarks.model_tiers --tasks parse ats --tiers fast strong --output tiers.json
+    python -m benchmarks.model_tiers --fake    # dry run against the local stand-ins
+"""
+import argparse
+import io
+import json
+import statistics
+import sys
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+
+from benchmarks.fakes import FakeServices, load_fixture, make_text_pdf
+from benchmarks.run_benchmarks import git_revision, load_page, percentile
+
+TASK_OPERATIONS = {
+    "parse": "llm.parse_resume",
+    "ats": "llm.ats_analysis",
+    "digest": "llm.job_digest",
+    "analysis": "llm.resume_analysis",
+    "generate": "llm.generate_resume",
+}
+
+class SpanCollector:
+    """Exporter that keeps finished LLM spans."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        if span.name.startswith("llm."):
+            self.spans.append(span)
+
+class Tasks:
+    """One method per task, each returning the output a user would see."""
+
+    def __init__(self):
+        from modules.ai.ai_utils import create_chat_completion, digest_job_description, parse_resume
+
+        self.create_chat_completion = create_chat_completion
+        self.digest_job_description = digest_job_description
+        self.parse_resume = parse_resume
+        self.ats_page = load_page("2_ATS_Score.py")
+        self.builder_page = load_page("3_Resume_Builder.py")
+        self.resume_markdown = load_fixture("resume.md")
+        self.job_description = load_fixture("job_description.txt")
+        self.profile = load_fixture("profile.json")
+
+    def parse(self):
+        return self.parse_resume(self.resume_markdown)
+
+    def ats(self):
+        resume_text = self.ats_page.extract_text_from_pdf(io.BytesIO(make_text_pdf(self.resume_markdown.splitlines())))
+        job_details = f"""
+                    Job Title: Senior Backend Engineer
+                    Company: Acme
+                    Description: {self.job_description}
+                    """
+        return self.ats_page.analyze_resume_ats(resume_text, job_details)
+
+    def digest(self):
+        # Called directly rather than through get_job_digest, whose cache would answer every tier
+        return self.digest_job_description(self.job_description)
+
+    def _generation_reply(self, part):
+        # Called directly rather than through the job queue, whose dedupe
+        # would hand every tier the first tier's result
+        messages = self.builder_page.build_generation_messages(
+            self.profile, "Senior Backend Engineer", "Acme", self.job_description, "Chronological", "Professional"
+        )
+        response = self.create_chat_completion(self.builder_page.GENERATION_PARTS[part][1], messages=messages[part])
+        return response.choices[0].message.content
+
+    def analysis(self):
+        return self._generation_reply("analysis")
+
+    def generate(self):
+        return self._generation_reply("resume")
+
+def _leaves(value, path=""):
+    """Flatten nested JSON into path -> normalised leaf value."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return {path: str(value).strip().lower()}
+    leaves = {}
+    for key, child in items:
+        leaves.update(_leaves(child, f"{path}/{key}"))
+    return leaves
+
+def agreement(output, reference) -> float:
+    """Share of matching fields for JSON outputs, word-level similarity for text."""
+    if output is None or reference is None:
+        return 0.0
+    if isinstance(output, (dict, list)) or isinstance(reference, (dict, list)):
+        ours, theirs = _leaves(output), _leaves(reference)
+        keys = set(ours) | set(theirs)
+        return sum(ours.get(key) == theirs.get(key) for key in keys) / len(keys) if keys else 1.0
+    return SequenceMatcher(None, str(output).split(), str(reference).split(), autojunk=False).ratio()
+
+def run_tier(tasks, collector, task, tier, runs):
+    from modules.config.settings import override_settings
+    # Every call must reach the model, so cached responses are off
+    override_settings(llm_task_tiers=f"{TASK_OPERATIONS[task]}={tier}", llm_tier_fallback=False, llm_cache_operations="")
+    outputs, spans = [], []
+    for _ in range(runs):
+        collector.spans.clear()
+        try:
+            outputs.append(getattr(tasks, task)())
+        except Exception as e:
+            print(f"Error running {task} on the {tier} tier: {str(e)}")
+            outputs.append(None)
+        spans.extend(collector.spans)
+    return outputs, spans
+
+def summarise(outputs, spans, reference_outputs):
+    durations = [span.duration_ms for span in spans]
+    ok = [span for span in spans if span.outcome == "ok"]
+    return {
+        "model": spans[0].attributes.get("model") if spans else None,
+        "calls": len(spans),
+        "errors": len(spans) - len(ok),
+        "p50_ms": round(percentile(durations, 0.50), 1) if durations else None,
+        "p95_ms": round(percentile(durations, 0.95), 1) if durations else None,
+        "prompt_tokens": round(statistics.fmean(span.attributes.get("prompt_tokens", 0) for span in ok), 1) if ok else None,
+        "completion_tokens": round(statistics.fmean(span.attributes.get("completion_tokens", 0) for span in ok), 1) if ok else None,
+        "valid_rate": round(sum(bool(span.attributes.get("valid")) for span in ok) / len(ok), 3) if ok else None,
+        "agreement": round(statistics.fmean(
+            agreement(output, reference) for output, reference in zip(outputs, reference_outputs)
+        ), 3) if outputs else None,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", nargs="+", choices=list(TASK_OPERATIONS), default=list(TASK_OPERATIONS))
+    parser.add_argument("--tiers", nargs="+", default=["fast", "strong"], help="tiers to compare; the last is the reference")
+    parser.add_argument("--runs", type=int, default=3, help="calls per task and tier")
+    parser.add_argument("--fake", action="store_true", help="use the local OpenAI stand-in instead of the configured provider")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    from modules.ai.routing import TIERS, tier_models
+    unknown = [tier for tier in args.tiers if tier not in TIERS]
+    if unknown:
+        parser.error(f"unknown tiers: {', '.join(unknown)} (choose from {', '.join(TIERS)})")
+
+    with FakeServices() if args.fake else nullcontext() as services:
+        from modules.config.settings import override_settings
+        from modules.monitoring.tracing import add_exporter
+        if services is not None:
+            override_settings(**services.settings())
+        collector = SpanCollector()
+        add_exporter(collector)
+        tasks = Tasks()
+
+        results = {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "config": {"runs": args.runs, "fake": args.fake, "models": tier_models()},
+            "tasks": {},
+        }
+        print(f"{'task':<10} {'tier':<8} {'model':<20} {'p50 ms':>9} {'p95 ms':>9} {'prompt':>8} {'compl.':>8} {'valid':>6} {'agree':>6} {'errors':>6}")
+        for task in args.tasks:
+            runs = {tier: run_tier(tasks, collector, task, tier, args.runs) for tier in args.tiers}
+            reference_outputs = runs[args.tiers[-1]][0]
+            results["tasks"][task] = {}
+            for tier, (outputs, spans) in runs.items():
+                stats = summarise(outputs, spans, reference_outputs)
+                results["tasks"][task][tier] = stats
+                print(
+                    f"{task:<10} {tier:<8} {str(stats['model']):<20} {stats['p50_ms'] or 0:>9.1f} {stats['p95_ms'] or 0:>9.1f} "
+                    f"{stats['prompt_tokens'] or 0:>8.0f} {stats['completion_tokens'] or 0:>8.0f} "
+                    f"{stats['valid_rate'] or 0:>6.2f} {stats['agreement'] or 0:>6.2f} {stats['errors']:>6}"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Time the app's hot paths end to end against local Supabase and OpenAI stand-ins.
+
+Each flow calls the same functions the pages use, against ``FakeServices``
+instead of the real backends, so results are reproducible offline and can be
+compared between commits. Run from the project root:
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --llm-latency-ms 800 --compare bench.json
+    python -m benchmarks.run_benchmarks --flows dashboard_load profile_save
+"""
+import argparse
+import copy
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.fakes import CACHE_BACKENDS, FakeServices, load_fixture, make_text_pdf, seed_demo_data
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_USER_ID = "bench-user"
+
+def load_page(filename):
+    """Import a page script as a module without running its main()."""
+    path = os.path.join(PROJECT_ROOT, "pages", filename)
+    name = "bench_page_" + os.path.splitext(filename)[0].lower()
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class Flows:
+    """The user-facing operations being timed, one method per flow."""
+
+    def __init__(self):
+        # Imported lazily so the settings overrides are in place first
+        from modules.ai.job_digest import job_description_for_prompt
+        from modules.ai.profile_selection import select_profile_items
+        from modules.database.client import db, diff_profile_sections
+        from modules.skills.matcher import compare_skills, find_skills
+        from modules.skills.taxonomy import EVERYDAY_PHRASES
+        from modules.utils.markdown_sections import apply_section_edits
+        from modules.utils.pdf_utils import render_pdf_bytes
+        from modules.utils.resume_content import resume_markdown
+
+        self.db = db
+        self.job_description_for_prompt = job_description_for_prompt
+        self.select_profile_items = select_profile_items
+        self.apply_section_edits = apply_section_edits
+        self.diff_profile_sections = diff_profile_sections
+        self.render_pdf_bytes = render_pdf_bytes
+        self.resume_markdown = resume_markdown
+        self.compare_skills = compare_skills
+        self.find_skills = find_skills
+        self.everyday_phrases = EVERYDAY_PHRASES
+        self.dashboard = load_page("0_Dashboard.py")
+        self.ats = load_page("2_ATS_Score.py")
+        self.builder = load_page("3_Resume_Builder.py")
+        self.job_description = load_fixture("job_description.txt")
+        self.resume_pdf = make_text_pdf(load_fixture("resume.md").splitlines())
+        self._save_counter = 0
+        self._generation_counter = 0
+        self.resume_reply = f"```markdown\n{load_fixture('resume.md')}```"
+        self._saved_resume = None
+
+    def dashboard_load(self):
+        user_record = self.db.get_user(user_id=BENCH_USER_ID)
+        profile_data = user_record.get("profile_data", {}) if user_record else {}
+        resumes = self.db.get_user_resumes(BENCH_USER_ID)
+        self.dashboard.calculate_profile_completion(profile_data)
+        sorted(resumes, key=lambda x: x.get('created_at', ''), reverse=True)[:3]
+
+    def profile_save(self):
+        user_record = self.db.get_user(user_id=BENCH_USER_ID)
+        current_profile = user_record.get("profile_data") or {}
+        new_profile = copy.deepcopy(current_profile)
+        self._save_counter += 1
+        new_profile["basics"]["phone"] = f"+1 555 {self._save_counter:04d}"
+        changed = self.diff_profile_sections(current_profile, new_profile)
+        self.db.update_profile_sections(user_record["id"], changed, current_profile)
+
+    def ats_analysis(self):
+        resume_text = self.ats.extract_text_from_pdf(io.BytesIO(self.resume_pdf))
+        job_details = f"""
+                    Job Title: Senior Backend Engineer
+                    Company: Acme
+                    Description: {self.job_description_for_prompt(self.job_description)}
+                    """
+        result = self.ats.analyze_resume_ats(resume_text, job_details)
+        if not result:
+            raise RuntimeError("ATS analysis returned no result")
+
+    def skill_match(self):
+        # The ATS page's instant keyword check, plus phrases that must not read as skills
+        self.compare_skills(load_fixture("resume.md"), self.job_description)
+        for phrase in self.everyday_phrases:
+            found = self.find_skills(phrase)
+            if found:
+                raise RuntimeError(f"Found {', '.join(found)} in everyday phrase: {phrase}")
+
+    def resume_generation(self):
+        user_record = self.db.get_user(user_id=BENCH_USER_ID)
+        profile_data = user_record.get("profile_data", {}) if user_record else {}
+        # A new company each run, so the job queue cannot serve a deduplicated result
+        self._generation_counter += 1
+        profile_data = self.select_profile_items(profile_data, f"Senior Backend Engineer\n{self.job_description}")
+        messages = self.builder.build_generation_messages(
+            profile_data, "Senior Backend Engineer", f"Acme {self._generation_counter}",
+            self.job_description_for_prompt(self.job_description), "Chronological", "Professional"
+        )
+        replies = self.builder.wait_for_generation(self.builder.submit_generation(messages))
+        self.builder.extract_markdown_resume(replies["resume"])
+
+    def _feedback(self):
+        # Different feedback each run, so the job queue cannot serve a deduplicated result
+        self._generation_counter += 1
+        return f"Shorten the professional summary (round {self._generation_counter})"
+
+    def resume_edit(self):
+        messages = self.builder.SECTION_EDITS.messages(
+            resume_markdown=self.builder.extract_markdown_resume(self.resume_reply), feedback=self._feedback()
+        )
+        job_id = self.builder.submit_resume_suggestions(
+            messages, "llm.edit_resume", response_format={"type": "json_object"}
+        )
+        self.builder.apply_edit_reply(self.resume_reply, self.builder.wait_for_resume_suggestions(job_id))
+
+    def resume_improve(self):
+        context = [
+            {"role": "user", "content": "Write my resume."},
+            {"role": "assistant", "content": self.resume_reply},
+            {"role": "user", "content": self._feedback()},
+        ]
+        replies = self.builder.wait_for_generation(self.builder.submit_improvement(context))
+        self.builder.extract_markdown_resume(replies["resume"])
+
+    def resume_section_save(self):
+        # Save an edit to one section of a stored resume; only that section is written
+        if self._saved_resume is None:
+            self._saved_resume = self.db.create_resume(BENCH_USER_ID, {
+                "title": "Senior Backend Engineer @ Acme",
+                "resume_content": load_fixture("resume.md"),
+            })
+        edited = self.apply_section_edits(load_fixture("resume.md"), [{
+            "action": "replace",
+            "section": "Professional Summary",
+            "content": self._feedback(),
+        }])
+        self.db.update_resume(
+            self._saved_resume["id"], {"resume_content": edited},
+            current_content=self._saved_resume["resume_content"]
+        )
+
+    def pdf_download(self):
+        resume = self.db.get_user_resumes(BENCH_USER_ID)[0]
+        self.render_pdf_bytes(self.resume_markdown(resume.get("resume_content")))
+
+FLOW_NAMES = [
+    "dashboard_load", "profile_save", "ats_analysis", "skill_match", "resume_generation",
+    "resume_edit", "resume_improve", "resume_section_save", "pdf_download",
+]
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+def summarise(samples_ms, requests):
+    return {
+        "runs": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "p50_ms": round(percentile(samples_ms, 0.50), 3),
+        "p95_ms": round(percentile(samples_ms, 0.95), 3),
+        "min_ms": round(min(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+        "requests_per_run": {key: round(value / len(samples_ms), 2) for key, value in sorted(requests.items())},
+    }
+
+def run_flow(flows, services, name, runs, warmup):
+    flow = getattr(flows, name)
+    for _ in range(warmup):
+        flow()
+    services.requests.clear()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        flow()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarise(samples, services.requests)
+
+def compare(previous, current):
+    """Print p50/p95 changes against an earlier results file."""
+    print(f"\nCompared with {previous.get('revision') or 'previous run'}:")
+    for name, stats in current["flows"].items():
+        before = previous.get("flows", {}).get(name)
+        if not before or "p50_ms" not in before or "p50_ms" not in stats:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            change = (stats[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            print(f"  {name:<20} {key:<7} {before[key]:>10.2f} -> {stats[key]:>10.2f} ms ({change:+.1f}%)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flows", nargs="*", choices=FLOW_NAMES, default=FLOW_NAMES)
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per flow")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed runs per flow")
+    parser.add_argument("--resumes", type=int, default=10, help="saved resumes seeded for the benchmark user")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="fixed delay per fake LLM response")
+    parser.add_argument("--llm-ms-per-token", type=float, default=0.0, help="extra fake LLM delay per completion token")
+    parser.add_argument("--cache", choices=CACHE_BACKENDS, default="none",
+                        help="shared cache backend; off by default so every run does the work")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    with FakeServices(args.llm_latency_ms, args.llm_ms_per_token, cache=args.cache) as services:
+        from modules.config.settings import override_settings
+        override_settings(**services.settings())
+        seed_demo_data(services.database, [BENCH_USER_ID], args.resumes)
+        flows = Flows()
+
+        results = {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "config": {
+                "runs": args.runs,
+                "warmup": args.warmup,
+                "resumes": args.resumes,
+                "llm_latency_ms": args.llm_latency_ms,
+                "cache": args.cache,
+                "llm_ms_per_token": args.llm_ms_per_token,
+            },
+            "flows": {},
+        }
+        for name in args.flows:
+            try:
+                results["flows"][name] = run_flow(flows, services, name, args.runs, args.warmup)
+            except Exception as e:
+                results["flows"][name] = {"error": f"{type(e).__name__}: {e}"}
+
+    print(f"{'flow':<20} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10}  requests/run")
+    for name, stats in results["flows"].items():
+        if "error" in stats:
+            print(f"{name:<20} {stats['error']}")
+            continue
+        requests = ", ".join(f"{key}={value}" for key, value in stats["requests_per_run"].items())
+        print(f"{name:<20} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} {stats['mean_ms']:>10.2f}  {requests}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any("error" in stats for stats in results["flows"].values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Optional
+from modules.config.settings import get_settings
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_openai_client():
+    """Get the shared OpenAI client, importing the SDK on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                settings = get_settings()
+                _client = OpenAI(
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url,
+                    timeout=settings.openai_timeout,
+                    max_retries=settings.openai_max_retries
+                )
+    return _client
+
+def _response_cache_key(operation: str, kwargs: dict) -> Optional[str]:
+    """Cache key for the request, or None when the operation's responses are not cached."""
+    settings = get_settings()
+    operations = {name.strip() for name in settings.llm_cache_operations.split(",") if name.strip()}
+    if operation not in operations or kwargs.get("stream"):
+        return None
+    # Without an explicit model the key covers the whole tier chain, which may change with settings
+    request = dict(kwargs)
+    if "model" not in request:
+        from modules.ai.routing import model_chain
+        request["model_chain"] = model_chain(operation)
+    canonical = json.dumps([operation, request], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def create_chat_completion(operation: str, user_id: Optional[str] = None,
+                           on_wait: Optional[Callable[[int], None]] = None, **kwargs):
+    """Create a chat completion on the operation's model tier.
+
+    Without an explicit model the request goes to the tier configured for the
+    operation, and a response that fails the operation's validation is retried
+    on the next stronger tier, so cheap models can handle mechanical tasks.
+    Valid responses of the operations in llm_cache_operations are kept in the
+    shared cache, so an identical request on any replica is answered from it.
+    """
+    from modules.ai.routing import model_chain
+    from modules.cache.store import get_cache
+    from modules.monitoring.metrics import record_cache
+    settings = get_settings()
+    cache_key = _response_cache_key(operation, kwargs)
+    if cache_key:
+        cached = get_cache().get("llm", cache_key)
+        record_cache("llm.response", cached is not None)
+        if cached is not None:
+            from openai.types.chat import ChatCompletion
+            return ChatCompletion.model_validate_json(cached)
+
+    if "model" in kwargs:
+        response, valid = _complete(operation, user_id, on_wait, None, **kwargs)
+    else:
+        chain = model_chain(operation)
+        for index, (tier, model) in enumerate(chain):
+            response, valid = _complete(operation, user_id, on_wait, tier, model=model, **kwargs)
+            if valid or not settings.llm_tier_fallback or index == len(chain) - 1:
+                break
+            print(f"Response from {model} failed validation for {operation}, retrying with {chain[index + 1][1]}")
+    if cache_key and valid:
+        get_cache().set("llm", cache_key, response.model_dump_json().encode("utf-8"), settings.llm_cache_ttl_seconds)
+    return response
+
+def _complete(operation: str, user_id: Optional[str], on_wait: Optional[Callable[[int], None]],
+              tier: Optional[str], **kwargs):
+    """One chat completion through the shared scheduler, inside a tracing span.
+
+    The request waits its turn by operation priority and user, reporting its
+    queue position through on_wait, then runs under the operation's deadline,
+    retry and hedging policy. The span records the model and tier, the prompt
+    size, the time spent queued, the attempts, the token usage reported by the
+    API and whether the response passed validation.
+    """
+    from modules.ai.resilience import call_with_policy
+    from modules.ai.routing import validate_response
+    from modules.ai.scheduler import get_scheduler, estimate_tokens
+    from modules.monitoring.tracing import span, payload_size, record_llm_usage
+    messages = kwargs.get("messages", [])
+    scheduler = get_scheduler()
+    with span(operation, model=kwargs["model"], payload_bytes=payload_size(messages)) as current:
+        if tier:
+            current.set(tier=tier)
+        queued_at = time.perf_counter()
+        tokens = estimate_tokens(operation, messages, kwargs.get("max_tokens"))
+
+        def try_acquire_hedge():
+            ticket = scheduler.try_acquire(operation, user_id, tokens)
+            return (lambda: scheduler.release(ticket)) if ticket else None
+
+        with scheduler.slot(operation, user_id, tokens, on_wait) as ticket:
+            current.set(queue_ms=round((time.perf_counter() - queued_at) * 1000, 3))
+            response = call_with_policy(get_openai_client(), operation, kwargs, current, try_acquire_hedge)
+            record_llm_usage(current, response)
+            ticket.actual_tokens = current.attributes.get("total_tokens")
+        valid = validate_response(operation, response.choices[0].message.content)
+        current.set(valid=valid)
+        return response, valid
+
+def parse_resume(resume_text: str, user_id: Optional[str] = None,
+                 on_wait: Optional[Callable[[int], None]] = None) -> dict:
+    """Structure resume text into profile sections with the LLM."""
+    from modules.ai.prompts import PARSE_RESUME
+    response = create_chat_completion(
+        "llm.parse_resume",
+        user_id=user_id,
+        on_wait=on_wait,
+        messages=PARSE_RESUME.messages(resume_text=resume_text),
+        response_format={ "type": "json_object" }
+    )
+    return json.loads(response.choices[0].message.content)
+
+def digest_job_description(job_description: str, user_id: Optional[str] = None,
+                           on_wait: Optional[Callable[[int], None]] = None) -> dict:
+    """Distill a job description into skills, seniority, responsibilities and keywords with the LLM."""
+    from modules.ai.prompts import JOB_DIGEST
+    response = create_chat_completion(
+        "llm.job_digest",
+        user_id=user_id,
+        on_wait=on_wait,
+        messages=JOB_DIGEST.messages(job_description=job_description.strip()),
+        response_format={ "type": "json_object" }
+    )
+    return json.loads(response.choices[0].message.content)
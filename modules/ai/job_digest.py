@@ -0,0 +1,111 @@
+import threading
+from typing import Callable, Dict, Optional
+from modules.cache.store import get_cache
+from modules.config.settings import get_settings
+from modules.monitoring.metrics import record_cache
+from modules.utils.job_descriptions import job_description_hash
+
+# Bump when the digest prompt or layout changes so stored digests are rebuilt
+DIGEST_VERSION = 1
+CACHE_NAMESPACE = f"job_digest.v{DIGEST_VERSION}"
+
+_inflight_lock = threading.Lock()
+# One lock per job description being digested, so concurrent requests for the
+# same posting in this process wait for a single LLM call
+_inflight: Dict[str, threading.Lock] = {}
+
+def _cache_get(content_hash: str) -> Optional[Dict]:
+    return get_cache().get_json(CACHE_NAMESPACE, content_hash)
+
+def _cache_put(content_hash: str, digest: Dict):
+    get_cache().set_json(CACHE_NAMESPACE, content_hash, digest, get_settings().job_digest_cache_ttl_seconds)
+
+def _stored_digest(content_hash: str) -> Optional[Dict]:
+    from modules.database.client import db
+    try:
+        row = db.get_job_description(content_hash)
+    except Exception as e:
+        print(f"Error loading job description digest: {str(e)}")
+        return None
+    digest = ((row or {}).get("derived") or {}).get("digest")
+    if isinstance(digest, dict) and digest.get("version") == DIGEST_VERSION:
+        return digest
+    return None
+
+def _store_digest(job_description: str, digest: Dict):
+    from modules.database.client import db
+    try:
+        content_hash = db.save_job_description(job_description)
+        if content_hash:
+            db.update_job_description_derived(content_hash, {"digest": digest})
+    except Exception as e:
+        print(f"Error storing job description digest: {str(e)}")
+
+def get_job_digest(job_description: str, user_id: Optional[str] = None,
+                   on_wait: Optional[Callable[[int], None]] = None) -> Dict:
+    """Digest of a job description, computed once per distinct posting.
+
+    Lookup order is the shared cache, then the derived data stored with the
+    posting in job_descriptions, then the LLM. Postings that differ only
+    in case or whitespace share a digest.
+    """
+    from modules.ai.ai_utils import digest_job_description
+    content_hash = job_description_hash(job_description)
+    digest = _cache_get(content_hash)
+    record_cache("job_digest.cache", digest is not None)
+    if digest is not None:
+        return digest
+
+    with _inflight_lock:
+        lock = _inflight.setdefault(content_hash, threading.Lock())
+    try:
+        with lock:
+            # Another session may have finished the same digest while we waited
+            digest = _cache_get(content_hash)
+            if digest is not None:
+                return digest
+            digest = _stored_digest(content_hash)
+            record_cache("job_digest.db", digest is not None)
+            if digest is None:
+                digest = dict(digest_job_description(job_description, user_id=user_id, on_wait=on_wait),
+                              version=DIGEST_VERSION)
+                _store_digest(job_description, digest)
+            _cache_put(content_hash, digest)
+            return digest
+    finally:
+        # Later arrivals find the digest in the cache, so the lock can go
+        with _inflight_lock:
+            if _inflight.get(content_hash) is lock:
+                _inflight.pop(content_hash)
+
+def format_job_digest(digest: Dict) -> str:
+    """Render a digest as the compact text the prompts read in place of the posting."""
+    def items(key):
+        return [str(item).strip() for item in digest.get(key) or [] if str(item).strip()]
+
+    lines = []
+    seniority = str(digest.get("seniority") or "").strip()
+    years = str(digest.get("years_experience") or "").strip()
+    if seniority or years:
+        lines.append(f"Seniority: {seniority} ({years})" if seniority and years else f"Seniority: {seniority or years}")
+    for key, label in (("required_skills", "Required skills"), ("preferred_skills", "Preferred skills")):
+        if items(key):
+            lines.append(f"{label}: {', '.join(items(key))}")
+    for key, label in (("responsibilities", "Responsibilities"), ("qualifications", "Qualifications")):
+        if items(key):
+            lines.append(f"{label}:")
+            lines.extend(f"- {item}" for item in items(key))
+    if items("keywords"):
+        lines.append(f"Keywords: {', '.join(items('keywords'))}")
+    return "\n".join(lines)
+
+def job_description_for_prompt(job_description: str, user_id: Optional[str] = None,
+                               on_wait: Optional[Callable[[int], None]] = None) -> str:
+    """The digest text for a posting, or the posting itself when digests are off or fail."""
+    if not get_settings().llm_job_digest:
+        return job_description
+    try:
+        return format_job_digest(get_job_digest(job_description, user_id=user_id, on_wait=on_wait)) or job_description
+    except Exception as e:
+        print(f"Error building job description digest, using the full posting: {str(e)}")
+        return job_description
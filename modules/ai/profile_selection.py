@@ -0,0 +1,155 @@
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+from modules.config.settings import get_settings
+from modules.monitoring.tracing import traced, annotate
+
+# Profile sections whose entries are ranked against the job; everything else
+# (basics, skills, languages, interests) is always sent
+RANKED_SECTIONS = ("workExperience", "projects", "education", "certifications")
+
+# Most recent entries kept per section whatever their score, so the resume
+# never loses the current job or the latest degree to an older entry that
+# shares more words with the posting
+MIN_ITEMS = {"workExperience": 2, "projects": 0, "education": 1, "certifications": 0}
+
+MONTHS = {name: number for number, name in enumerate("jan feb mar apr may jun jul aug sep oct nov dec".split(), 1)}
+ONGOING = re.compile(r'\b(?:present|current|now|ongoing|today)\b')
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+YEAR_MONTH = re.compile(r'\b(\d{4})[-/.](\d{1,2})\b|\b(\d{1,2})[-/.](\d{4})\b')
+MONTH_NAME = re.compile(r'\b(' + "|".join(MONTHS) + r')[a-z]*\b')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to we will with you your
+""".split())
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping names like c++, c# and node.js whole."""
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+def item_text(item) -> str:
+    """All the text in a profile entry, whatever its shape."""
+    if isinstance(item, dict):
+        return " ".join(item_text(value) for value in item.values())
+    if isinstance(item, list):
+        return " ".join(item_text(value) for value in item)
+    return str(item) if item is not None else ""
+
+class BM25:
+    """Okapi BM25 over a small in-memory corpus."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.counts = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.average_length = sum(self.lengths) / len(documents) if documents else 0.0
+        frequencies = Counter(term for counts in self.counts for term in counts)
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in frequencies.items()
+        }
+
+    def scores(self, query: List[str]) -> List[float]:
+        terms = set(query)
+        results = []
+        for counts, length in zip(self.counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            results.append(sum(
+                self.idf[term] * counts[term] * (self.k1 + 1) / (counts[term] + norm)
+                for term in terms if term in counts
+            ))
+        return results
+
+def date_key(value) -> Tuple[int, int]:
+    """(year, month) of a free-text profile date such as "Mar 2021", "2021-03" or "2021".
+
+    Empty dates and "Present" sort as newest, dates without a year as oldest.
+    """
+    text = str(value or "").strip().lower()
+    if not text or ONGOING.search(text):
+        return (9999, 12)
+    year = YEAR.search(text)
+    if not year:
+        return (0, 0)
+    numeric = YEAR_MONTH.search(text)
+    if numeric:
+        month = int(numeric.group(2) or numeric.group(3))
+    else:
+        name = MONTH_NAME.search(text)
+        month = MONTHS[name.group(1)] if name else 0
+    return (int(year.group(0)), month if 1 <= month <= 12 else 0)
+
+def recency(item) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Sort key putting ongoing and later-ending entries first when reversed."""
+    entry = item if isinstance(item, dict) else {}
+    return (date_key(entry.get("endDate")), date_key(entry.get("startDate")))
+
+def most_recent(items: List, count: int) -> List[int]:
+    """Indexes of the count most recent entries, by end then start date; ties keep list order."""
+    if count <= 0:
+        return []
+    return sorted(range(len(items)), key=lambda index: recency(items[index]), reverse=True)[:count]
+
+def estimate_tokens(item) -> int:
+    """Prompt tokens an entry adds, at about four characters per token of its JSON."""
+    return len(json.dumps(item, indent=2, sort_keys=True)) // 4
+
+@traced("profile.select")
+def select_profile_items(profile_data: Dict, job_text: str, token_budget: int = None) -> Dict:
+    """Copy of the profile keeping only the entries most relevant to the job.
+
+    Each section keeps its MIN_ITEMS most recent entries by date, wherever
+    they are in the list. The other entries of the ranked sections are scored against the job text
+    with BM25 and added best first while they fit in the token budget, so a
+    profile that fits is sent whole. Kept entries stay in their original
+    order. A budget of 0 (the profile_token_budget setting) keeps everything.
+    """
+    budget = get_settings().profile_token_budget if token_budget is None else token_budget
+    candidates = [
+        (section, index, item)
+        for section in RANKED_SECTIONS
+        if isinstance(profile_data.get(section), list)
+        for index, item in enumerate(profile_data[section])
+    ]
+    if not budget or not candidates:
+        return profile_data
+
+    scores = BM25([tokenize(item_text(item)) for _, _, item in candidates]).scores(tokenize(job_text))
+    ranked = sorted(range(len(candidates)), key=lambda position: -scores[position])
+    kept, used = set(), 0
+    # The most recent entries of each section first, then the best remaining entries that fit
+    recent = {
+        (section, index)
+        for section in RANKED_SECTIONS
+        if isinstance(profile_data.get(section), list)
+        for index in most_recent(profile_data[section], MIN_ITEMS.get(section, 0))
+    }
+    for position, (section, index, item) in enumerate(candidates):
+        if (section, index) in recent:
+            kept.add(position)
+            used += estimate_tokens(item)
+    for position in ranked:
+        section, _, item = candidates[position]
+        if position in kept:
+            continue
+        cost = estimate_tokens(item)
+        if used + cost > budget:
+            continue
+        kept.add(position)
+        used += cost
+
+    selected = dict(profile_data)
+    for section in RANKED_SECTIONS:
+        if isinstance(profile_data.get(section), list):
+            selected[section] = [
+                item for position, (item_section, _, item) in enumerate(candidates)
+                if item_section == section and position in kept
+            ]
+    annotate(items=len(candidates), kept=len(kept), tokens=used)
+    return selected
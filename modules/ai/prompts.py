@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A chat prompt split into fixed instructions and per-request inputs.
+
+    The system message and the instructions are identical for every request,
+    so they form a stable prefix that the provider's prompt cache can reuse.
+    Only the inputs, rendered last with str.format, vary. Inputs are ordered
+    from most to least stable (a user's profile before the job they target) so
+    repeat calls from one user share an even longer prefix.
+    """
+
+    system: str
+    instructions: str
+    inputs: str
+
+    def render(self, **values) -> str:
+        """The user message: instructions first, then the filled-in inputs."""
+        return f"{self.instructions}\n\n{self.inputs.format(**values)}"
+
+    def messages(self, **values) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(**values)},
+        ]
+
+PARSE_RESUME = PromptTemplate(
+    system="You are a resume parser that extracts structured information from resume text. Return arrays as proper JSON arrays, not comma-separated strings.",
+    instructions="""Parse the resume text given at the end and extract information in a structured JSON format.
+Include the following sections:
+- basics (name, email, phone, summary, location, dob, github, linkedin, postal_code, city, country)
+- education (list of education entries with institution, degree, fieldOfStudy, startDate, endDate, details)
+- workExperience (list of work entries with jobTitle, company, location, startDate, endDate, responsibilities)
+- projects (list of projects with name, description, technologies, date, link)
+- certifications (list of certifications with name, year)
+- skills (programmingLanguages, frameworksLibraries, toolsPlatforms, cloud, domains, softSkills)
+- languages (list of languages)
+- interests (list of interests)
+
+Return only the JSON object, no additional text. For arrays of strings (like responsibilities, technologies, etc.),
+return them as proper arrays, not comma-separated strings.""",
+    inputs="""Resume text:
+{resume_text}""",
+)
+
+ATS_ANALYSIS = PromptTemplate(
+    system="You are a helpful ATS analysis assistant. Always respond with valid JSON.",
+    instructions="""You are an expert ATS (Applicant Tracking System) analyst with 15+ years of experience in recruitment and HR technology.
+
+## TASK
+Analyze the resume given under INPUTS against the job description and provide a detailed ATS compatibility assessment.
+
+## OUTPUT FORMAT
+Provide your analysis in the following JSON format:
+{
+    "overall_score": <score out of 100>,
+    "score_breakdown": {
+        "keyword_match": <score out of 100>,
+        "format_compatibility": <score out of 100>,
+        "content_relevance": <score out of 100>,
+        "experience_alignment": <score out of 100>
+    },
+    "missing_keywords": [<list of important keywords from job description missing in resume>],
+    "format_issues": [<list of format-related issues>],
+    "content_suggestions": [<list of content improvement suggestions>],
+    "experience_gaps": [<list of experience gaps or misalignments>],
+    "strengths": [<list of resume strengths>],
+    "improvement_areas": [<list of areas needing improvement>]
+}
+
+Focus on providing specific, actionable feedback that will help improve the resume's ATS compatibility.""",
+    inputs="""## INPUTS
+
+### Resume Text:
+{resume_text}
+
+### Job Description:
+{job_details}""",
+)
+
+# Distilled once per distinct job description and cached by content hash;
+# the ATS analysis and resume generation read this digest instead of the
+# raw posting
+JOB_DIGEST = PromptTemplate(
+    system="You are a job description analyst. Always respond with valid JSON.",
+    instructions="""Distill the job description given under INPUTS into a compact digest that a resume writer and an ATS analyst can work from without the original posting.
+
+## OUTPUT FORMAT
+Return a JSON object of the form:
+{
+    "title": "<job title>",
+    "seniority": "<seniority level, e.g. junior, mid, senior, lead>",
+    "years_experience": "<required years of experience, or empty>",
+    "required_skills": [<skills, tools and technologies the posting requires>],
+    "preferred_skills": [<nice-to-have skills, tools and technologies>],
+    "responsibilities": [<main responsibilities, one short phrase each>],
+    "qualifications": [<degrees, certifications and other requirements>],
+    "keywords": [<every term an ATS would match on, spelled as in the posting>]
+}
+
+Leave out company marketing, benefits and legal boilerplate. Do not invent requirements the posting does not state.""",
+    inputs="""## INPUTS
+
+### Job Description:
+{job_description}""",
+)
+
+# Resume generation is split into two calls that run concurrently: the gap
+# analysis with recommendations, and the optimized resume on its own. Both
+# take the same inputs.
+RESUME_SYSTEM = "You are a helpful resume assistant."
+
+RESUME_INPUTS = """## INPUTS
+
+### User Resume Data (JSON):
+{profile_json}
+
+### Target Position:
+Job Title: {job_title}
+Company: {company}
+Job Description:
+{job_description}
+
+### Formatting Preferences:
+Resume Format: {resume_format}
+Writing Tone: {tone}"""
+
+GAP_ANALYSIS = PromptTemplate(
+    system=RESUME_SYSTEM,
+    instructions="""You are an expert ATS-optimization specialist and professional resume coach with 15+ years of experience helping candidates secure interviews at top companies.
+
+## YOUR TASK
+Analyze the candidate's resume data given under INPUTS against the specific job requirements, then provide a gap analysis and strategic recommendations. Do not write the resume itself; it is produced separately.
+
+## OUTPUT INSTRUCTIONS
+Answer in markdown with exactly these two sections.
+
+### 1. ANALYSIS SECTION
+- Provide a keyword/skills match analysis (which skills from the job description are present/missing in the resume)
+- Identify experience gaps and alignment opportunities
+- Calculate an overall match score (1-100) with brief explanation
+- List 3-5 specific strengths in relation to this position
+- Identify 3-5 potential weaknesses or improvement areas
+
+### 2. RECOMMENDATIONS SECTION
+- Suggest specific, actionable changes to improve ATS performance
+- Recommend skills/keywords to add, emphasize, or remove
+- Propose improvements to bullet points, focusing on quantifiable achievements
+- Suggest adjustments to prioritize most relevant experience based on job requirements
+- Recommend sections to expand, condense, or remove entirely""",
+    inputs=RESUME_INPUTS,
+)
+
+OPTIMIZED_RESUME = PromptTemplate(
+    system=RESUME_SYSTEM,
+    instructions="""You are an expert ATS-optimization specialist and professional resume coach with 15+ years of experience helping candidates secure interviews at top companies.
+
+## YOUR TASK
+Write an ATS-optimized resume for the candidate whose resume data is given under INPUTS, tailored to the specific job requirements.
+
+## OUTPUT INSTRUCTIONS
+- Reply with the resume only, as a single fenced ```markdown code block, with no text before or after it
+- Start the resume with the candidate's name as a level-1 heading and use level-2 headings for sections
+- Close gaps against the job description while maintaining honesty
+- Prioritize the most relevant experience and skills first
+- Use strong action verbs and quantifiable results
+- Format according to the resume format given under Formatting Preferences
+- Maintain the writing tone given under Formatting Preferences
+- Ensure the resume is scannable for both ATS and human readers
+- Keep the resume concise (1-2 pages equivalent)
+
+Important: Focus on creating a compelling, honest, and targeted resume that will pass ATS screening and impress hiring managers. Use your expertise to make strategic decisions about what to include, emphasize, or remove based on relevance to this specific position.""",
+    inputs=RESUME_INPUTS,
+)
+
+# Improvements first ask for targeted section edits, applied locally by
+# modules.utils.markdown_sections; a full regeneration is the fallback
+SECTION_EDITS = PromptTemplate(
+    system="You are a helpful resume assistant. Always respond with valid JSON.",
+    instructions="""You are an expert resume editor. Apply the user's feedback given under INPUTS to their markdown resume by returning edits to whole sections only, leaving every other section untouched.
+
+Sections start at level-2 ("## ") headings. The part before the first level-2 heading (name and contact details) is the header section, addressed with an empty section name.
+
+## OUTPUT FORMAT
+Return a JSON object of the form:
+{
+    "edits": [
+        {
+            "action": "replace" | "insert_after" | "delete",
+            "section": "<exact heading text of an existing section, or empty for the header>",
+            "content": "<for replace and insert_after: the complete new section in markdown, starting with its ## heading>"
+        }
+    ]
+}
+
+Return as few edits as the feedback needs. Keep the resume honest and consistent with the rest of its content.""",
+    inputs="""## INPUTS
+
+### Current Resume:
+{resume_markdown}
+
+### Feedback:
+{feedback}""",
+)
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from modules.config.settings import get_settings
+from modules.monitoring.metrics import RollingWindow, get_registry, percentile
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    """How long one LLM task may take and whether it may be hedged."""
+
+    deadline_seconds: float
+    hedge: bool = False
+
+# Quick interactive checks are hedged; long generations are not, since a
+# duplicate would double the cost of the most expensive calls
+TASK_POLICIES = {
+    "llm.ats_analysis": RequestPolicy(deadline_seconds=60.0, hedge=True),
+    "llm.parse_resume": RequestPolicy(deadline_seconds=90.0, hedge=True),
+    "llm.job_digest": RequestPolicy(deadline_seconds=60.0, hedge=True),
+    "llm.edit_resume": RequestPolicy(deadline_seconds=60.0),
+    "llm.resume_analysis": RequestPolicy(deadline_seconds=120.0),
+    "llm.generate_resume": RequestPolicy(deadline_seconds=180.0),
+    "llm.improve_resume": RequestPolicy(deadline_seconds=180.0),
+}
+DEFAULT_POLICY = RequestPolicy(deadline_seconds=120.0)
+
+# Hedging waits for this many successful calls before trusting the p95
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 256
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The task's deadline passed before the provider answered."""
+
+_latencies: Dict[str, RollingWindow] = {}
+_latencies_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _latency_window(operation: str) -> RollingWindow:
+    window = _latencies.get(operation)
+    if window is None:
+        with _latencies_lock:
+            window = _latencies.setdefault(operation, RollingWindow(LATENCY_WINDOW))
+    return window
+
+def hedge_delay(operation: str) -> Optional[float]:
+    """p95 of recent successful provider calls in seconds, or None while there are too few."""
+    durations, _, _ = _latency_window(operation).since(0)
+    if len(durations) < HEDGE_MIN_SAMPLES:
+        return None
+    return percentile(sorted(durations), 0.95) / 1000
+
+def is_transient(error: BaseException) -> bool:
+    """Errors worth retrying: timeouts, dropped connections, rate limits and 5xx responses."""
+    import openai
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def backoff_delay(attempt: int, error: BaseException) -> float:
+    """Exponential backoff with full jitter, honouring a Retry-After header when present."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    settings = get_settings()
+    return random.uniform(0, min(settings.llm_backoff_max_seconds, settings.llm_backoff_base_seconds * 2 ** (attempt - 1)))
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().llm_max_concurrency * 2,
+                    thread_name_prefix="llm-hedge"
+                )
+    return _executor
+
+def _call(client, operation: str, request: Dict, timeout: float):
+    """One provider request with its own timeout and no SDK-level retries."""
+    start = time.perf_counter()
+    response = client.with_options(timeout=timeout, max_retries=0).chat.completions.create(**request)
+    _latency_window(operation).add(time.time(), (time.perf_counter() - start) * 1000)
+    return response
+
+def _hedged_call(client, operation: str, request: Dict, deadline: float,
+                 try_acquire: Callable[[], Optional[Callable[[], None]]], current_span):
+    """Send the request, and a duplicate if it is still running after the p95 delay.
+
+    try_acquire returns a release callback when there is capacity for the
+    duplicate, or None, in which case the original is simply awaited.
+    """
+    delay = hedge_delay(operation)
+    remaining = deadline - time.monotonic()
+    if delay is None or delay >= remaining:
+        return _call(client, operation, request, remaining)
+
+    executor = _get_executor()
+    primary = executor.submit(_call, client, operation, request, remaining)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    release = try_acquire()
+    if release is None:
+        done, _ = wait([primary], timeout=max(0.0, deadline - time.monotonic()))
+        if not done:
+            raise LLMDeadlineExceeded(f"{operation} did not finish before its deadline")
+        return primary.result()
+
+    hedge = executor.submit(_call, client, operation, request, max(0.0, deadline - time.monotonic()))
+    hedge.add_done_callback(lambda _: release())
+    current_span.set(hedged=True)
+    pending = {primary, hedge}
+    first_error = None
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                won = future is hedge
+                current_span.set(hedge_won=won)
+                get_registry().record_hedge(operation, won)
+                return future.result()
+            first_error = first_error or future.exception()
+    if first_error is not None and not pending:
+        get_registry().record_hedge(operation, False)
+        raise first_error
+    raise LLMDeadlineExceeded(f"{operation} did not finish before its deadline")
+
+def call_with_policy(client, operation: str, request: Dict, current_span,
+                     try_acquire: Callable[[], Optional[Callable[[], None]]]) -> Any:
+    """Call the provider within the task's deadline, retrying transient errors.
+
+    Retries back off exponentially with jitter and stop after
+    openai_max_retries retries, or when the next attempt could not start
+    before the deadline. Tasks whose policy allows it are hedged when
+    llm_hedging is on.
+    """
+    settings = get_settings()
+    policy = TASK_POLICIES.get(operation, DEFAULT_POLICY)
+    deadline = time.monotonic() + policy.deadline_seconds
+    hedging = policy.hedge and settings.llm_hedging
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMDeadlineExceeded(f"{operation} did not finish within {policy.deadline_seconds:.0f}s")
+        try:
+            if hedging:
+                response = _hedged_call(client, operation, request, deadline, try_acquire, current_span)
+            else:
+                response = _call(client, operation, request, remaining)
+            current_span.set(attempts=attempt)
+            return response
+        except LLMDeadlineExceeded:
+            current_span.set(attempts=attempt)
+            raise
+        except Exception as e:
+            if not is_transient(e) or attempt > settings.openai_max_retries:
+                current_span.set(attempts=attempt)
+                raise
+            delay = backoff_delay(attempt, e)
+            if time.monotonic() + delay >= deadline:
+                current_span.set(attempts=attempt)
+                raise
+            print(f"Retrying {operation} after {type(e).__name__} (attempt {attempt}): {str(e)}")
+            time.sleep(delay)
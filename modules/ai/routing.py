@@ -0,0 +1,100 @@
+import json
+import re
+from typing import Callable, Dict, List, Tuple
+from modules.config.settings import get_settings
+
+# Model tiers from cheapest to strongest. A task starts at its configured tier
+# and falls back up the list when a response fails validation.
+TIERS = ("fast", "strong")
+DEFAULT_TIER = "strong"
+
+# Operation -> function(content) returning whether the response is usable
+VALIDATORS: Dict[str, Callable[[str], bool]] = {}
+
+def response_validator(operation: str):
+    """Register the check a response for the given operation must pass."""
+    def decorator(func):
+        VALIDATORS[operation] = func
+        return func
+    return decorator
+
+def tier_models() -> Dict[str, str]:
+    settings = get_settings()
+    return {"fast": settings.llm_model_fast, "strong": settings.llm_model}
+
+def task_tier(operation: str) -> str:
+    """Configured tier for an operation, from the "operation=tier, ..." llm_task_tiers setting."""
+    for entry in get_settings().llm_task_tiers.split(","):
+        name, _, tier = entry.partition("=")
+        if name.strip() == operation and tier.strip() in TIERS:
+            return tier.strip()
+    return DEFAULT_TIER
+
+def model_chain(operation: str) -> List[Tuple[str, str]]:
+    """(tier, model) pairs to try for an operation, starting at its configured tier."""
+    models = tier_models()
+    chain = []
+    for tier in TIERS[TIERS.index(task_tier(operation)):]:
+        if not chain or models[tier] != chain[-1][1]:
+            chain.append((tier, models[tier]))
+    return chain
+
+def validate_response(operation: str, content: str) -> bool:
+    validator = VALIDATORS.get(operation)
+    if validator is None:
+        return True
+    try:
+        return bool(validator(content or ""))
+    except Exception:
+        return False
+
+def _json_object(content: str):
+    """Parse a JSON object, tolerating text around it as the ATS page does."""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = re.search(r'\{.*\}', content, re.DOTALL)
+        return json.loads(match.group(0)) if match else None
+
+@response_validator("llm.parse_resume")
+def _valid_parsed_resume(content: str) -> bool:
+    data = _json_object(content)
+    if not isinstance(data, dict) or not isinstance(data.get("basics"), dict):
+        return False
+    sections = ("education", "workExperience", "projects", "certifications", "languages", "interests")
+    return all(isinstance(data[section], list) for section in sections if section in data)
+
+@response_validator("llm.ats_analysis")
+def _valid_ats_analysis(content: str) -> bool:
+    data = _json_object(content)
+    if not isinstance(data, dict) or not isinstance(data.get("score_breakdown"), dict):
+        return False
+    breakdown = ("keyword_match", "format_compatibility", "content_relevance", "experience_alignment")
+    return (
+        isinstance(data.get("overall_score"), (int, float))
+        and all(key in data["score_breakdown"] for key in breakdown)
+        and isinstance(data.get("missing_keywords"), list)
+    )
+
+@response_validator("llm.job_digest")
+def _valid_job_digest(content: str) -> bool:
+    data = _json_object(content)
+    lists = ("required_skills", "responsibilities", "keywords")
+    return isinstance(data, dict) and all(isinstance(data.get(key), list) for key in lists) and bool(data["keywords"])
+
+@response_validator("llm.edit_resume")
+def _valid_section_edits(content: str) -> bool:
+    data = _json_object(content)
+    edits = data.get("edits") if isinstance(data, dict) else None
+    return bool(edits) and all(
+        isinstance(edit, dict) and edit.get("action") in ("replace", "insert_after", "delete")
+        and isinstance(edit.get("section", ""), str)
+        for edit in edits
+    )
+
+@response_validator("llm.generate_resume")
+@response_validator("llm.improve_resume")
+def _valid_resume_suggestions(content: str) -> bool:
+    # The builder needs a fenced markdown resume with at least one heading
+    match = re.search(r'```markdown(.*?)```', content, re.DOTALL)
+    return bool(match) and re.search(r'^#{1,3} \S', match.group(1), re.MULTILINE) is not None
@@ -0,0 +1,266 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from modules.config.settings import get_settings
+
+# Lower numbers are served first. Quick interactive checks go ahead of
+# long generations; waiting requests are promoted as they age so a burst of
+# ATS checks cannot starve generation forever.
+TASK_PRIORITIES = {
+    "llm.ats_analysis": 0,
+    "llm.job_digest": 0,
+    "llm.parse_resume": 1,
+    "llm.edit_resume": 2,
+    "llm.improve_resume": 2,
+    "llm.resume_analysis": 3,
+    "llm.generate_resume": 3,
+}
+DEFAULT_PRIORITY = 2
+
+# Expected completion size per task, used to charge the token budget up front
+COMPLETION_ESTIMATES = {
+    "llm.ats_analysis": 800,
+    "llm.job_digest": 600,
+    "llm.parse_resume": 1500,
+    "llm.edit_resume": 500,
+    "llm.improve_resume": 1500,
+    "llm.resume_analysis": 1000,
+    "llm.generate_resume": 1500,
+}
+DEFAULT_COMPLETION_ESTIMATE = 1500
+
+class Ticket:
+    """One queued LLM request."""
+
+    def __init__(self, task: str, user: str, tokens: int):
+        self.task = task
+        self.user = user
+        self.priority = TASK_PRIORITIES.get(task, DEFAULT_PRIORITY)
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.actual_tokens: Optional[int] = None
+
+class LLMScheduler:
+    """Process-wide admission control for LLM calls.
+
+    Requests wait in one queue per priority class. Within a class users are
+    served round-robin, so one user's burst of generations only delays their
+    own requests. A request is started when a concurrency slot is free and the
+    tokens-per-minute bucket can cover its estimated size.
+    """
+
+    def __init__(self, max_concurrency: int = 4, tokens_per_minute: int = 0, aging_seconds: float = 30.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.aging_seconds = aging_seconds
+        self._cond = threading.Condition()
+        self._queues: Dict[int, "OrderedDict[str, deque]"] = {}
+        self._running = 0
+        self._bucket = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+
+    # Underscore methods expect self._cond to be held by the caller
+
+    def _refill(self):
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        self._bucket = min(
+            float(self.tokens_per_minute),
+            self._bucket + (now - self._refilled_at) * self.tokens_per_minute / 60
+        )
+        self._refilled_at = now
+
+    def _effective_priority(self, priority: int, now: float) -> float:
+        users = self._queues[priority]
+        oldest = min(queue[0].enqueued_at for queue in users.values())
+        promotion = int((now - oldest) / self.aging_seconds) if self.aging_seconds else 0
+        return priority - promotion
+
+    def _next_class(self) -> Optional[int]:
+        now = time.monotonic()
+        waiting = [priority for priority, users in self._queues.items() if users]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda priority: (self._effective_priority(priority, now), priority))
+
+    def _dispatch(self):
+        """Grant queued tickets while slots and token budget allow."""
+        self._refill()
+        granted = False
+        while self._running < self.max_concurrency:
+            priority = self._next_class()
+            if priority is None:
+                break
+            users = self._queues[priority]
+            user, queue = next(iter(users.items()))
+            ticket = queue[0]
+            if self.tokens_per_minute:
+                # An oversized request may start once the bucket is full, otherwise it would never run
+                needed = min(ticket.tokens, self.tokens_per_minute)
+                if self._bucket < needed:
+                    break
+                self._bucket -= ticket.tokens
+            queue.popleft()
+            # Round-robin: the user just served moves to the back of the class
+            users.pop(user)
+            if queue:
+                users[user] = queue
+            ticket.granted = True
+            self._running += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _position(self, ticket: Ticket) -> int:
+        """1-based place of the ticket in the expected service order."""
+        now = time.monotonic()
+        mine = (self._effective_priority(ticket.priority, now), ticket.priority)
+        ahead = 0
+        for priority, users in self._queues.items():
+            if not users or priority == ticket.priority:
+                continue
+            if (self._effective_priority(priority, now), priority) < mine:
+                ahead += sum(len(queue) for queue in users.values())
+        users = self._queues[ticket.priority]
+        index = users[ticket.user].index(ticket)
+        before_me = True
+        for user, queue in users.items():
+            if user == ticket.user:
+                before_me = False
+                continue
+            # Users earlier in the rotation get one more turn before ours
+            ahead += min(len(queue), index + 1 if before_me else index)
+        return ahead + index + 1
+
+    def _remove(self, ticket: Ticket):
+        users = self._queues.get(ticket.priority, {})
+        queue = users.get(ticket.user)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                users.pop(ticket.user)
+
+    def acquire(self, task: str, user: Optional[str], tokens: int,
+                on_wait: Optional[Callable[[int], None]] = None) -> Ticket:
+        """Block until the request may start.
+
+        on_wait is called with the queue position whenever it changes, and
+        with 0 once the request starts after having waited.
+        """
+        with self._cond:
+            ticket = Ticket(task, user or "anonymous", tokens)
+            self._queues.setdefault(ticket.priority, OrderedDict()).setdefault(ticket.user, deque()).append(ticket)
+            self._dispatch()
+        last_position = None
+        try:
+            while True:
+                with self._cond:
+                    if not ticket.granted:
+                        self._dispatch()
+                    if ticket.granted:
+                        break
+                    position = self._position(ticket)
+                    if position == last_position:
+                        # Also wake up periodically so the token bucket can refill
+                        self._cond.wait(timeout=0.5)
+                        continue
+                # Called without the lock held: it usually updates the page
+                last_position = position
+                if on_wait:
+                    on_wait(position)
+            if last_position is not None and on_wait:
+                on_wait(0)
+        except BaseException:
+            # The script was stopped or rerun while waiting
+            self.cancel(ticket)
+            raise
+        return ticket
+
+    def try_acquire(self, task: str, user: Optional[str], tokens: int) -> Optional[Ticket]:
+        """Take a slot immediately if one is free and nobody is waiting, else return None.
+
+        Used for optional extra work such as hedged requests, which must never
+        delay queued users.
+        """
+        with self._cond:
+            self._refill()
+            if self._running >= self.max_concurrency or any(self._queues.values()):
+                return None
+            if self.tokens_per_minute:
+                if self._bucket < tokens:
+                    return None
+                self._bucket -= tokens
+            ticket = Ticket(task, user or "anonymous", tokens)
+            ticket.granted = True
+            self._running += 1
+            return ticket
+
+    def cancel(self, ticket: Ticket):
+        """Drop a ticket that is no longer wanted, freeing its slot if it had one."""
+        with self._cond:
+            if ticket.granted:
+                self._release_locked(ticket)
+            else:
+                self._remove(ticket)
+                self._cond.notify_all()
+
+    def _release_locked(self, ticket: Ticket):
+        self._running -= 1
+        if self.tokens_per_minute and ticket.actual_tokens is not None:
+            # Settle the up-front estimate against what the request really used
+            self._refill()
+            self._bucket = min(float(self.tokens_per_minute), self._bucket + ticket.tokens - ticket.actual_tokens)
+        self._dispatch()
+        self._cond.notify_all()
+
+    def release(self, ticket: Ticket):
+        """Free the ticket's slot once the request has finished."""
+        with self._cond:
+            self._release_locked(ticket)
+
+    @contextmanager
+    def slot(self, task: str, user: Optional[str], tokens: int,
+             on_wait: Optional[Callable[[int], None]] = None):
+        """Hold a slot for the duration of the block; set ticket.actual_tokens to settle the budget."""
+        ticket = self.acquire(task, user, tokens, on_wait)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def snapshot(self) -> Dict:
+        """Current load, for the performance page."""
+        with self._cond:
+            self._refill()
+            return {
+                "running": self._running,
+                "waiting": sum(len(queue) for users in self._queues.values() for queue in users.values()),
+                "tokens_available": int(self._bucket) if self.tokens_per_minute else None,
+            }
+
+def estimate_tokens(task: str, messages, max_tokens: Optional[int] = None) -> int:
+    """Rough token count for a request: about four characters per prompt token plus the expected reply."""
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in messages or [])
+    completion = max_tokens or COMPLETION_ESTIMATES.get(task, DEFAULT_COMPLETION_ESTIMATE)
+    return prompt_chars // 4 + completion
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> LLMScheduler:
+    """The process-wide scheduler, configured from settings on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                settings = get_settings()
+                _scheduler = LLMScheduler(
+                    settings.llm_max_concurrency,
+                    settings.llm_tokens_per_minute,
+                    settings.llm_priority_aging_seconds
+                )
+    return _scheduler
@@ -1,4 +1,5 @@
 import streamlit as st
+from modules.config.settings import get_settings
 
 def check_auth():
     """Check if the user is authenticated."""
@@ -8,6 +9,7 @@ def get_user_info():
     """Get the current user's information."""
     if check_auth():
         return {
+            "id": getattr(st.user, "sub", None),
             "name": st.user.name,
             "email": st.user.email,
             "picture": st.user.picture
@@ -23,4 +25,11 @@ def require_auth():
                 return None
             return func(*args, **kwargs)
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator 
+
+def is_admin():
+    """Check if the logged-in user is listed in the admin_emails setting."""
+    if not check_auth():
+        return False
+    admins = {email.strip().lower() for email in get_settings().admin_emails.split(",") if email.strip()}
+    return (getattr(st.user, "email", "") or "").lower() in admins
@@ -0,0 +1,249 @@
+import os
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+class CacheBackend:
+    """Byte store with per-entry expiry behind the shared cache.
+
+    Keys arrive fully namespaced. ttl is in seconds; None keeps the entry
+    until the backend evicts it.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class NullBackend(CacheBackend):
+    """Caches nothing, for turning the shared cache off."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+class MemoryBackend(CacheBackend):
+    """LRU dictionary in this process, bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _pop(self, key: str):
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+
+SQLITE_SCHEMA = """
+create table if not exists cache_entries (
+    key text primary key,
+    value blob not null,
+    expires_at real
+);
+create index if not exists cache_entries_expires on cache_entries (expires_at);
+"""
+
+class SQLiteBackend(CacheBackend):
+    """Cache table in a local SQLite file, shared by every server process on the host.
+
+    Expired rows are skipped on read and deleted at most once per
+    purge_seconds, on a write.
+    """
+
+    def __init__(self, path: str, purge_seconds: float = 300.0):
+        self.path = path
+        self.purge_seconds = purge_seconds
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._purged_at = 0.0
+        with self._lock:
+            self._conn.execute("pragma journal_mode=wal")
+            self._conn.executescript(SQLITE_SCHEMA)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "select value from cache_entries where key = ? and (expires_at is null or expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "insert or replace into cache_entries (key, value, expires_at) values (?, ?, ?)",
+                (key, sqlite3.Binary(value), now + ttl if ttl else None)
+            )
+            if now - self._purged_at > self.purge_seconds:
+                self._purged_at = now
+                self._conn.execute("delete from cache_entries where expires_at <= ?", (now,))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("delete from cache_entries where key = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+class RespConnection:
+    """One connection speaking RESP, the Redis wire protocol.
+
+    Only what the cache needs: send a command as an array of bulk strings and
+    read back one reply.
+    """
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlparse(url)
+        self._sock = socket.create_connection((parsed.hostname or "localhost", parsed.port or 6379), timeout=timeout)
+        if parsed.scheme == "rediss":
+            self._sock = ssl.create_default_context().wrap_socket(self._sock, server_hostname=parsed.hostname)
+        self._reader = self._sock.makefile("rb")
+        if parsed.password:
+            credentials = [unquote(parsed.username), unquote(parsed.password)] if parsed.username else [unquote(parsed.password)]
+            self.command("AUTH", *credentials)
+        database = parsed.path.strip("/")
+        if database and database != "0":
+            self.command("SELECT", database)
+
+    def command(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        self._sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by the cache server")
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from the cache server: {line!r}")
+
+    def close(self):
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+class RedisBackend(CacheBackend):
+    """Any server speaking the Redis protocol (Redis, Valkey, KeyDB, ...), shared by every replica.
+
+    Each thread keeps its own connection; a dropped connection is reopened
+    and the command sent once more.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _command(self, *args):
+        for attempt in (1, 2):
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = RespConnection(self.url, self.timeout)
+                self._local.connection = connection
+                with self._lock:
+                    self._connections.append(connection)
+            try:
+                return connection.command(*args)
+            except (OSError, ConnectionError):
+                connection.close()
+                self._local.connection = None
+                with self._lock:
+                    if connection in self._connections:
+                        self._connections.remove(connection)
+                if attempt == 2:
+                    raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if ttl:
+            self._command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+        else:
+            self._command("SET", key, value)
+
+    def delete(self, key: str):
+        self._command("DEL", key)
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from typing import Any, Optional
+from modules.cache.backends import CacheBackend, MemoryBackend, NullBackend, RedisBackend, SQLiteBackend
+from modules.config.settings import get_settings
+
+class Cache:
+    """Namespaced cache over a pluggable backend.
+
+    Entries are stored under "<prefix>:<namespace>:<key>", so several caches
+    (and several apps) can share one backend. A failing backend never fails
+    the caller: lookups miss and writes are dropped, and after an error the
+    backend is left alone for retry_seconds.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str = "", retry_seconds: float = 5.0):
+        self.backend = backend
+        self.prefix = prefix
+        self.retry_seconds = retry_seconds
+        self._down_until = 0.0
+
+    def key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}" if self.prefix else f"{namespace}:{key}"
+
+    def _failed(self, action: str, e: Exception):
+        print(f"Error {action} cache: {str(e)}")
+        self._down_until = time.monotonic() + self.retry_seconds
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return self.backend.get(self.key(namespace, key))
+        except Exception as e:
+            self._failed("reading", e)
+            return None
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None):
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            self.backend.set(self.key(namespace, key), value, ttl)
+        except Exception as e:
+            self._failed("writing", e)
+
+    def delete(self, namespace: str, key: str):
+        try:
+            self.backend.delete(self.key(namespace, key))
+        except Exception as e:
+            self._failed("deleting from", e)
+
+    def get_json(self, namespace: str, key: str) -> Any:
+        data = self.get(namespace, key)
+        return json.loads(data) if data is not None else None
+
+    def set_json(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        self.set(namespace, key, json.dumps(value, separators=(",", ":")).encode("utf-8"), ttl)
+
+def create_backend(kind: str, url: str = "") -> CacheBackend:
+    """Backend for the cache_backend setting: "memory", "sqlite" (url is the file), "redis" (url is redis://...) or "none"."""
+    settings = get_settings()
+    if kind == "none":
+        return NullBackend()
+    if kind == "memory":
+        return MemoryBackend(settings.cache_memory_mb * 1024 * 1024)
+    if kind == "sqlite":
+        return SQLiteBackend(url or "data/cache.sqlite3")
+    if kind == "redis":
+        return RedisBackend(url or "redis://localhost:6379/0", settings.cache_timeout_seconds)
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+_cache: Optional[Cache] = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> Cache:
+    """The process-wide cache, configured from settings on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                try:
+                    backend = create_backend(settings.cache_backend, settings.cache_url)
+                except Exception as e:
+                    print(f"Error opening {settings.cache_backend} cache, using memory: {str(e)}")
+                    backend = create_backend("memory")
+                _cache = Cache(backend, settings.cache_prefix)
+    return _cache
+
+def reset_cache():
+    """Close the cache so the next get_cache() reads the settings again."""
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.backend.close()
+        _cache = None
@@ -0,0 +1,165 @@
+import os
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import streamlit as st
+from dotenv import load_dotenv
+
+# Tunables are read from the [app] table of .streamlit/secrets.toml, then from
+# RESUME_<FIELD_NAME> environment variables, then fall back to the defaults below
+APP_SECRETS_SECTION = "app"
+ENV_PREFIX = "RESUME_"
+
+# Values set through override_settings(), applied on top of everything else
+_overrides: Dict[str, Any] = {}
+
+@dataclass(frozen=True)
+class Settings:
+    """Process-wide configuration, resolved once by get_settings()."""
+
+    # Credentials
+    supabase_url: Optional[str] = None
+    supabase_key: Optional[str] = None
+    openai_api_key: Optional[str] = None
+    openai_base_url: Optional[str] = None
+
+    # Timeouts (seconds)
+    supabase_timeout: float = 10.0
+    openai_timeout: float = 120.0
+    avatar_fetch_timeout: float = 5.0
+
+    # Retries of transient LLM errors, with exponential backoff and full jitter
+    openai_max_retries: int = 2
+    llm_backoff_base_seconds: float = 1.0
+    llm_backoff_max_seconds: float = 20.0
+
+    # Send a duplicate ATS/parse request once the first outlives the recent p95
+    llm_hedging: bool = True
+
+    # Caches
+    avatar_size: int = 96
+    avatar_cache_size: int = 256
+    pdf_section_cache_size: int = 256
+
+    # Shared cache for LLM responses, rendered PDFs, PDF text and job digests.
+    # cache_backend is "memory" (this process only), "sqlite" (this host;
+    # cache_url is the file) or "redis" (every replica; cache_url is
+    # redis://[:password@]host:port/db); "none" turns it off. TTLs are in seconds.
+    cache_backend: str = "memory"
+    cache_url: str = ""
+    cache_prefix: str = "resume-builder"
+    cache_memory_mb: int = 64
+    cache_timeout_seconds: float = 1.0
+    llm_cache_operations: str = "llm.ats_analysis,llm.parse_resume"
+    llm_cache_ttl_seconds: float = 604800.0
+    pdf_cache_ttl_seconds: float = 86400.0
+    pdf_text_cache_ttl_seconds: float = 86400.0
+    job_digest_cache_ttl_seconds: float = 2592000.0
+
+    # Resume history: versions are stored as deltas against the latest full
+    # snapshot, and a new snapshot is taken after this many deltas
+    resume_version_snapshot_interval: int = 10
+
+    # Models: llm_model is the strong tier. llm_task_tiers maps operations to
+    # "fast" or "strong" ("operation=tier, ..."); unlisted operations use strong.
+    # A response that fails validation is retried on the next stronger tier.
+    llm_model: str = "gpt-4o"
+    llm_model_fast: str = "gpt-4o-mini"
+    llm_task_tiers: str = "llm.parse_resume=fast,llm.job_digest=fast"
+    llm_tier_fallback: bool = True
+
+    # Send the ATS analysis and resume generation a cached digest of the job
+    # description instead of the raw posting
+    llm_job_digest: bool = True
+
+    # Prompt tokens of work experience, projects, education and certifications
+    # sent for resume generation, best matches for the job first (0 sends all)
+    profile_token_budget: int = 1500
+
+    # Skill autocomplete: the vocabulary adds skills listed by at least
+    # skill_vocabulary_min_users profiles (never fewer than 2, so no single
+    # user's skills are exposed) and is reloaded after the TTL
+    skill_vocabulary_min_users: int = 2
+    skill_vocabulary_ttl_seconds: float = 3600.0
+
+    # LLM scheduling; a tokens-per-minute budget of 0 means unlimited
+    llm_max_concurrency: int = 4
+    llm_tokens_per_minute: int = 0
+    llm_priority_aging_seconds: float = 30.0
+
+    # Tracing: comma-separated exporters out of "log", "prometheus", "ring" and "stats"
+    trace_exporters: str = "ring,stats"
+    trace_buffer_size: int = 2048
+    trace_slow_ms: float = 2000.0
+    metrics_port: int = 0
+    metrics_window_size: int = 2048
+
+    # Background jobs
+    jobs_db_path: str = "data/jobs.sqlite3"
+    job_workers: int = 4
+    job_timeout_seconds: float = 600.0
+    job_retention_hours: float = 24.0
+    # Jobs whose worker died this many times are failed rather than run again
+    job_max_attempts: int = 3
+
+    # Profiler runs left unfinished for longer than this are stopped (seconds)
+    profile_max_seconds: float = 300.0
+
+    # Comma-separated emails allowed to open the admin pages
+    admin_emails: str = ""
+
+def _read_secret(section: str, key: str) -> Any:
+    """Read st.secrets[section][key], returning None when unset or no secrets file exists."""
+    try:
+        return st.secrets[section][key]
+    except (KeyError, FileNotFoundError):
+        return None
+
+def _cast(value: Any, default: Any) -> Any:
+    """Convert a raw secret or environment string to the type of the field's default."""
+    if default is None or isinstance(value, type(default)):
+        return value
+    if isinstance(default, bool):
+        return str(value).strip().lower() in ("1", "true", "yes", "on")
+    return type(default)(value)
+
+def load_settings() -> Settings:
+    """Resolve every setting from secrets and the environment."""
+    # Load environment variables (local dev fallback)
+    load_dotenv()
+
+    values = {
+        # Credentials keep the secrets layout the app has always used
+        "supabase_url": _read_secret("supabase", "SUPABASE_URL") or os.getenv("SUPABASE_URL"),
+        "supabase_key": _read_secret("supabase", "SUPABASE_KEY") or os.getenv("SUPABASE_KEY"),
+        "openai_api_key": _read_secret("openai", "api_key") or os.getenv("OPENAI_API_KEY"),
+        "openai_base_url": _read_secret("openai", "base_url") or os.getenv("OPENAI_BASE_URL"),
+    }
+
+    for field in fields(Settings):
+        if field.name in values:
+            continue
+        raw = _read_secret(APP_SECRETS_SECTION, field.name)
+        if raw is None:
+            raw = os.getenv(ENV_PREFIX + field.name.upper())
+        if raw is None or raw == "":
+            continue
+        try:
+            values[field.name] = _cast(raw, field.default)
+        except (TypeError, ValueError):
+            print(f"Ignoring invalid value for setting {field.name}: {raw!r}")
+
+    return Settings(**values)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the cached settings for this process."""
+    return replace(load_settings(), **_overrides)
+
+def override_settings(**values: Any):
+    """Override settings for this process, e.g. to point benchmarks at local stand-ins."""
+    unknown = set(values) - {field.name for field in fields(Settings)}
+    if unknown:
+        raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+    _overrides.update(values)
+    get_settings.cache_clear()
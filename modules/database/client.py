@@ -1,28 +1,62 @@
-from supabase import create_client, Client
-from .config import SUPABASE_URL, SUPABASE_KEY, RESUME_BUCKET, AVATAR_BUCKET
-from typing import Dict, List, Optional, Any
+from .config import RESUME_BUCKET, AVATAR_BUCKET
+from modules.config.settings import get_settings
+from modules.monitoring.tracing import traced, annotate, payload_size, record_error
+from modules.utils.job_descriptions import job_description_hash
+from modules.utils.resume_content import (
+    apply_delta, as_resume_content, changed_sections, make_delta, resume_markdown
+)
+from typing import Dict, List, Optional, Any, TYPE_CHECKING
 import json
 
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Job description hashes remembered per process before the set is reset
+KNOWN_JOB_DESCRIPTIONS_LIMIT = 4096
+
+# A version is stored in full when its delta would be larger than this share of the resume
+MAX_DELTA_RATIO = 0.5
+
 class DatabaseClient:
     def __init__(self):
-        self.client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self._client: Optional["Client"] = None
+        # Hashes of job descriptions already stored, so repeat saves skip the upsert
+        self._known_job_descriptions = set()
         
+    @property
+    def client(self) -> "Client":
+        """Supabase client, created on first use so importing this module stays cheap"""
+        if self._client is None:
+            from supabase import create_client, ClientOptions
+            settings = get_settings()
+            options = ClientOptions(
+                postgrest_client_timeout=settings.supabase_timeout,
+                storage_client_timeout=int(settings.supabase_timeout)
+            )
+            self._client = create_client(settings.supabase_url, settings.supabase_key, options)
+        return self._client
+        
+    @traced("db.get_user")
     def get_user(self, user_id: str = None, email: str = None) -> Optional[Dict]:
         """Get user data by ID or email"""
         try:
             if user_id:
                 response = self.client.table('users').select('*').eq('id', str(user_id)).execute()
+                annotate(rows=len(response.data or []))
                 if response.data and len(response.data) > 0:
                     return response.data[0]
             if email:
                 response = self.client.table('users').select('*').eq('email', email).execute()
+                annotate(rows=len(response.data or []))
                 if response.data and len(response.data) > 0:
                     return response.data[0]
             return None
         except Exception as e:
             print(f"Error getting user: {str(e)}")
+            record_error(e)
             return None
         
+    @traced("db.create_user")
     def create_user(self, user_data: Dict) -> Dict:
         """Create a new user record"""
         try:
@@ -47,6 +81,7 @@ class DatabaseClient:
             print("Debug - Creating user with data:", user_data)
             
             # Insert the user
+            annotate(payload_bytes=payload_size(user_data))
             response = self.client.table('users').insert(user_data).execute()
             
             if not response.data:
@@ -57,6 +92,7 @@ class DatabaseClient:
             print(f"Error creating user: {str(e)}")
             raise
         
+    @traced("db.update_user")
     def update_user(self, user_id: str, data: Dict) -> Dict:
         """Update user data"""
         try:
@@ -66,6 +102,7 @@ class DatabaseClient:
                 data['full_name'] = basics.get('fullName')
                 data['avatar_url'] = basics.get('avatar_url')
             
+            annotate(payload_bytes=payload_size(data))
             response = self.client.table('users').update(data).eq('id', str(user_id)).execute()
             if not response.data:
                 raise Exception("No data returned from update operation")
@@ -74,21 +111,111 @@ class DatabaseClient:
             print(f"Error updating user: {str(e)}")
             raise
         
+    @traced("db.update_profile_sections")
+    def update_profile_sections(self, user_id: str, sections: Dict, current_profile: Optional[Dict] = None) -> Optional[Dict]:
+        """Merge changed top-level profile_data sections into the user row"""
+        if not sections:
+            return None
+        try:
+            # jsonb merge on the server, so only the changed sections travel over the wire
+            annotate(sections=sorted(sections), payload_bytes=payload_size(sections))
+            response = self.client.rpc('merge_profile_data', {
+                'p_user_id': str(user_id),
+                'p_sections': sections
+            }).execute()
+            if response.data:
+                return response.data[0] if isinstance(response.data, list) else response.data
+            raise Exception("No data returned from merge_profile_data")
+        except Exception as e:
+            # Databases without the merge function fall back to a full document write
+            print(f"Error merging profile sections, falling back to full update: {str(e)}")
+            annotate(fallback=True)
+            merged = dict(current_profile or {})
+            merged.update(sections)
+            return self.update_user(user_id, {'profile_data': merged})
+        
+    @traced("db.create_resume")
     def create_resume(self, user_id: str, data: Dict) -> Dict:
         """Create a new resume"""
+        # The posting itself is stored once in job_descriptions
+        job_hash = self.save_job_description(data.get('job_description'))
         resume_data = {
             'user_id': user_id,
             'title': data.get('title', 'Untitled Resume'),
             'company': data.get('company'),
-            'job_description': data.get('job_description'),
-            'resume_content': data.get('resume_content', {}),
+            'job_description_hash': job_hash,
+            # Kept inline only when the shared job_descriptions row could not be written
+            'job_description': None if job_hash else data.get('job_description'),
+            'resume_content': as_resume_content(data.get('resume_content')),
             'format_type': data.get('format_type', 'professional'),
             'tone': data.get('tone', 'professional'),
             'tags': data.get('tags', [])
         }
+        annotate(payload_bytes=payload_size(resume_data))
         response = self.client.table('resumes').insert(resume_data).execute()
-        return response.data[0] if response.data else None
+        resume = response.data[0] if response.data else None
+        if resume:
+            self.add_resume_version(resume['id'], resume_data['resume_content'])
+        return resume
         
+    @traced("db.save_job_description")
+    def save_job_description(self, text: Optional[str]) -> Optional[str]:
+        """Store a job description once per normalized content and return its hash"""
+        if not text or not text.strip():
+            return None
+        content_hash = job_description_hash(text)
+        if content_hash in self._known_job_descriptions:
+            annotate(known=True)
+            return content_hash
+        row = {'hash': content_hash, 'content': text.strip()}
+        annotate(payload_bytes=payload_size(row))
+        try:
+            # An existing row for the same posting is kept as it is
+            self.client.table('job_descriptions').upsert(row, on_conflict='hash', ignore_duplicates=True).execute()
+        except Exception as e:
+            print(f"Error saving job description: {str(e)}")
+            record_error(e)
+            return None
+        if len(self._known_job_descriptions) >= KNOWN_JOB_DESCRIPTIONS_LIMIT:
+            self._known_job_descriptions.clear()
+        self._known_job_descriptions.add(content_hash)
+        return content_hash
+
+    @traced("db.get_job_description")
+    def get_job_description(self, content_hash: str) -> Optional[Dict]:
+        """Get a stored job description and its derived data by hash"""
+        response = self.client.table('job_descriptions').select('*').eq('hash', content_hash).execute()
+        return response.data[0] if response.data else None
+
+    @traced("db.update_job_description_derived")
+    def update_job_description_derived(self, content_hash: str, values: Dict) -> Optional[Dict]:
+        """Merge values (keywords, digests, ...) into a job description's derived data; needs the service role key"""
+        annotate(keys=sorted(values), payload_bytes=payload_size(values))
+        response = self.client.rpc('merge_job_description_derived', {
+            'p_hash': content_hash,
+            'p_values': values
+        }).execute()
+        if response.data:
+            return response.data[0] if isinstance(response.data, list) else response.data
+        return None
+
+    def get_resume_job_description(self, resume: Dict) -> Optional[str]:
+        """Job description text of a resume row, including rows saved before job_descriptions existed"""
+        if resume.get('job_description'):
+            return resume['job_description']
+        if resume.get('job_description_hash'):
+            row = self.get_job_description(resume['job_description_hash'])
+            return row['content'] if row else None
+        return None
+
+    @traced("db.get_skill_vocabulary")
+    def get_skill_vocabulary(self, min_users: int = 2) -> List[Dict]:
+        """Skills listed in users' profiles, as {category, skill, users} rows"""
+        response = self.client.rpc('skill_vocabulary', {'p_min_users': min_users}).execute()
+        annotate(rows=len(response.data or []))
+        return response.data or []
+
+    @traced("db.get_resume")
     def get_resume(self, resume_id: str) -> Optional[Dict]:
         """Get resume by ID"""
         response = self.client.table('resumes').select('*').eq('id', resume_id).single().execute()
@@ -98,24 +225,148 @@ class DatabaseClient:
             return response.data
         return None
         
+    @traced("db.get_user_resumes")
     def get_user_resumes(self, user_id: str) -> List[Dict]:
         """Get all resumes for a user"""
         response = self.client.table('resumes').select('*').eq('user_id', user_id).execute()
+        annotate(rows=len(response.data or []))
         return response.data if response.data else []
         
-    def update_resume(self, resume_id: str, data: Dict) -> Dict:
-        """Update resume data"""
+    @traced("db.update_resume")
+    def update_resume(self, resume_id: str, data: Dict, current_content: Optional[Any] = None) -> Dict:
+        """Update resume data.
+
+        With the stored resume_content passed as current_content, only the
+        sections whose hash changed are written; a change to the section list
+        itself writes the whole content.
+        """
+        data = dict(data)
+        if 'resume_content' in data:
+            content = data['resume_content'] = as_resume_content(data['resume_content'])
+            changed = changed_sections(current_content, content) if current_content is not None else None
+            if changed == {}:
+                # Nothing changed, so there is no new version either
+                del data['resume_content']
+                if not data:
+                    return None
+            else:
+                self.add_resume_version(resume_id, content)
+            if changed:
+                del data['resume_content']
+                annotate(sections=len(changed))
+                row = self.update_resume_sections(resume_id, changed)
+                if not data:
+                    return row
+        annotate(payload_bytes=payload_size(data))
         response = self.client.table('resumes').update(data).eq('id', resume_id).execute()
         return response.data[0] if response.data else None
+
+    @traced("db.update_resume_sections")
+    def update_resume_sections(self, resume_id: str, sections: Dict[int, Dict]) -> Optional[Dict]:
+        """Overwrite resume_content sections in place, by index"""
+        try:
+            # jsonb_set on the server, so only the changed sections travel over the wire
+            payload = {str(index): section for index, section in sections.items()}
+            annotate(payload_bytes=payload_size(payload))
+            response = self.client.rpc('update_resume_sections', {
+                'p_resume_id': str(resume_id),
+                'p_sections': payload
+            }).execute()
+            if response.data:
+                return response.data[0] if isinstance(response.data, list) else response.data
+            raise Exception("No data returned from update_resume_sections")
+        except Exception as e:
+            # Databases without the function fall back to rewriting the whole content
+            print(f"Error updating resume sections, falling back to full update: {str(e)}")
+            annotate(fallback=True)
+            current = self.get_resume(resume_id)
+            content = as_resume_content(current.get('resume_content') if current else None)
+            merged = list(content['sections'])
+            for index, section in sections.items():
+                merged[index] = section
+            response = self.client.table('resumes').update(
+                {'resume_content': dict(content, sections=merged)}
+            ).eq('id', resume_id).execute()
+            return response.data[0] if response.data else None
         
+    @traced("db.add_resume_version")
+    def add_resume_version(self, resume_id: str, content: Any) -> Optional[Dict]:
+        """Record the next version of a resume's content.
+
+        Versions are stored as a line delta against the latest full snapshot,
+        so rebuilding any version reads at most two rows. A full snapshot is
+        stored for the first version, every resume_version_snapshot_interval
+        versions, and whenever the delta would not be much smaller.
+        """
+        try:
+            table = self.client.table('resume_versions')
+            latest = table.select('version').eq('resume_id', resume_id).order('version', desc=True).limit(1).execute()
+            version = latest.data[0]['version'] + 1 if latest.data else 1
+            base = table.select('version, content').eq('resume_id', resume_id).is_('base_version', 'null') \
+                .order('version', desc=True).limit(1).execute()
+
+            markdown = resume_markdown(content)
+            row = {'resume_id': resume_id, 'version': version, 'content_bytes': len(markdown.encode('utf-8'))}
+            delta = None
+            if base.data and version - base.data[0]['version'] <= get_settings().resume_version_snapshot_interval:
+                delta = make_delta(resume_markdown(base.data[0]['content']), markdown)
+                if payload_size(delta) > MAX_DELTA_RATIO * row['content_bytes']:
+                    delta = None
+            if delta is not None:
+                row.update(base_version=base.data[0]['version'], delta=delta)
+            else:
+                row['content'] = as_resume_content(content)
+            annotate(version=version, snapshot=delta is None, payload_bytes=payload_size(row))
+            response = table.insert(row).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            print(f"Error saving resume version: {str(e)}")
+            record_error(e)
+            return None
+
+    @traced("db.get_resume_versions")
+    def get_resume_versions(self, resume_ids: List[str]) -> List[Dict]:
+        """List the versions of the given resumes, oldest first, without their content"""
+        if not resume_ids:
+            return []
+        try:
+            response = self.client.table('resume_versions') \
+                .select('resume_id, version, base_version, content_bytes, created_at') \
+                .in_('resume_id', [str(resume_id) for resume_id in resume_ids]) \
+                .order('version').execute()
+            annotate(rows=len(response.data or []))
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"Error getting resume versions: {str(e)}")
+            record_error(e)
+            return []
+
+    @traced("db.get_resume_version")
+    def get_resume_version(self, resume_id: str, version: int) -> Optional[str]:
+        """Rebuild the markdown of one version of a resume"""
+        table = self.client.table('resume_versions')
+        response = table.select('*').eq('resume_id', resume_id).eq('version', version).execute()
+        if not response.data:
+            return None
+        row = response.data[0]
+        if row.get('base_version') is None:
+            return resume_markdown(row['content'])
+        base = table.select('content').eq('resume_id', resume_id).eq('version', row['base_version']).execute()
+        if not base.data:
+            return None
+        return apply_delta(resume_markdown(base.data[0]['content']), row['delta'])
+
+    @traced("db.delete_resume")
     def delete_resume(self, resume_id: str) -> bool:
         """Delete a resume"""
         response = self.client.table('resumes').delete().eq('id', resume_id).execute()
         return bool(response.data)
         
+    @traced("storage.upload_resume_file")
     def upload_resume_file(self, resume_id: str, file_path: str, file_data: bytes) -> str:
         """Upload resume file to storage"""
         file_name = f"{resume_id}/{file_path}"
+        annotate(payload_bytes=len(file_data))
         self.client.storage.from_(RESUME_BUCKET).upload(file_name, file_data)
         # Create file record
         self.client.table('resume_files').insert({
@@ -129,17 +380,36 @@ class DatabaseClient:
         response = self.client.storage.from_(RESUME_BUCKET).get_public_url(file_path)
         return response
         
-    def upload_avatar(self, user_id: str, file_data: bytes) -> str:
+    @traced("storage.upload_avatar")
+    def upload_avatar(self, user_id: str, file_data: bytes, content_type: str = "image/png") -> str:
         """Upload user avatar"""
         file_name = f"{user_id}/avatar"
-        self.client.storage.from_(AVATAR_BUCKET).upload(file_name, file_data)
+        annotate(payload_bytes=len(file_data))
+        self.client.storage.from_(AVATAR_BUCKET).upload(
+            file_name,
+            file_data,
+            {"content-type": content_type, "upsert": "true"}
+        )
         return file_name
         
+    @traced("storage.download_avatar")
+    def download_avatar(self, file_path: str) -> Optional[bytes]:
+        """Download avatar bytes from storage"""
+        try:
+            data = self.client.storage.from_(AVATAR_BUCKET).download(file_path)
+            annotate(output_bytes=len(data or b""))
+            return data
+        except Exception as e:
+            print(f"Error downloading avatar: {str(e)}")
+            record_error(e)
+            return None
+        
     def get_avatar_url(self, file_path: str) -> str:
         """Get public URL for avatar"""
         response = self.client.storage.from_(AVATAR_BUCKET).get_public_url(file_path)
         return response
         
+    @traced("db.update_ats_analysis")
     def update_ats_analysis(self, resume_id: str, score: int, analysis: Dict) -> Dict:
         """Update ATS score and analysis for a resume"""
         data = {
@@ -149,5 +419,14 @@ class DatabaseClient:
         response = self.client.table('resumes').update(data).eq('id', resume_id).execute()
         return response.data[0] if response.data else None
 
+def diff_profile_sections(old_profile: Optional[Dict], new_profile: Dict) -> Dict:
+    """Return the top-level profile_data sections that differ from the last loaded version"""
+    old_profile = old_profile or {}
+    return {
+        section: value
+        for section, value in new_profile.items()
+        if old_profile.get(section) != value
+    }
+
 # Create a singleton instance
 db = DatabaseClient() 
\ No newline at end of file
@@ -1,17 +1,8 @@
-import os
-import streamlit as st
-from dotenv import load_dotenv
-
-# Load environment variables (local dev fallback)
-load_dotenv()
+from modules.config.settings import get_settings
 
 # Supabase Configuration — reads from st.secrets (Streamlit Cloud) or .env (local)
-try:
-    SUPABASE_URL = st.secrets["supabase"]["SUPABASE_URL"]
-    SUPABASE_KEY = st.secrets["supabase"]["SUPABASE_KEY"]
-except (KeyError, FileNotFoundError):
-    SUPABASE_URL = os.getenv("SUPABASE_URL")
-    SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+SUPABASE_URL = get_settings().supabase_url
+SUPABASE_KEY = get_settings().supabase_key
 
 # Storage Configuration
 RESUME_BUCKET = "resumes"
@@ -31,6 +22,15 @@ SCHEMA = {
             preferences jsonb default '{}'::jsonb
         );
     """,
+    "job_descriptions": """
+        create table if not exists public.job_descriptions (
+            hash text primary key,
+            content text not null,
+            derived jsonb not null default '{}'::jsonb,
+            created_at timestamp with time zone default now(),
+            updated_at timestamp with time zone default now()
+        );
+    """,
     "resumes": """
         create table if not exists public.resumes (
             id uuid primary key default uuid_generate_v4(),
@@ -38,6 +38,7 @@ SCHEMA = {
             title text not null,
             company text,
             job_description text,
+            job_description_hash text references public.job_descriptions(hash),
             resume_content jsonb not null,
             ats_score integer,
             ats_analysis jsonb,
@@ -48,6 +49,20 @@ SCHEMA = {
             is_template boolean default false,
             tags text[]
         );
+        alter table public.resumes add column if not exists job_description_hash text references public.job_descriptions(hash);
+    """,
+    "resume_versions": """
+        create table if not exists public.resume_versions (
+            id uuid primary key default uuid_generate_v4(),
+            resume_id uuid references public.resumes(id) on delete cascade,
+            version integer not null,
+            base_version integer,
+            content jsonb,
+            delta jsonb,
+            content_bytes integer,
+            created_at timestamp with time zone default now(),
+            unique (resume_id, version)
+        );
     """,
     "resume_files": """
         create table if not exists public.resume_files (
@@ -59,6 +74,105 @@ SCHEMA = {
     """
 }
 
+# Database Functions
+FUNCTIONS = {
+    "merge_profile_data": """
+        create or replace function public.merge_profile_data(p_user_id text, p_sections jsonb)
+        returns setof public.users
+        language sql
+        as $$
+            -- Like update_user: a saved basics section sets full_name and
+            -- avatar_url, clearing them when it leaves them out
+            update public.users
+            set profile_data = coalesce(profile_data, '{}'::jsonb) || p_sections,
+                full_name = case when p_sections ? 'basics' then p_sections->'basics'->>'fullName' else full_name end,
+                avatar_url = case when p_sections ? 'basics' then p_sections->'basics'->>'avatar_url' else avatar_url end,
+                updated_at = now()
+            where id::text = p_user_id
+            returning *;
+        $$;
+    """,
+    "merge_job_description_derived": """
+        create or replace function public.merge_job_description_derived(p_hash text, p_values jsonb)
+        returns setof public.job_descriptions
+        language sql
+        set search_path = public
+        as $$
+            update public.job_descriptions
+            set derived = coalesce(derived, '{}'::jsonb) || p_values,
+                updated_at = now()
+            where hash = p_hash
+            returning *;
+        $$;
+        revoke execute on function public.merge_job_description_derived(text, jsonb) from public, anon, authenticated;
+        grant execute on function public.merge_job_description_derived(text, jsonb) to service_role;
+    """,
+    "job_descriptions_content_immutable": """
+        -- A posting's text is shared by every resume that points at it, so it never changes
+        create or replace function public.job_descriptions_content_immutable()
+        returns trigger
+        language plpgsql
+        set search_path = public
+        as $$
+        begin
+            if new.content is distinct from old.content or new.hash is distinct from old.hash then
+                raise exception 'job_descriptions.content is immutable';
+            end if;
+            return new;
+        end;
+        $$;
+        drop trigger if exists job_descriptions_content_immutable on public.job_descriptions;
+        create trigger job_descriptions_content_immutable
+            before update on public.job_descriptions
+            for each row execute function public.job_descriptions_content_immutable();
+    """,
+    "skill_vocabulary": """
+        create or replace function public.skill_vocabulary(p_min_users integer default 2)
+        returns table (category text, skill text, users bigint)
+        language sql
+        stable
+        security definer
+        set search_path = public
+        as $$
+            -- Only skill names and counts leave the function, and only for skills
+            -- listed by at least two users whatever the caller asks for
+            select skills.key, trim(item.value), count(distinct u.id)
+            from public.users u,
+                 jsonb_each(coalesce(u.profile_data->'skills', '{}'::jsonb)) as skills,
+                 jsonb_array_elements_text(
+                     case when jsonb_typeof(skills.value) = 'array' then skills.value else '[]'::jsonb end
+                 ) as item
+            where trim(item.value) <> ''
+            group by 1, 2
+            having count(distinct u.id) >= greatest(p_min_users, 2);
+        $$;
+        revoke execute on function public.skill_vocabulary(integer) from public, anon;
+        grant execute on function public.skill_vocabulary(integer) to authenticated, service_role;
+    """,
+    "update_resume_sections": """
+        create or replace function public.update_resume_sections(p_resume_id text, p_sections jsonb)
+        returns setof public.resumes
+        language plpgsql
+        as $$
+        declare
+            section record;
+        begin
+            -- p_sections maps section index -> {heading, markdown, hash}
+            for section in select key, value from jsonb_each(p_sections) loop
+                update public.resumes
+                set resume_content = jsonb_set(resume_content, array['sections', section.key], section.value)
+                where id::text = p_resume_id;
+            end loop;
+            return query
+                update public.resumes
+                set updated_at = now()
+                where id::text = p_resume_id
+                returning *;
+        end;
+        $$;
+    """
+}
+
 # RLS Policies
 RLS_POLICIES = {
     "users": """
@@ -72,6 +186,22 @@ RLS_POLICIES = {
             on public.users for update
             using (auth.uid() = id);
     """,
+    "job_descriptions": """
+        alter table public.job_descriptions enable row level security;
+        
+        -- Postings are shared between users and hold no personal data
+        create policy "Users can view job descriptions"
+            on public.job_descriptions for select
+            using (auth.role() = 'authenticated');
+            
+        create policy "Users can insert job descriptions"
+            on public.job_descriptions for insert
+            with check (auth.role() = 'authenticated');
+            
+        -- No update policy: derived data is merged only through
+        -- merge_job_description_derived, which only the service role may run
+        drop policy if exists "Users can update job description data" on public.job_descriptions;
+    """,
     "resumes": """
         alter table public.resumes enable row level security;
         
@@ -91,6 +221,25 @@ RLS_POLICIES = {
             on public.resumes for delete
             using (auth.uid() = user_id);
     """,
+    "resume_versions": """
+        alter table public.resume_versions enable row level security;
+        
+        create policy "Users can view own resume versions"
+            on public.resume_versions for select
+            using (exists (
+                select 1 from public.resumes
+                where resumes.id = resume_versions.resume_id
+                and resumes.user_id = auth.uid()
+            ));
+            
+        create policy "Users can insert own resume versions"
+            on public.resume_versions for insert
+            with check (exists (
+                select 1 from public.resumes
+                where resumes.id = resume_versions.resume_id
+                and resumes.user_id = auth.uid()
+            ));
+    """,
     "resume_files": """
         alter table public.resume_files enable row level security;
         
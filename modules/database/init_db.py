@@ -1,6 +1,6 @@
 import asyncio
 from supabase import create_client
-from .config import SUPABASE_URL, SUPABASE_KEY, SCHEMA, RLS_POLICIES
+from .config import SUPABASE_URL, SUPABASE_KEY, SCHEMA, FUNCTIONS, RLS_POLICIES
 
 async def init_database():
     """Initialize database schema and RLS policies"""
@@ -15,6 +15,15 @@ async def init_database():
         except Exception as e:
             print(f"Error creating table {table_name}: {str(e)}")
     
+    # Create functions
+    for function_name, function_sql in FUNCTIONS.items():
+        try:
+            # Execute raw SQL using rpc
+            await client.rpc('exec_sql', {'query': function_sql})
+            print(f"Created function: {function_name}")
+        except Exception as e:
+            print(f"Error creating function {function_name}: {str(e)}")
+    
     # Apply RLS policies
     for table_name, policies in RLS_POLICIES.items():
         try:
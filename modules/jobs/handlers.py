@@ -0,0 +1,35 @@
+from modules.ai.ai_utils import create_chat_completion
+from modules.jobs.job_queue import job_handler
+from modules.utils.pdf_utils import render_pdf_bytes
+
+@job_handler("llm.chat")
+def run_chat_completion(payload, report):
+    """Run one chat completion and return the reply text.
+
+    Payload: operation (the scheduler task name), messages, and optional
+    user_id and response_format.
+    """
+    def on_wait(position):
+        if position:
+            report(stage="llm_queue", position=position)
+        else:
+            report(stage="generating")
+
+    options = {}
+    if payload.get("response_format"):
+        options["response_format"] = payload["response_format"]
+    report(stage="generating")
+    response = create_chat_completion(
+        payload["operation"],
+        user_id=payload.get("user_id"),
+        on_wait=on_wait,
+        messages=payload["messages"],
+        **options
+    )
+    return response.choices[0].message.content
+
+@job_handler("pdf.render")
+def render_pdf(payload, report):
+    """Render markdown to PDF and return the file bytes. Payload: markdown."""
+    report(stage="rendering")
+    return render_pdf_bytes(payload["markdown"])
@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+from modules.config.settings import get_settings
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+
+SCHEMA = """
+create table if not exists jobs (
+    id text primary key,
+    kind text not null,
+    dedupe_key text not null unique,
+    user_id text,
+    status text not null,
+    payload text not null,
+    result blob,
+    result_format text,
+    error text,
+    progress text,
+    attempts integer not null default 0,
+    created_at real not null,
+    started_at real,
+    finished_at real
+);
+create index if not exists jobs_status_created on jobs (status, created_at);
+"""
+
+# Signalled whenever a worker in this process finishes a job, so waiters in
+# the same process do not have to wait for the next poll
+_finished = threading.Condition()
+_finished_count = 0
+
+# Job kind -> function(payload, report) returning str, bytes or JSON-serialisable data
+HANDLERS: Dict[str, Callable] = {}
+
+def job_handler(kind: str):
+    """Register the function that runs jobs of the given kind."""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+class JobStore:
+    """Job table in a local SQLite file, shared by every server process on the host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("pragma journal_mode=wal")
+            self._conn.executescript(SCHEMA)
+
+    def _row(self, row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["progress"] = json.loads(job["progress"]) if job["progress"] else None
+        if job["result"] is not None and job["result_format"] == "json":
+            job["result"] = json.loads(job["result"])
+        elif job["result"] is not None:
+            job["result"] = bytes(job["result"])
+        return job
+
+    def submit(self, kind: str, payload: Dict, user_id: Optional[str], dedupe_key: str) -> str:
+        """Insert a job, or return the id of an identical job that is pending or done."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("begin immediate")
+            try:
+                existing = self._conn.execute(
+                    "select id, status from jobs where dedupe_key = ?", (dedupe_key,)
+                ).fetchone()
+                if existing and existing["status"] != FAILED:
+                    job_id = existing["id"]
+                elif existing:
+                    # Retry a failed job under the same id
+                    job_id = existing["id"]
+                    self._conn.execute(
+                        "update jobs set status = ?, error = null, progress = null, attempts = 0, "
+                        "created_at = ?, started_at = null, finished_at = null where id = ?",
+                        (QUEUED, now, job_id)
+                    )
+                else:
+                    job_id = uuid.uuid4().hex
+                    self._conn.execute(
+                        "insert into jobs (id, kind, dedupe_key, user_id, status, payload, created_at) "
+                        "values (?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, kind, dedupe_key, user_id, QUEUED, json.dumps(payload), now)
+                    )
+                self._conn.execute("commit")
+            except BaseException:
+                self._conn.execute("rollback")
+                raise
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("select * from jobs where id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+    def queue_position(self, job: Dict) -> int:
+        """1-based place of a queued job among all queued jobs."""
+        with self._lock:
+            ahead = self._conn.execute(
+                "select count(*) from jobs where status = ? and created_at < ?", (QUEUED, job["created_at"])
+            ).fetchone()[0]
+        return ahead + 1
+
+    def claim(self, stale_after: float, max_attempts: int = 3) -> Optional[Dict]:
+        """Mark the oldest queued job as running and return it.
+
+        Jobs left running for longer than stale_after belonged to a process
+        that died, so they are queued again first. A job that has already
+        been started max_attempts times is failed instead, so one that
+        crashes its worker is not picked up on every restart.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("begin immediate")
+            try:
+                self._conn.execute(
+                    "update jobs set status = ?, error = ?, progress = null, finished_at = ? "
+                    "where status = ? and started_at < ? and attempts >= ?",
+                    (FAILED, f"The job stopped without finishing {max_attempts} times", now,
+                     RUNNING, now - stale_after, max_attempts)
+                )
+                self._conn.execute(
+                    "update jobs set status = ?, started_at = null where status = ? and started_at < ?",
+                    (QUEUED, RUNNING, now - stale_after)
+                )
+                row = self._conn.execute(
+                    "select * from jobs where status = ? and attempts < ? order by created_at limit 1",
+                    (QUEUED, max_attempts)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "update jobs set status = ?, started_at = ?, attempts = attempts + 1 where id = ?",
+                        (RUNNING, now, row["id"])
+                    )
+                self._conn.execute("commit")
+            except BaseException:
+                self._conn.execute("rollback")
+                raise
+        return self._row(row)
+
+    def set_progress(self, job_id: str, progress: Dict):
+        with self._lock:
+            self._conn.execute("update jobs set progress = ? where id = ?", (json.dumps(progress), job_id))
+
+    def finish(self, job_id: str, result: Any = None, error: Optional[str] = None):
+        if error is not None:
+            values = (FAILED, None, None, error)
+        elif isinstance(result, (bytes, bytearray)):
+            values = (DONE, bytes(result), "bytes", None)
+        else:
+            values = (DONE, json.dumps(result), "json", None)
+        with self._lock:
+            self._conn.execute(
+                "update jobs set status = ?, result = ?, result_format = ?, error = ?, "
+                "progress = null, finished_at = ? where id = ?",
+                (*values, time.time(), job_id)
+            )
+
+    def purge(self, older_than: float):
+        """Delete finished jobs whose results are older than the given timestamp."""
+        with self._lock:
+            self._conn.execute(
+                "delete from jobs where status in (?, ?) and finished_at < ?", (DONE, FAILED, older_than)
+            )
+
+class WorkerPool:
+    """Daemon threads that run queued jobs from the store."""
+
+    def __init__(self, store: JobStore, workers: int, poll_seconds: float = 1.0,
+                 stale_after: float = 600.0, retention_seconds: float = 86400.0, max_attempts: int = 3):
+        self.store = store
+        self.poll_seconds = poll_seconds
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self._purged_at = 0.0
+        self._wakeup = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def notify(self):
+        """Wake a worker for a job submitted by this process."""
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            try:
+                job = self.store.claim(self.stale_after, self.max_attempts)
+            except sqlite3.Error as e:
+                print(f"Error claiming job: {str(e)}")
+                job = None
+            if job is None:
+                self._purge_if_due()
+                # Also poll, to pick up jobs submitted by other processes
+                with self._wakeup:
+                    self._wakeup.wait(timeout=self.poll_seconds)
+                continue
+            self._execute(job)
+
+    def _purge_if_due(self):
+        now = time.time()
+        if now - self._purged_at < 3600:
+            return
+        self._purged_at = now
+        try:
+            self.store.purge(now - self.retention_seconds)
+        except sqlite3.Error as e:
+            print(f"Error purging old jobs: {str(e)}")
+
+    def _execute(self, job: Dict):
+        handler = HANDLERS.get(job["kind"])
+        if handler is None:
+            self.store.finish(job["id"], error=f"No handler for job kind {job['kind']}")
+            return
+
+        def report(**progress):
+            self.store.set_progress(job["id"], progress)
+
+        try:
+            result = handler(job["payload"], report)
+        except Exception as e:
+            print(f"Error running job {job['id']} ({job['kind']}): {str(e)}")
+            self.store.finish(job["id"], error=f"{type(e).__name__}: {str(e)}")
+        else:
+            self.store.finish(job["id"], result=result)
+        global _finished_count
+        with _finished:
+            _finished_count += 1
+            _finished.notify_all()
+
+_store: Optional[JobStore] = None
+_pool: Optional[WorkerPool] = None
+_init_lock = threading.Lock()
+
+def get_store() -> JobStore:
+    """The job store for this process, with its worker pool started on first use."""
+    global _store, _pool
+    if _pool is None:
+        with _init_lock:
+            if _pool is None:
+                # Handlers register themselves on import
+                import modules.jobs.handlers  # noqa: F401
+                settings = get_settings()
+                _store = JobStore(settings.jobs_db_path)
+                _pool = WorkerPool(
+                    _store,
+                    settings.job_workers,
+                    stale_after=settings.job_timeout_seconds,
+                    retention_seconds=settings.job_retention_hours * 3600,
+                    max_attempts=settings.job_max_attempts
+                )
+    return _store
+
+def dedupe_key(kind: str, payload: Dict, user_id: Optional[str]) -> str:
+    canonical = json.dumps([kind, user_id, payload], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def submit_job(kind: str, payload: Dict, user_id: Optional[str] = None) -> str:
+    """Queue a job and return its id.
+
+    Submitting the same kind, payload and user again returns the existing
+    job, so reruns and reconnects do not pay for the same work twice.
+    """
+    store = get_store()
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job_id = store.submit(kind, payload, user_id, dedupe_key(kind, payload, user_id))
+    _pool.notify()
+    return job_id
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """Current state of a job: status, progress, result and error."""
+    return get_store().get(job_id)
+
+def wait_for_job(job_id: str, on_update: Optional[Callable[[Dict], None]] = None,
+                 timeout: Optional[float] = None, poll_seconds: float = 0.5) -> Optional[Dict]:
+    """Poll a job until it finishes or the timeout passes, and return its last state.
+
+    on_update is called with the job whenever its status or progress
+    changes, which lets a page show where the job is while it waits.
+    """
+    store = get_store()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    last_seen = None
+    while True:
+        finished_before = _finished_count
+        job = store.get(job_id)
+        if job is None or job["status"] in FINISHED:
+            return job
+        if job["status"] == QUEUED:
+            job["position"] = store.queue_position(job)
+        seen = (job["status"], job.get("position"), json.dumps(job["progress"], sort_keys=True))
+        if on_update and seen != last_seen:
+            on_update(job)
+        last_seen = seen
+        if deadline is not None and time.monotonic() >= deadline:
+            return job
+        with _finished:
+            if _finished_count == finished_before:
+                _finished.wait(timeout=poll_seconds)
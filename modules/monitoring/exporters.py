@@ -0,0 +1,198 @@
+import json
+import logging
+import threading
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from modules.config.settings import get_settings
+
+logger = logging.getLogger("resume_builder.trace")
+
+class LogExporter:
+    """Write each span as one JSON log line; slow or failed spans log at WARNING."""
+
+    def __init__(self, slow_ms: float = 0.0):
+        self.slow_ms = slow_ms
+
+    def export(self, span):
+        level = logging.INFO
+        if span.outcome != "ok" or (self.slow_ms and span.duration_ms >= self.slow_ms):
+            level = logging.WARNING
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(span.to_dict(), default=str))
+
+class RingBufferExporter:
+    """Keep the most recent spans in memory for in-app inspection."""
+
+    def __init__(self, size: int = 2048):
+        self.spans = deque(maxlen=size)
+
+    def export(self, span):
+        # deque.append is atomic, so no lock is needed on the hot path
+        self.spans.append(span)
+
+    def snapshot(self) -> List:
+        return list(self.spans)
+
+class StatsExporter:
+    """Feed span durations into the rolling windows shown on the performance page."""
+
+    def __init__(self):
+        from modules.monitoring.metrics import get_registry
+        self.registry = get_registry()
+
+    def export(self, span):
+        self.registry.record_operation(
+            span.name,
+            span.duration_ms,
+            error=span.outcome != "ok",
+            tokens=span.attributes.get("total_tokens", 0) or 0,
+            timestamp=span.start_time,
+        )
+        if span.attributes.get("prompt_tokens"):
+            # Counted per call: did the provider reuse a cached prompt prefix?
+            self.registry.record_cache(f"prompt_prefix.{span.name}", bool(span.attributes.get("cached_tokens")))
+
+# Histogram bucket upper bounds in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class PrometheusExporter:
+    """Aggregate spans into Prometheus metrics and optionally serve /metrics."""
+
+    def __init__(self, port: int = 0):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[int]] = {}
+        self._duration_sum: Dict[str, float] = {}
+        self._count: Dict[Tuple[str, str], int] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+        self._payload_bytes: Dict[str, int] = {}
+        self._retries: Dict[str, int] = {}
+        self._hedges: Dict[Tuple[str, str], int] = {}
+        if port:
+            self.serve(port)
+
+    def export(self, span):
+        seconds = span.duration_ms / 1000
+        with self._lock:
+            buckets = self._buckets.setdefault(span.name, [0] * (len(DURATION_BUCKETS) + 1))
+            buckets[bisect_left(DURATION_BUCKETS, seconds)] += 1
+            self._duration_sum[span.name] = self._duration_sum.get(span.name, 0.0) + seconds
+            key = (span.name, span.outcome)
+            self._count[key] = self._count.get(key, 0) + 1
+            for kind in ("prompt_tokens", "cached_tokens", "completion_tokens"):
+                tokens = span.attributes.get(kind)
+                if tokens:
+                    token_key = (span.name, kind.replace("_tokens", ""))
+                    self._tokens[token_key] = self._tokens.get(token_key, 0) + tokens
+            payload = span.attributes.get("payload_bytes")
+            if payload:
+                self._payload_bytes[span.name] = self._payload_bytes.get(span.name, 0) + payload
+            attempts = span.attributes.get("attempts")
+            if attempts and attempts > 1:
+                self._retries[span.name] = self._retries.get(span.name, 0) + attempts - 1
+            if span.attributes.get("hedged"):
+                result = "won" if span.attributes.get("hedge_won") else "lost"
+                hedge_key = (span.name, result)
+                self._hedges[hedge_key] = self._hedges.get(hedge_key, 0) + 1
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP resume_operation_duration_seconds Duration of traced operations.",
+            "# TYPE resume_operation_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, buckets in sorted(self._buckets.items()):
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, buckets):
+                    cumulative += count
+                    lines.append(f'resume_operation_duration_seconds_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+                cumulative += buckets[-1]
+                lines.append(f'resume_operation_duration_seconds_bucket{{operation="{name}",le="+Inf"}} {cumulative}')
+                lines.append(f'resume_operation_duration_seconds_sum{{operation="{name}"}} {self._duration_sum[name]:.6f}')
+                lines.append(f'resume_operation_duration_seconds_count{{operation="{name}"}} {cumulative}')
+
+            lines += [
+                "# HELP resume_operations_total Traced operations by outcome.",
+                "# TYPE resume_operations_total counter",
+            ]
+            for (name, outcome), count in sorted(self._count.items()):
+                lines.append(f'resume_operations_total{{operation="{name}",outcome="{outcome}"}} {count}')
+
+            lines += [
+                "# HELP resume_llm_tokens_total LLM tokens used, by operation and kind (cached is the part of prompt served from the prefix cache).",
+                "# TYPE resume_llm_tokens_total counter",
+            ]
+            for (name, kind), tokens in sorted(self._tokens.items()):
+                lines.append(f'resume_llm_tokens_total{{operation="{name}",kind="{kind}"}} {tokens}')
+
+            lines += [
+                "# HELP resume_payload_bytes_total Bytes sent by traced operations.",
+                "# TYPE resume_payload_bytes_total counter",
+            ]
+            for name, size in sorted(self._payload_bytes.items()):
+                lines.append(f'resume_payload_bytes_total{{operation="{name}"}} {size}')
+
+            lines += [
+                "# HELP resume_llm_retries_total LLM requests repeated after a transient error.",
+                "# TYPE resume_llm_retries_total counter",
+            ]
+            for name, count in sorted(self._retries.items()):
+                lines.append(f'resume_llm_retries_total{{operation="{name}"}} {count}')
+
+            lines += [
+                "# HELP resume_llm_hedges_total Hedged LLM requests, by whether the duplicate won.",
+                "# TYPE resume_llm_hedges_total counter",
+            ]
+            for (name, result), count in sorted(self._hedges.items()):
+                lines.append(f'resume_llm_hedges_total{{operation="{name}",result="{result}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "0.0.0.0"):
+        """Serve /metrics on a background thread."""
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            # Another Streamlit process on this host may already own the port
+            print(f"Error starting metrics endpoint on port {port}: {str(e)}")
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+        return server
+
+def create_exporters(names: str) -> List:
+    """Build exporters from a comma-separated list such as "log,stats,prometheus"."""
+    settings = get_settings()
+    factories = {
+        "log": lambda: LogExporter(settings.trace_slow_ms),
+        "ring": lambda: RingBufferExporter(settings.trace_buffer_size),
+        "stats": StatsExporter,
+        "prometheus": lambda: PrometheusExporter(settings.metrics_port),
+    }
+    exporters = []
+    for name in (n.strip().lower() for n in (names or "").split(",")):
+        if not name:
+            continue
+        if name not in factories:
+            print(f"Ignoring unknown trace exporter: {name}")
+            continue
+        exporters.append(factories[name]())
+    return exporters
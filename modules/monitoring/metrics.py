@@ -0,0 +1,154 @@
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+from modules.config.settings import get_settings
+
+class RollingWindow:
+    """Fixed-size ring of recent samples for one operation.
+
+    Samples live in flat typed arrays rather than per-sample objects, so a
+    window of a few thousand calls costs tens of kilobytes.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.durations = array("d", bytes(8 * capacity))
+        self.tokens = array("q", bytes(8 * capacity))
+        self.errors = bytearray(capacity)
+        self.index = 0
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def add(self, timestamp: float, duration_ms: float, error: bool = False, tokens: int = 0):
+        with self.lock:
+            i = self.index
+            self.timestamps[i] = timestamp
+            self.durations[i] = duration_ms
+            self.tokens[i] = tokens
+            self.errors[i] = 1 if error else 0
+            self.index = (i + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def since(self, cutoff: float):
+        """Return (durations, error_count, tokens) for samples newer than cutoff."""
+        durations, error_count, tokens = [], 0, 0
+        with self.lock:
+            for i in range(self.size):
+                if self.timestamps[i] >= cutoff:
+                    durations.append(self.durations[i])
+                    error_count += self.errors[i]
+                    tokens += self.tokens[i]
+        return durations, error_count, tokens
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+class MetricsRegistry:
+    """Per-operation latency windows and cache hit/miss windows for this process."""
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        self.started = time.time()
+        self._operations: Dict[str, RollingWindow] = {}
+        self._caches: Dict[str, RollingWindow] = {}
+        self._hedges: Dict[str, RollingWindow] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, windows: Dict[str, RollingWindow], name: str) -> RollingWindow:
+        window = windows.get(name)
+        if window is None:
+            with self._lock:
+                window = windows.setdefault(name, RollingWindow(self.capacity))
+        return window
+
+    def record_operation(self, name: str, duration_ms: float, error: bool = False,
+                         tokens: int = 0, timestamp: Optional[float] = None):
+        self._window(self._operations, name).add(timestamp or time.time(), duration_ms, error, tokens)
+
+    def record_cache(self, name: str, hit: bool):
+        # A cache lookup is stored as a zero-length sample whose error flag means "miss"
+        self._window(self._caches, name).add(time.time(), 0.0, not hit)
+
+    def record_hedge(self, operation: str, won: bool):
+        # Stored like cache lookups: the error flag means the original request won
+        self._window(self._hedges, operation).add(time.time(), 0.0, not won)
+
+    def operation_summary(self, window_seconds: float) -> List[Dict]:
+        """Latency percentiles, throughput, error rate and tokens per operation."""
+        now = time.time()
+        # Throughput is averaged over the part of the window the process has been up
+        elapsed = max(1.0, min(window_seconds, now - self.started))
+        rows = []
+        for name, window in sorted(self._operations.items()):
+            durations, error_count, tokens = window.since(now - window_seconds)
+            if not durations:
+                continue
+            durations.sort()
+            rows.append({
+                "operation": name,
+                "calls": len(durations),
+                "per_minute": round(len(durations) / elapsed * 60, 2),
+                "error_rate": round(error_count / len(durations), 4),
+                "p50_ms": round(percentile(durations, 0.50), 1),
+                "p95_ms": round(percentile(durations, 0.95), 1),
+                "p99_ms": round(percentile(durations, 0.99), 1),
+                "max_ms": round(durations[-1], 1),
+                "tokens": tokens,
+                # A full ring means older calls in the window were overwritten
+                "ring_full": len(durations) == window.capacity,
+            })
+        return rows
+
+    def cache_summary(self, window_seconds: float) -> List[Dict]:
+        """Hit ratio per cache over the window."""
+        now = time.time()
+        rows = []
+        for name, window in sorted(self._caches.items()):
+            lookups, misses, _ = window.since(now - window_seconds)
+            if not lookups:
+                continue
+            rows.append({
+                "cache": name,
+                "lookups": len(lookups),
+                "hits": len(lookups) - misses,
+                "hit_ratio": round((len(lookups) - misses) / len(lookups), 4),
+            })
+        return rows
+
+    def hedge_summary(self, window_seconds: float) -> List[Dict]:
+        """How often a hedged duplicate answered before the original request."""
+        now = time.time()
+        rows = []
+        for name, window in sorted(self._hedges.items()):
+            hedges, lost, _ = window.since(now - window_seconds)
+            if not hedges:
+                continue
+            rows.append({
+                "operation": name,
+                "hedged": len(hedges),
+                "hedge_won": len(hedges) - lost,
+                "win_ratio": round((len(hedges) - lost) / len(hedges), 4),
+            })
+        return rows
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> MetricsRegistry:
+    """The process-wide metrics registry, sized by the metrics_window_size setting."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(get_settings().metrics_window_size)
+    return _registry
+
+def record_cache(name: str, hit: bool):
+    """Count a cache lookup towards the hit ratios on the performance page."""
+    get_registry().record_cache(name, hit)
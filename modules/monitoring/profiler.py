@@ -0,0 +1,206 @@
+import io
+import marshal
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+import streamlit as st
+from modules.auth.auth_utils import is_admin
+from modules.config.settings import get_settings
+
+# Admins can profile their own runs with ?profile=1 or the Performance page toggle
+QUERY_PARAM = "profile"
+ENABLED_KEY = "_profiler_enabled"
+ACTIVE_KEY = "_profiler_active"
+RESULTS_KEY = "_profiler_results"
+MAX_RESULTS = 5
+
+# Only one run is profiled at a time per process. From Python 3.12 cProfile
+# hooks sys.monitoring, which is interpreter-wide, so two concurrent profilers
+# would clash.
+_active: Optional["RunProfiler"] = None
+_active_lock = threading.Lock()
+
+class RunProfiler:
+    """Profile one script run with pyinstrument if installed, otherwise cProfile."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = 0.0
+        self.stopped = False
+        self._sampler = None
+        self._profile = None
+
+    def start(self):
+        try:
+            from pyinstrument import Profiler
+            self._sampler = Profiler(async_mode="disabled")
+            self._sampler.start()
+        except ImportError:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self.started_at = time.perf_counter()
+
+    def stop(self) -> Dict:
+        """Stop profiling and return the downloadable artifact with a text summary."""
+        self.stopped = True
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        result = {
+            "id": uuid.uuid4().hex,
+            "label": self.label,
+            "elapsed_ms": elapsed_ms,
+            "time": datetime.now().strftime("%H:%M:%S"),
+        }
+        if self._sampler is not None:
+            session = self._sampler.stop()
+            result.update(
+                data=collapse_stacks(session.root_frame()).encode("utf-8"),
+                file_name=f"{self.label}-{stamp}.collapsed.txt",
+                mime="text/plain",
+                summary=self._sampler.output_text(unicode=False, color=False),
+            )
+        else:
+            import pstats
+            self._profile.disable()
+            self._profile.create_stats()
+            # Same format as pstats.Stats.dump_stats, so snakeviz and pstats can load it.
+            # Serialised first because pstats.Stats takes the stats out of the profile.
+            data = marshal.dumps(self._profile.stats)
+            summary = io.StringIO()
+            pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(30)
+            result.update(
+                data=data,
+                file_name=f"{self.label}-{stamp}.pstats",
+                mime="application/octet-stream",
+                summary=summary.getvalue(),
+            )
+        return result
+
+def collapse_stacks(root) -> str:
+    """Render a pyinstrument frame tree as collapsed stacks (one "a;b;c micros" line per stack)."""
+    lines = []
+
+    def walk(frame, prefix):
+        name = f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+        stack = f"{prefix};{name}" if prefix else name
+        self_time = frame.time - sum(child.time for child in frame.children)
+        if self_time > 0:
+            lines.append(f"{stack} {int(self_time * 1_000_000)}")
+        for child in frame.children:
+            walk(child, stack)
+
+    if root is not None:
+        walk(root, "")
+    return "\n".join(lines) + "\n"
+
+def profiling_requested() -> bool:
+    """Whether this run should be profiled, via the toggle or the query parameter.
+
+    Only admins may profile: the profiler slows every session in the process.
+    """
+    requested = (st.session_state.get(ENABLED_KEY)
+                 or str(st.query_params.get(QUERY_PARAM, "")).lower() in ("1", "true", "yes", "on"))
+    return bool(requested) and is_admin()
+
+def _release(profiler: "RunProfiler") -> Optional[Dict]:
+    """Stop the profiler once and free the process-wide slot."""
+    global _active
+    with _active_lock:
+        if profiler.stopped:
+            return None
+        try:
+            return profiler.stop()
+        finally:
+            if _active is profiler:
+                _active = None
+
+def _reap_stale():
+    """Stop a profiler whose run never reached its end, e.g. a closed browser tab."""
+    profiler = _active
+    if profiler is not None and time.perf_counter() - profiler.started_at > get_settings().profile_max_seconds:
+        _release(profiler)
+
+def start_profiling(label: str) -> Optional[RunProfiler]:
+    """Start profiling this script run if requested; returns None when off.
+
+    Pages with module-level code call this near the top and stop_profiling()
+    at the bottom. Runs cut short by st.rerun() or st.stop() are stopped at
+    the start of the session's next profiled page instead.
+    """
+    global _active
+    leftover = st.session_state.get(ACTIVE_KEY)
+    if leftover is not None:
+        stop_profiling(leftover, render=False)
+    if _active is not None:
+        _reap_stale()
+    if not profiling_requested():
+        return None
+
+    profiler = RunProfiler(label)
+    with _active_lock:
+        if _active is not None:
+            st.sidebar.caption("The profiler is busy with another session, so this run was not profiled.")
+            return None
+        _active = profiler
+    st.session_state[ACTIVE_KEY] = profiler
+    profiler.start()
+    return profiler
+
+def stop_profiling(profiler: Optional[RunProfiler], render: bool = True):
+    """Stop profiling, keep the artifact in session state and show the download links."""
+    if profiler is None:
+        return
+    st.session_state.pop(ACTIVE_KEY, None)
+    result = _release(profiler)
+    if result is not None:
+        results = st.session_state.setdefault(RESULTS_KEY, [])
+        results.append(result)
+        del results[:-MAX_RESULTS]
+    if render:
+        render_profiles()
+
+@contextmanager
+def profile_run(label: str):
+    """Profile the enclosed page function when profiling is requested."""
+    profiler = start_profiling(label)
+    if profiler is None:
+        yield
+        return
+    try:
+        yield
+    except BaseException:
+        # st.rerun() and st.stop() end the run early; keep the result for the next run
+        stop_profiling(profiler, render=False)
+        raise
+    stop_profiling(profiler)
+
+def render_profiles():
+    """List the session's recent profiles in the sidebar with download buttons."""
+    results = st.session_state.get(RESULTS_KEY) or []
+    if not results:
+        return
+    with st.sidebar.expander("Profiler", expanded=True):
+        for result in reversed(results):
+            st.caption(f"{result['label']} at {result['time']}: {result['elapsed_ms']:.0f} ms")
+            st.download_button(
+                "Download " + result["file_name"].split(".", 1)[1],
+                data=result["data"],
+                file_name=result["file_name"],
+                mime=result["mime"],
+                key=f"_profile_download_{result['id']}",
+            )
+        st.text("Latest run")
+        st.code(results[-1]["summary"], language=None)
+
+def render_profiler_toggle():
+    """Admin switch that profiles every page run in this session."""
+    enabled = st.toggle(
+        "Profile my page runs",
+        value=bool(st.session_state.get(ENABLED_KEY)),
+        help=f"Same as adding ?{QUERY_PARAM}=1 to the URL. Profiles appear in the sidebar.",
+    )
+    st.session_state[ENABLED_KEY] = enabled
@@ -0,0 +1,141 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from modules.config.settings import get_settings
+
+@dataclass
+class Span:
+    """One timed operation: a DB call, an LLM request, a PDF render."""
+
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    outcome: str = "ok"
+    error: Optional[str] = None
+
+    def set(self, **attributes: Any):
+        """Attach attributes such as payload_bytes, rows or token counts."""
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException):
+        """Mark the span as failed, keeping a short description of the error."""
+        self.outcome = "error"
+        self.error = f"{type(error).__name__}: {str(error)[:200]}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "outcome": self.outcome,
+            "error": self.error,
+            **self.attributes,
+        }
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_exporters: Optional[List[Any]] = None
+_exporters_lock = threading.Lock()
+
+def get_exporters() -> List[Any]:
+    """Exporters configured by the trace_exporters setting, built on first use."""
+    global _exporters
+    if _exporters is None:
+        with _exporters_lock:
+            if _exporters is None:
+                from modules.monitoring.exporters import create_exporters
+                _exporters = create_exporters(get_settings().trace_exporters)
+    return _exporters
+
+def add_exporter(exporter: Any):
+    """Register an extra exporter for this process."""
+    exporters = get_exporters()
+    with _exporters_lock:
+        exporters.append(exporter)
+
+def get_exporter(exporter_type: type) -> Optional[Any]:
+    """Return the first registered exporter of the given type, if any."""
+    return next((e for e in get_exporters() if isinstance(e, exporter_type)), None)
+
+def _export(finished: Span):
+    for exporter in get_exporters():
+        try:
+            exporter.export(finished)
+        except Exception as e:
+            # Tracing must never break the operation it measures
+            print(f"Error exporting span {finished.name}: {str(e)}")
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """Time the enclosed block and export it as a span.
+
+    Exceptions are recorded on the span and re-raised unchanged.
+    """
+    current = Span(name=name, attributes=attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        # Streamlit's rerun/stop signals are control flow, not failures
+        if isinstance(e, Exception) and type(e).__name__ not in ("RerunException", "StopException"):
+            current.record_error(e)
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+        _export(current)
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator form of span(); the span name defaults to the function name."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def current_span() -> Optional[Span]:
+    """The innermost active span in this context, if any."""
+    return _current_span.get()
+
+def annotate(**attributes: Any):
+    """Set attributes on the active span; a no-op outside any span."""
+    active = _current_span.get()
+    if active is not None:
+        active.set(**attributes)
+
+def record_error(error: BaseException):
+    """Mark the active span as failed when the caller handles the exception itself."""
+    active = _current_span.get()
+    if active is not None:
+        active.record_error(error)
+
+def payload_size(payload: Any) -> int:
+    """Approximate wire size of a JSON payload in bytes."""
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    return len(json.dumps(payload, default=str).encode("utf-8"))
+
+def record_llm_usage(target: Span, response: Any):
+    """Copy token counts, including prompt tokens served from the provider's prefix cache, onto a span."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    target.set(
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        total_tokens=getattr(usage, "total_tokens", 0) or 0,
+    )
@@ -0,0 +1,127 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+from modules.config.settings import get_settings
+from modules.skills.matcher import get_matcher, normalize_text
+from modules.skills.taxonomy import SKILL_TAXONOMY
+
+def _word_starts(key: str) -> List[str]:
+    """The key and each of its later words onwards, so "cloud" also finds "Google Cloud"."""
+    words = key.split(" ")
+    return [" ".join(words[index:]) for index in range(len(words))]
+
+class SkillIndex:
+    """Prefix-searchable skill vocabulary: the taxonomy plus skills from user profiles.
+
+    Every canonical name and alias is kept as a normalized key in one sorted
+    list, so a prefix lookup is a binary search followed by a scan of the
+    matching run. Suggestions are ranked by how many users list the skill.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]] = SKILL_TAXONOMY,
+                 vocabulary: Iterable[Dict] = ()):
+        matcher = get_matcher()
+        self.categories: Dict[str, str] = dict(matcher.categories)
+        self.users: Counter = Counter()
+        # Normalized spelling -> canonical name, for exact lookups on save
+        self._exact: Dict[str, str] = dict(matcher.aliases)
+
+        spellings: Dict[str, Counter] = defaultdict(Counter)
+        category_users: Dict[str, Counter] = defaultdict(Counter)
+        for row in vocabulary:
+            skill = str(row.get("skill") or "").strip()
+            if not skill:
+                continue
+            count = int(row.get("users") or 0)
+            name = matcher.canonical(skill) or normalize_text(skill)
+            spellings[name][skill] += count
+            category_users[name][row.get("category")] += count
+        for name, counts in spellings.items():
+            if name in self.categories:
+                self.users[name] += sum(counts.values())
+                continue
+            # Skills outside the taxonomy go by the spelling most users chose
+            display = counts.most_common(1)[0][0]
+            self._exact[name] = display
+            self.users[display] += sum(counts.values())
+            self.categories[display] = category_users[name].most_common(1)[0][0]
+
+        entries = set()
+        for key, canonical in self._exact.items():
+            for start in _word_starts(key):
+                entries.add((start, canonical))
+        self._keys = sorted(entries)
+
+        self._by_category: Dict[str, List[str]] = defaultdict(list)
+        for name in sorted(self.categories, key=self._rank):
+            self._by_category[self.categories[name]].append(name)
+
+    def _rank(self, name: str):
+        return (-self.users[name], name.lower())
+
+    def suggest(self, prefix: str, category: Optional[str] = None, limit: int = 8) -> List[str]:
+        """Canonical skills with a name, alias or word starting with prefix, most used first."""
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return self.options(category)[:limit]
+        found = set()
+        position = bisect_left(self._keys, (prefix, ""))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            name = self._keys[position][1]
+            if category is None or self.categories.get(name) == category:
+                found.add(name)
+            position += 1
+        return sorted(found, key=self._rank)[:limit]
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical spelling of a skill, or None when neither the taxonomy nor other users know it."""
+        return self._exact.get(normalize_text(name))
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """Skills in their canonical spelling, without duplicates; unknown skills are kept as typed."""
+        result, seen = [], set()
+        for skill in skills or []:
+            skill = str(skill).strip()
+            if not skill:
+                continue
+            name = self.canonical(skill) or skill
+            if normalize_text(name) not in seen:
+                seen.add(normalize_text(name))
+                result.append(name)
+        return result
+
+    def options(self, category: Optional[str] = None, extra: Iterable[str] = ()) -> List[str]:
+        """The category's vocabulary, most used first, followed by any extra values not in it."""
+        names = self._by_category.get(category, []) if category else sorted(self.categories, key=self._rank)
+        known = set(names)
+        return names + [value for value in extra if value not in known]
+
+def canonicalize_skills(skills: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """A profile's skills section with every skill in its canonical spelling."""
+    index = get_skill_index()
+    return {category: index.canonicalize(values) for category, values in (skills or {}).items()}
+
+_index: Optional[SkillIndex] = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+def _load_vocabulary() -> List[Dict]:
+    from modules.database.client import db
+    try:
+        return db.get_skill_vocabulary(get_settings().skill_vocabulary_min_users)
+    except Exception as e:
+        print(f"Error loading skill vocabulary: {str(e)}")
+        return []
+
+def get_skill_index() -> SkillIndex:
+    """The process-wide index, rebuilt from the database every skill_vocabulary_ttl_seconds."""
+    global _index, _index_built_at
+    ttl = get_settings().skill_vocabulary_ttl_seconds
+    if _index is None or time.monotonic() - _index_built_at > ttl:
+        with _index_lock:
+            if _index is None or time.monotonic() - _index_built_at > ttl:
+                _index = SkillIndex(vocabulary=_load_vocabulary())
+                _index_built_at = time.monotonic()
+    return _index
@@ -0,0 +1,162 @@
+import re
+import threading
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from modules.skills.taxonomy import EXACT_CASE_SPELLINGS, SKILL_TAXONOMY
+
+WHITESPACE = re.compile(r'\s+')
+LINE_SPACE = re.compile(r'[^\S\n]+')
+
+def normalize_text(text: str) -> str:
+    """Lowercase with single spaces, the form both patterns and documents are matched in."""
+    return WHITESPACE.sub(" ", (text or "").lower()).strip()
+
+class AhoCorasick:
+    """Multi-pattern string matcher: every occurrence of every pattern in one pass.
+
+    Patterns are compiled into a trie whose failure links point at the
+    longest proper suffix that is also a trie path, so the scan never backs
+    up and runs in time linear in the text plus the number of matches.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, object]]):
+        # Node i: outgoing edges, failure link and the (length, value) pairs ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, object]]] = [[]]
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._link()
+
+    def _add(self, pattern: str, value):
+        node = 0
+        for char in pattern:
+            following = self._goto[node].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[node][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = following
+        self._out[node].append((len(pattern), value))
+
+    def _link(self):
+        """Breadth-first pass setting failure links and merging suffix outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, following in self._goto[node].items():
+                queue.append(following)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[following] = target if target != following else 0
+                self._out[following] = self._out[following] + self._out[self._fail[following]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every pattern occurrence."""
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, value in self._out[node]:
+                yield index + 1 - length, index + 1, value
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+def _is_exact_match(original: str, start: int, end: int, spelling: str) -> bool:
+    """Whether an everyday-word spelling at start:end is meant as the skill."""
+    if original[start:end] != spelling:
+        return False
+    if (start > 0 and original[start - 1] == "-") or (end < len(original) and original[end] == "-"):
+        return False
+    before = original[:start].rstrip(" ")
+    return bool(before) and before[-1] not in ".!?\n"
+
+class SkillMatcher:
+    """Finds taxonomy skills, under any of their aliases, in free text."""
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]] = SKILL_TAXONOMY,
+                 exact_case: Iterable[str] = EXACT_CASE_SPELLINGS):
+        # Normalized form -> the only case it matches in, for everyday-word spellings
+        self.exact_case: Dict[str, str] = {normalize_text(spelling): spelling for spelling in exact_case}
+        self.categories: Dict[str, str] = {}
+        patterns = {}
+        for category, skills in taxonomy.items():
+            for canonical, aliases in skills.items():
+                self.categories[canonical] = category
+                for alias in [canonical, *aliases]:
+                    patterns.setdefault(normalize_text(alias), canonical)
+        self.aliases = patterns
+        self._automaton = AhoCorasick(patterns.items())
+
+    def find(self, text: str) -> Counter:
+        """Mention count per canonical skill.
+
+        A match must start and end on a word boundary, so "go" is not found in
+        "good", and overlapping matches keep the longest ("github actions",
+        not "github"). Everyday-word spellings such as "Go" must also appear
+        in their exact case, outside hyphenated words and not opening a
+        sentence.
+        """
+        # Spaces collapsed but case and line breaks kept, for the exact-case checks
+        original = LINE_SPACE.sub(" ", text or "").strip()
+        text = original.lower()
+        if len(text) != len(original):
+            # Lowercasing changed some offsets; everyday-word spellings are skipped
+            original = None
+        spans = [
+            (start, end, skill)
+            for start, end, skill in self._automaton.iter_matches(text)
+            if _is_boundary(text, start - 1) and _is_boundary(text, end)
+            and (text[start:end] not in self.exact_case
+                 or (original is not None and _is_exact_match(original, start, end, self.exact_case[text[start:end]])))
+        ]
+        counts = Counter()
+        covered_until = -1
+        for start, end, skill in sorted(spans, key=lambda span: (span[0], -span[1])):
+            if start < covered_until:
+                continue
+            counts[skill] += 1
+            covered_until = end
+        return counts
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical spelling of a skill name or alias, or None when it is not in the taxonomy."""
+        return self.aliases.get(normalize_text(name))
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+def get_matcher() -> SkillMatcher:
+    """The process-wide matcher, compiled from the taxonomy on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher()
+    return _matcher
+
+def find_skills(text: str) -> Counter:
+    return get_matcher().find(text)
+
+def compare_skills(resume_text: str, job_text: str) -> Dict:
+    """Local keyword check of a resume against a job description.
+
+    Returns the job's skills found and missing in the resume (most mentioned
+    in the posting first) and a 0-100 keyword match score weighting each job
+    skill by how often the posting mentions it.
+    """
+    job_skills = find_skills(job_text)
+    resume_skills = find_skills(resume_text)
+    ranked = [skill for skill, _ in job_skills.most_common()]
+    matched = [skill for skill in ranked if skill in resume_skills]
+    missing = [skill for skill in ranked if skill not in resume_skills]
+    total = sum(job_skills.values())
+    score = round(100 * sum(job_skills[skill] for skill in matched) / total) if total else None
+    return {"score": score, "matched": matched, "missing": missing}
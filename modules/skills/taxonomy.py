@@ -0,0 +1,184 @@
+# Skill taxonomy in the Profile page's skill categories. Each canonical skill
+# lists the other spellings it appears under in resumes and postings; matching
+# is case-insensitive, so aliases are only needed for genuinely different forms.
+# Aliases must not be everyday words ("security", "rails", "torch", "coaching"),
+# which job ads use in their ordinary sense.
+SKILL_TAXONOMY = {
+    "programmingLanguages": {
+        "Python": ["python3", "py"],
+        "Java": [],
+        "JavaScript": ["js", "ecmascript", "es6"],
+        "TypeScript": ["ts"],
+        "Go": ["golang"],
+        "Rust": [],
+        "C++": ["cpp", "c plus plus"],
+        "C#": ["c sharp", "csharp"],
+        "Ruby": [],
+        "PHP": [],
+        "Kotlin": [],
+        "Swift": [],
+        "Scala": [],
+        "SQL": ["t-sql", "pl/sql", "plsql"],
+        "Bash": ["shell scripting", "shell script"],
+        "HTML": ["html5"],
+        "CSS": ["css3"],
+        "MATLAB": [],
+        "Dart": [],
+        "Elixir": [],
+        "Haskell": [],
+        "Perl": [],
+        "Objective-C": ["objective c", "objc"],
+        "Solidity": [],
+    },
+    "frameworksLibraries": {
+        "Django": [],
+        "Flask": [],
+        "FastAPI": ["fast api"],
+        "Spring Boot": ["springboot"],
+        "React": ["react.js", "reactjs"],
+        "Next.js": ["nextjs", "next js"],
+        "Angular": ["angularjs", "angular.js"],
+        "Vue.js": ["vue", "vuejs"],
+        "Node.js": ["nodejs", "node js"],
+        "Express.js": ["expressjs"],
+        ".NET": ["dotnet", "asp.net", ".net core"],
+        "Ruby on Rails": ["ror"],
+        "Laravel": [],
+        "Celery": [],
+        "Pandas": [],
+        "NumPy": [],
+        "scikit-learn": ["sklearn", "scikit learn"],
+        "TensorFlow": [],
+        "PyTorch": [],
+        "Keras": [],
+        "Spark": ["apache spark", "pyspark"],
+        "Hadoop": [],
+        "GraphQL": [],
+        "gRPC": [],
+        "Protocol Buffers": ["protobuf", "protobufs"],
+        "Streamlit": [],
+        "Tailwind CSS": ["tailwind", "tailwindcss"],
+        "Bootstrap": [],
+        "jQuery": [],
+        "Redux": [],
+        "SQLAlchemy": [],
+        "Hibernate": [],
+        "LangChain": [],
+        "Hugging Face": ["huggingface"],
+    },
+    "toolsPlatforms": {
+        "Docker": ["dockerfile", "docker compose"],
+        "Kubernetes": ["k8s", "eks", "gke", "aks"],
+        "Terraform": [],
+        "Ansible": [],
+        "Helm": [],
+        "Git": [],
+        "GitHub": [],
+        "GitHub Actions": [],
+        "GitLab CI": ["gitlab"],
+        "Jenkins": [],
+        "CircleCI": [],
+        "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+        "Infrastructure as Code": ["iac", "infrastructure-as-code"],
+        "PostgreSQL": ["postgres", "postgre", "psql"],
+        "MySQL": [],
+        "SQLite": [],
+        "MongoDB": ["mongo"],
+        "Redis": [],
+        "Elasticsearch": ["elastic search", "opensearch"],
+        "Cassandra": [],
+        "DynamoDB": [],
+        "Snowflake": [],
+        "BigQuery": [],
+        "Kafka": ["apache kafka"],
+        "RabbitMQ": ["rabbit mq"],
+        "Message Queues": ["message queue", "message queueing", "message broker", "message brokers"],
+        "Airflow": ["apache airflow"],
+        "dbt": [],
+        "Prometheus": [],
+        "Grafana": [],
+        "Datadog": [],
+        "Distributed Tracing": ["opentelemetry", "jaeger"],
+        "Nginx": [],
+        "Linux": ["unix"],
+        "Jira": [],
+        "Confluence": [],
+        "Figma": [],
+        "Tableau": [],
+        "Power BI": ["powerbi"],
+        "Microsoft Excel": ["ms excel", "excel spreadsheets"],
+        "Postman": [],
+        "Supabase": [],
+        "Firebase": [],
+    },
+    "cloud": {
+        "AWS": ["amazon web services", "ec2", "s3", "aws lambda"],
+        "Azure": ["microsoft azure"],
+        "Google Cloud": ["gcp", "google cloud platform"],
+        "Heroku": [],
+        "Vercel": [],
+        "Cloudflare": [],
+        "DigitalOcean": ["digital ocean"],
+        "Serverless": [],
+    },
+    "domains": {
+        "Payments": ["payment processing", "payment systems"],
+        "Fintech": ["financial technology"],
+        "PCI-DSS": ["pci dss"],
+        "E-commerce": ["ecommerce", "e commerce"],
+        "Healthcare": ["healthtech"],
+        "Machine Learning": [],
+        "Deep Learning": [],
+        "Artificial Intelligence": [],
+        "Natural Language Processing": ["nlp"],
+        "Computer Vision": [],
+        "Data Engineering": [],
+        "Data Science": [],
+        "Data Analysis": ["data analytics"],
+        "Distributed Systems": [],
+        "Microservices": ["micro-services", "microservice"],
+        "Event-Driven Architecture": ["event-driven", "event driven"],
+        "REST APIs": ["restful", "rest api", "rest apis", "restful apis"],
+        "Observability": [],
+        "Cybersecurity": ["infosec", "information security", "application security"],
+        "DevOps": [],
+        "Site Reliability Engineering": ["sre"],
+        "Blockchain": [],
+        "Embedded Systems": [],
+        "Mobile Development": ["ios", "android"],
+        "Performance Tuning": ["performance optimization", "query optimization"],
+        "Streaming": ["stream processing", "streaming pipelines"],
+    },
+    "softSkills": {
+        "Communication": ["communication skills"],
+        "Collaboration": ["teamwork", "team player"],
+        "Leadership": ["team leadership"],
+        "Mentoring": ["mentorship"],
+        "Problem Solving": ["problem-solving"],
+        "Project Management": [],
+        "Stakeholder Management": [],
+        "Time Management": [],
+        "Critical Thinking": [],
+        "Adaptability": [],
+        "Agile": ["scrum", "kanban"],
+        "Code Review": ["code reviews", "design reviews"],
+    },
+}
+
+# Spellings that are also everyday words ("go above and beyond", "swift
+# delivery", "react quickly", "take the helm"). In free text they only match
+# in exactly this case, not joined by a hyphen ("go-to-market") and not at the
+# start of a sentence or line.
+EXACT_CASE_SPELLINGS = ("Go", "Swift", "React", "Helm")
+
+# Ordinary English that must not be read as a skill; the benchmarks' skill_match
+# flow fails if any of these finds one.
+EVERYDAY_PHRASES = (
+    "We go above and beyond for customers.",
+    "Expect swift delivery and a go-to-market mindset.",
+    "You can react quickly and react fast under pressure.",
+    "Ready to take the helm of the team.",
+    "Keep guard rails in place and carry the torch.",
+    "Fit a PCI Express card and add 5 ml of solution.",
+    "Enjoys coaching and power transformers.",
+)
@@ -0,0 +1,76 @@
+import io
+import threading
+from collections import OrderedDict
+from typing import Optional
+import requests
+from modules.config.settings import get_settings
+from modules.database.client import db
+from modules.monitoring.metrics import record_cache
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow ships with Streamlit, but keep the header working without it
+    Image = None
+
+_avatar_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_avatar_lock = threading.Lock()
+
+def make_thumbnail(image_data: bytes, size: Optional[int] = None) -> bytes:
+    """Resize image bytes to a small PNG thumbnail."""
+    size = size or get_settings().avatar_size
+    if Image is None:
+        return image_data
+    with Image.open(io.BytesIO(image_data)) as image:
+        image = image.convert("RGBA")
+        image.thumbnail((size, size))
+        output = io.BytesIO()
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+def _cache_get(key: str) -> Optional[bytes]:
+    with _avatar_lock:
+        data = _avatar_cache.get(key)
+        if data is not None:
+            _avatar_cache.move_to_end(key)
+        return data
+
+def _cache_put(key: str, data: bytes):
+    with _avatar_lock:
+        _avatar_cache[key] = data
+        _avatar_cache.move_to_end(key)
+        while len(_avatar_cache) > get_settings().avatar_cache_size:
+            _avatar_cache.popitem(last=False)
+
+def get_avatar_thumbnail(user_id: str, picture_url: Optional[str] = None) -> Optional[bytes]:
+    """Get the user's avatar thumbnail, fetching and storing it only once.
+
+    Lookup order is the in-process LRU, then the ``avatars`` bucket, then the
+    original picture URL. A freshly downloaded picture is resized and uploaded
+    to the bucket so other processes can skip the external fetch.
+    """
+    if not user_id:
+        return None
+    cached = _cache_get(user_id)
+    record_cache("avatar.memory", cached is not None)
+    if cached is not None:
+        return cached
+
+    file_path = f"{user_id}/avatar"
+    thumbnail = db.download_avatar(file_path)
+    record_cache("avatar.bucket", bool(thumbnail))
+    if not thumbnail and picture_url:
+        try:
+            response = requests.get(picture_url, timeout=get_settings().avatar_fetch_timeout)
+            response.raise_for_status()
+            thumbnail = make_thumbnail(response.content)
+        except Exception as e:
+            print(f"Error fetching avatar: {str(e)}")
+            return None
+        try:
+            db.upload_avatar(user_id, thumbnail)
+        except Exception as e:
+            print(f"Error storing avatar: {str(e)}")
+
+    if thumbnail:
+        _cache_put(user_id, thumbnail)
+    return thumbnail or None
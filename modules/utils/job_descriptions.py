@@ -0,0 +1,16 @@
+import hashlib
+import re
+import unicodedata
+
+def normalize_job_description(text: str) -> str:
+    """Canonical form of a job description: NFKC, lowercase, single spaces.
+
+    Postings copied from different pages differ in case, line breaks and
+    stray whitespace; those copies should share one stored row.
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+def job_description_hash(text: str) -> str:
+    """Content key of a job description, stable across whitespace and case changes."""
+    return hashlib.sha256(normalize_job_description(text).encode("utf-8")).hexdigest()
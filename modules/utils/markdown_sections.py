@@ -0,0 +1,77 @@
+import re
+from typing import Dict, List, Optional
+
+# Resumes use "## " headings for their sections; everything before the first
+# one (the name and contact lines) is the header section, whose heading is None
+SECTION_HEADING = re.compile(r'^##\s+(.+?)\s*#*\s*$')
+EDIT_ACTIONS = ("replace", "insert_after", "delete")
+
+class SectionEditError(ValueError):
+    """An edit refers to a section the resume does not have, or is malformed."""
+
+def split_sections(markdown: str) -> List[Dict]:
+    """Split a markdown resume into sections: {"heading": str or None, "markdown": str}."""
+    sections = [{"heading": None, "lines": []}]
+    in_fence = False
+    for line in markdown.strip().splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else SECTION_HEADING.match(line)
+        if match:
+            sections.append({"heading": match.group(1), "lines": []})
+        sections[-1]["lines"].append(line)
+    result = [
+        {"heading": section["heading"], "markdown": "\n".join(section["lines"]).strip()}
+        for section in sections
+    ]
+    # No header section when the resume starts straight with a "## " heading
+    return result if result[0]["markdown"] else result[1:]
+
+def join_sections(sections: List[Dict]) -> str:
+    return "\n\n".join(section["markdown"] for section in sections if section["markdown"]) + "\n"
+
+def _normalise(heading: Optional[str]) -> str:
+    return re.sub(r'\W+', ' ', heading or "").strip().lower()
+
+def find_section(sections: List[Dict], heading: Optional[str]) -> int:
+    """Index of the section with the given heading; an empty heading means the header."""
+    wanted = _normalise(heading)
+    matches = [i for i, section in enumerate(sections) if _normalise(section["heading"]) == wanted]
+    if len(matches) != 1:
+        problem = "no" if not matches else "more than one"
+        raise SectionEditError(f"The resume has {problem} section called {heading!r}")
+    return matches[0]
+
+def apply_section_edits(markdown: str, edits: List[Dict]) -> str:
+    """Apply section-level edits to a markdown resume and return the new markdown.
+
+    Each edit is {"action": "replace" | "insert_after" | "delete", "section":
+    heading, "content": full section markdown including its "## " heading}.
+    The header section is addressed with an empty heading. Raises
+    SectionEditError when an edit cannot be applied, leaving the caller to
+    fall back to regenerating the whole resume.
+    """
+    sections = split_sections(markdown)
+    if not isinstance(edits, list) or not edits:
+        raise SectionEditError("No edits were returned")
+    for edit in edits:
+        if (not isinstance(edit, dict) or edit.get("action") not in EDIT_ACTIONS
+                or not isinstance(edit.get("section"), (str, type(None)))):
+            raise SectionEditError(f"Unsupported edit: {edit!r}")
+        index = find_section(sections, edit.get("section"))
+        if edit["action"] == "delete":
+            del sections[index]
+            continue
+        content = str(edit.get("content") or "").strip()
+        heading = sections[index]["heading"]
+        if edit["action"] == "replace" and heading is not None and not SECTION_HEADING.match(content.split("\n", 1)[0]):
+            # Content given without its heading keeps the section's heading
+            content = f"## {heading}\n\n{content}"
+        replacement = split_sections(content)
+        if len(replacement) != 1 or (edit["action"] == "insert_after" and replacement[0]["heading"] is None):
+            raise SectionEditError(f"Edit content for {edit.get('section')!r} is not a single section")
+        if edit["action"] == "replace":
+            sections[index] = replacement[0]
+        else:
+            sections.insert(index + 1, replacement[0])
+    return join_sections(sections)
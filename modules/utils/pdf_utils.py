@@ -0,0 +1,133 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, List
+from modules.cache.store import get_cache
+from modules.config.settings import get_settings
+from modules.monitoring.metrics import record_cache
+from modules.monitoring.tracing import traced, annotate
+from modules.utils.markdown_sections import split_sections
+from modules.utils.resume_content import section_hash
+
+# Bump when rendering changes so PDFs cached by earlier code are not served
+PDF_RENDER_VERSION = 1
+
+# Parsed Spire.Doc documents of single resume sections, by section hash
+_section_documents: "OrderedDict[str, Any]" = OrderedDict()
+_section_lock = threading.Lock()
+
+def _load_markdown(markdown_text):
+    """Parse markdown into a Spire.Doc Document."""
+    from spire.doc import Document
+
+    # Save markdown to a temp file
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.md', mode='w', encoding='utf-8') as mdfile:
+        mdfile.write(markdown_text)
+        md_path = mdfile.name
+
+    try:
+        document = Document()
+        document.LoadFromFile(md_path)
+        return document
+    finally:
+        # Clean up the markdown temp file
+        try:
+            os.unlink(md_path)
+        except:
+            pass
+
+def _section_document(markdown_text):
+    """Parsed document for one section, reused while the section is unchanged.
+
+    Called with _section_lock held.
+    """
+    key = section_hash(markdown_text)
+    document = _section_documents.get(key)
+    record_cache("pdf.section", document is not None)
+    if document is not None:
+        _section_documents.move_to_end(key)
+        return document, True
+    document = _load_markdown(markdown_text)
+    _section_documents[key] = document
+    while len(_section_documents) > get_settings().pdf_section_cache_size:
+        _section_documents.popitem(last=False)[1].Dispose()
+    return document, False
+
+@traced("pdf.render")
+def markdown_to_pdf_spire(markdown_text):
+    """Render markdown to a temporary PDF file with Spire.Doc and return its path.
+
+    Each "## " section is parsed on its own and kept by content hash, so
+    rendering a resume again after an edit only parses the sections that
+    changed; the parsed sections are copied into one document for layout.
+    """
+    # Spire.Doc loads a large native runtime, so import it only when rendering
+    from spire.doc import Document, FileFormat
+
+    # Create a new Word document from the parsed sections
+    document = Document()
+    document.AddSection()
+    body = document.Sections[0].Body
+    sections = split_sections(markdown_text)
+    reused = 0
+    with _section_lock:
+        for section in sections:
+            parsed, hit = _section_document(section["markdown"])
+            reused += hit
+            for index in range(parsed.Sections.Count):
+                children = parsed.Sections[index].Body.ChildObjects
+                for child in range(children.Count):
+                    body.ChildObjects.Add(children[child].Clone())
+
+    # Create PDF in a new temp file
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmpfile:
+        pdf_path = tmpfile.name
+
+    # Save as PDF
+    document.SaveToFile(pdf_path, FileFormat.PDF)
+    document.Dispose()
+
+    annotate(
+        chars=len(markdown_text),
+        sections=len(sections),
+        reused_sections=reused,
+        output_bytes=os.path.getsize(pdf_path)
+    )
+    return pdf_path
+
+def render_pdf_bytes(markdown_text: str) -> bytes:
+    """PDF bytes for a markdown resume, from the shared cache when any replica rendered it before."""
+    key = hashlib.sha256(markdown_text.encode("utf-8")).hexdigest()
+    namespace = f"pdf.v{PDF_RENDER_VERSION}"
+    cache = get_cache()
+    data = cache.get(namespace, key)
+    record_cache("pdf.render", data is not None)
+    if data is not None:
+        return data
+    pdf_path = markdown_to_pdf_spire(markdown_text)
+    try:
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+    finally:
+        try:
+            os.unlink(pdf_path)
+        except OSError:
+            pass
+    cache.set(namespace, key, data, get_settings().pdf_cache_ttl_seconds)
+    return data
+
+def extract_pdf_pages(data: bytes) -> List[str]:
+    """Text of each page of a PDF, cached by the file's hash so re-uploads skip extraction."""
+    key = hashlib.sha256(data).hexdigest()
+    cache = get_cache()
+    pages = cache.get_json("pdf_text", key)
+    record_cache("pdf.text", pages is not None)
+    annotate(cached=pages is not None)
+    if pages is None:
+        from PyPDF2 import PdfReader
+        pages = [page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages]
+        cache.set_json("pdf_text", key, pages, get_settings().pdf_text_cache_ttl_seconds)
+    return pages
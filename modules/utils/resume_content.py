@@ -0,0 +1,73 @@
+import hashlib
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Union
+from modules.utils.markdown_sections import join_sections, split_sections
+
+# resumes.resume_content layout:
+#   {"format": "sections", "sections": [{"heading": str or None, "markdown": str, "hash": str}]}
+# Older rows hold the whole resume as one markdown string; every reader goes
+# through resume_markdown() so both layouts keep working.
+CONTENT_FORMAT = "sections"
+
+def section_hash(markdown: str) -> str:
+    """Stable short hash of a section's markdown, used to spot unchanged sections."""
+    return hashlib.sha256(markdown.strip().encode("utf-8")).hexdigest()[:16]
+
+def to_resume_content(markdown: str) -> Dict:
+    """Convert a markdown resume to the structured resume_content layout."""
+    return {
+        "format": CONTENT_FORMAT,
+        "sections": [
+            {"heading": section["heading"], "markdown": section["markdown"], "hash": section_hash(section["markdown"])}
+            for section in split_sections(markdown or "")
+        ],
+    }
+
+def as_resume_content(content: Union[str, Dict, None]) -> Dict:
+    """Structured content from either layout; legacy markdown strings are converted."""
+    if isinstance(content, dict) and content.get("format") == CONTENT_FORMAT:
+        return content
+    return to_resume_content(content if isinstance(content, str) else "")
+
+def resume_markdown(content: Union[str, Dict, None]) -> str:
+    """Markdown for a stored resume_content value in either layout."""
+    if isinstance(content, str):
+        return content
+    sections = as_resume_content(content)["sections"]
+    return join_sections(sections) if sections else ""
+
+def changed_sections(old: Union[str, Dict, None], new: Union[str, Dict, None]) -> Optional[Dict[int, Dict]]:
+    """Sections of new that differ from old, by index.
+
+    Returns None when the section list itself changed (a section was added,
+    removed or renamed), in which case the whole content has to be written.
+    """
+    old_sections: List[Dict] = as_resume_content(old)["sections"]
+    new_sections: List[Dict] = as_resume_content(new)["sections"]
+    if [section["heading"] for section in old_sections] != [section["heading"] for section in new_sections]:
+        return None
+    return {
+        index: section
+        for index, (previous, section) in enumerate(zip(old_sections, new_sections))
+        if previous.get("hash") != section["hash"]
+    }
+
+def make_delta(base: str, new: str) -> List:
+    """Line-level delta that rebuilds new from base.
+
+    Each op is either [start, end], copying base lines start:end, or a
+    string of new lines to insert.
+    """
+    base_lines = base.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, base_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+def apply_delta(base: str, ops: List) -> str:
+    base_lines = base.splitlines(keepends=True)
+    return "".join("".join(base_lines[op[0]:op[1]]) if isinstance(op, list) else op for op in ops)
@@ -1,5 +1,6 @@
 import streamlit as st
 from modules.auth.auth_utils import get_user_info
+from modules.utils.avatar_utils import get_avatar_thumbnail
 
 def display_user_header():
     """Display the user header with profile picture, name, and logout button."""
@@ -14,7 +15,9 @@ def display_user_header():
                 st.header(f"Welcome, {user_info['name']}")
             
             with col2:
-                st.image(user_info['picture'], width=50)
+                # Serve the cached thumbnail; fall back to the remote picture
+                avatar = get_avatar_thumbnail(user_info['id'], user_info['picture'])
+                st.image(avatar or user_info['picture'], width=50)
             
             with col3:
                 if st.button("Logout"):
@@ -22,4 +25,32 @@ def display_user_header():
                     st.rerun()
             
             # Add a separator
-            st.divider() 
\ No newline at end of file
+            st.divider() 
+
+def queue_position_notifier():
+    """Return an on_wait callback that shows the user's place in the LLM queue."""
+    placeholder = st.empty()
+
+    def notify(position):
+        if position == 1:
+            placeholder.info("The AI service is busy. You are next in the queue.")
+        elif position:
+            placeholder.info(f"The AI service is busy. You are number {position} in the queue.")
+        else:
+            placeholder.empty()
+    return notify
+
+
+def job_status_notifier():
+    """Return an on_update callback that shows where a background job is."""
+    placeholder = st.empty()
+
+    def notify(job):
+        progress = job.get("progress") or {}
+        if job["status"] == "queued":
+            placeholder.info(f"Waiting for a free worker. Your job is number {job.get('position', 1)} in line.")
+        elif progress.get("stage") == "llm_queue":
+            placeholder.info(f"The AI service is busy. You are number {progress['position']} in the queue.")
+        else:
+            placeholder.empty()
+    return notify
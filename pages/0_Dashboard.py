@@ -2,6 +2,7 @@ import streamlit as st
 from modules.auth.auth_utils import check_auth
 from modules.database.client import db
 from modules.utils.ui_utils import display_user_header
+from modules.monitoring.profiler import profile_run
 
 def calculate_profile_completion(profile_data):
     """Calculate profile completion percentage based on filled fields."""
@@ -107,7 +108,8 @@ def dashboard_page():
 
 def main():
     if check_auth():
-        dashboard_page()
+        with profile_run("dashboard"):
+            dashboard_page()
     else:
         st.warning("Please login to access this page.")
 
@@ -1,31 +1,46 @@
 import streamlit as st
-from modules.database.client import db
-import os
-from openai import OpenAI
-import json
-import PyPDF2
+from modules.database.client import db, diff_profile_sections
+from modules.ai.ai_utils import parse_resume
+from modules.config.settings import get_settings
+from modules.utils.ui_utils import queue_position_notifier
+from modules.monitoring.tracing import traced, annotate
+from modules.monitoring.profiler import start_profiling, stop_profiling
+from modules.skills.autocomplete import canonicalize_skills, get_skill_index
+from modules.utils.pdf_utils import extract_pdf_pages
 import io
 import uuid
 import requests
 
-# Initialize OpenAI client — reads from st.secrets (Streamlit Cloud) or .env (local)
-_openai_key = st.secrets.get("openai", {}).get("api_key") or os.getenv('OPENAI_API_KEY')
-client = OpenAI(api_key=_openai_key)
+def skill_select(skill_index, label: str, category: str, session_skills: dict, skills: dict) -> list:
+    """Multiselect over the category's skill vocabulary that also takes new skills"""
+    current = session_skills.get(category, []) if session_skills else skills.get(category, [])
+    if isinstance(current, str):
+        current = current.split(",")
+    current = skill_index.canonicalize(current)
+    return st.multiselect(
+        label,
+        options=skill_index.options(category, current),
+        default=current,
+        accept_new_options=True,
+        placeholder="Type to search or add skills"
+    )
 
 def get_supabase_token(google_token: str) -> str:
     """Exchange Google token for Supabase token"""
     try:
+        settings = get_settings()
         # Get Supabase token using Google token
         response = requests.post(
-            f"{os.getenv('SUPABASE_URL')}/auth/v1/token",
+            f"{settings.supabase_url}/auth/v1/token",
             json={
                 "provider_token": google_token,
                 "provider": "google"
             },
             headers={
-                "apikey": os.getenv('SUPABASE_KEY'),
+                "apikey": settings.supabase_key,
                 "Content-Type": "application/json"
-            }
+            },
+            timeout=settings.supabase_timeout
         )
         if response.status_code == 200:
             return response.json()['access_token']
@@ -61,43 +76,18 @@ def get_user_info():
         "avatar_url": user.picture,
     }
 
+@traced("pdf.extract_text")
 def extract_text_from_pdf(pdf_file):
     """Extract text from uploaded PDF file"""
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
+    pages = extract_pdf_pages(pdf_file.getvalue())
+    text = "".join(pages)
+    annotate(pages=len(pages), chars=len(text))
     return text
 
-def parse_resume_with_llm(resume_text):
+def parse_resume_with_llm(resume_text, user_id=None, on_wait=None):
     """Parse resume text using OpenAI API"""
-    prompt = """Parse the following resume text and extract information in a structured JSON format. 
-    Include the following sections:
-    - basics (name, email, phone, summary, location, dob, github, linkedin, postal_code, city, country)
-    - education (list of education entries with institution, degree, fieldOfStudy, startDate, endDate, details)
-    - workExperience (list of work entries with jobTitle, company, location, startDate, endDate, responsibilities)
-    - projects (list of projects with name, description, technologies, date, link)
-    - certifications (list of certifications with name, year)
-    - skills (programmingLanguages, frameworksLibraries, toolsPlatforms, cloud, domains, softSkills)
-    - languages (list of languages)
-    - interests (list of interests)
-    
-    Resume text:
-    {resume_text}
-    
-    Return only the JSON object, no additional text. For arrays of strings (like responsibilities, technologies, etc.), 
-    return them as proper arrays, not comma-separated strings."""
-
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a resume parser that extracts structured information from resume text. Return arrays as proper JSON arrays, not comma-separated strings."},
-                {"role": "user", "content": prompt.format(resume_text=resume_text)}
-            ],
-            response_format={ "type": "json_object" }
-        )
-        parsed_data = json.loads(response.choices[0].message.content)
+        parsed_data = parse_resume(resume_text, user_id=user_id, on_wait=on_wait)
         
         # Debug: Print the parsed data in a more readable format
         # st.write("Debug - Raw LLM Response:")
@@ -114,6 +104,9 @@ if not user:
     st.warning("Please log in to view your profile.")
     st.stop()
 
+# Module-level page, so the profiler is started and stopped explicitly
+profiler = start_profiling("profile")
+
 user_id = user["id"]
 email = user["email"]
 full_name = user["fullName"]
@@ -176,7 +169,7 @@ if uploaded_file is not None:
                 st.text(resume_text)
             
             # Parse with LLM
-            parsed_data = parse_resume_with_llm(resume_text)
+            parsed_data = parse_resume_with_llm(resume_text, user_id=user_id, on_wait=queue_position_notifier())
             
             if parsed_data:
                 # Update session state with parsed data
@@ -398,29 +391,13 @@ with st.form("profile_form"):
     # Get skills from session state if available
     session_skills = st.session_state.get('skills', {})
     
-    # Handle programming languages
-    prog_langs = session_skills.get('programmingLanguages', []) if session_skills else skills.get('programmingLanguages', [])
-    programming_languages = st.text_input("Programming Languages (comma separated)", value=", ".join(prog_langs))
-    
-    # Handle frameworks
-    frameworks = session_skills.get('frameworksLibraries', []) if session_skills else skills.get('frameworksLibraries', [])
-    frameworks = st.text_input("Frameworks/Libraries (comma separated)", value=", ".join(frameworks))
-    
-    # Handle tools
-    tools = session_skills.get('toolsPlatforms', []) if session_skills else skills.get('toolsPlatforms', [])
-    tools = st.text_input("Tools/Platforms (comma separated)", value=", ".join(tools))
-    
-    # Handle cloud
-    cloud = session_skills.get('cloud', []) if session_skills else skills.get('cloud', [])
-    cloud = st.text_input("Cloud (comma separated)", value=", ".join(cloud))
-    
-    # Handle domains
-    domains = session_skills.get('domains', []) if session_skills else skills.get('domains', [])
-    domains = st.text_input("Domains (comma separated)", value=", ".join(domains))
-    
-    # Handle soft skills
-    soft_skills = session_skills.get('softSkills', []) if session_skills else skills.get('softSkills', [])
-    soft_skills = st.text_input("Soft Skills (comma separated)", value=", ".join(soft_skills))
+    skill_index = get_skill_index()
+    programming_languages = skill_select(skill_index, "Programming Languages", "programmingLanguages", session_skills, skills)
+    frameworks = skill_select(skill_index, "Frameworks/Libraries", "frameworksLibraries", session_skills, skills)
+    tools = skill_select(skill_index, "Tools/Platforms", "toolsPlatforms", session_skills, skills)
+    cloud = skill_select(skill_index, "Cloud", "cloud", session_skills, skills)
+    domains = skill_select(skill_index, "Domains", "domains", session_skills, skills)
+    soft_skills = skill_select(skill_index, "Soft Skills", "softSkills", session_skills, skills)
 
     st.subheader("Languages")
     # Handle languages - check if they're objects with 'language' field or simple strings
@@ -462,19 +439,28 @@ with st.form("profile_form"):
             "workExperience": st.session_state.work_experience,
             "projects": st.session_state.projects,
             "certifications": st.session_state.certifications,
-            "skills": {
-                "programmingLanguages": [l.strip() for l in programming_languages.split(",") if l.strip()],
-                "frameworksLibraries": [f.strip() for f in frameworks.split(",") if f.strip()],
-                "toolsPlatforms": [t.strip() for t in tools.split(",") if t.strip()],
-                "cloud": [c.strip() for c in cloud.split(",") if c.strip()],
-                "domains": [d.strip() for d in domains.split(",") if d.strip()],
-                "softSkills": [s.strip() for s in soft_skills.split(",") if s.strip()]
-            },
+            # Canonical spellings, so "Postgres" and "postgresql" are stored as PostgreSQL
+            "skills": canonicalize_skills({
+                "programmingLanguages": programming_languages,
+                "frameworksLibraries": frameworks,
+                "toolsPlatforms": tools,
+                "cloud": cloud,
+                "domains": domains,
+                "softSkills": soft_skills
+            }),
             "languages": [{"language": lang.split("(")[0].strip(), "proficiency": lang.split("(")[1].strip(")")} 
                          for lang in langs.split(",") if lang.strip() and "(" in lang],
             "interests": [i.strip() for i in ints.split(",") if i.strip()]
         }
 
+        # New skills that look like the start of a known one were probably cut short
+        for category, values in new_profile_data["skills"].items():
+            for skill in values:
+                if not skill_index.canonical(skill):
+                    matches = skill_index.suggest(skill, category, limit=3)
+                    if matches:
+                        st.info(f"\"{skill}\" is new to us. Did you mean {', '.join(matches)}?")
+
         try:
             # First try to get existing user
             user_record = None
@@ -484,10 +470,15 @@ with st.form("profile_form"):
                 user_record = db.get_user(email=email)
             
             if user_record:
-                # Update existing user
+                # Update existing user, sending only the sections that changed
                 try:
-                    db.update_user(user_record['id'], {"profile_data": new_profile_data})
-                    st.success("Profile updated successfully!")
+                    current_profile = user_record.get('profile_data') or {}
+                    changed_sections = diff_profile_sections(current_profile, new_profile_data)
+                    if changed_sections:
+                        db.update_profile_sections(user_record['id'], changed_sections, current_profile)
+                        st.success("Profile updated successfully!")
+                    else:
+                        st.info("No changes to save.")
                 except Exception as e:
                     st.error(f"Error updating profile: {str(e)}")
             else:
@@ -507,4 +498,6 @@ with st.form("profile_form"):
                     st.error(f"Error creating user profile: {str(e)}")
             
         except Exception as e:
-            st.error(f"Error updating profile: {str(e)}") 
\ No newline at end of file
+            st.error(f"Error updating profile: {str(e)}")
+
+stop_profiling(profiler)
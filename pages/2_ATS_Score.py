@@ -1,70 +1,35 @@
 import streamlit as st
 from modules.auth.auth_utils import check_auth
-from modules.utils.ui_utils import display_user_header
-from openai import OpenAI
-import os
+from modules.utils.ui_utils import display_user_header, queue_position_notifier
+from modules.ai.ai_utils import create_chat_completion
+from modules.ai.prompts import ATS_ANALYSIS
+from modules.ai.job_digest import job_description_for_prompt
+from modules.skills.matcher import compare_skills
+from modules.utils.pdf_utils import extract_pdf_pages
+from modules.monitoring.tracing import traced, annotate
+from modules.monitoring.profiler import profile_run
 import json
-from PyPDF2 import PdfReader
-
-_openai_key = st.secrets.get("openai", {}).get("api_key") or os.getenv('OPENAI_API_KEY')
-client = OpenAI(api_key=_openai_key)
 
+@traced("pdf.extract_text")
 def extract_text_from_pdf(file):
     """Extract text from uploaded PDF file."""
     try:
-        pdf_reader = PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        pages = extract_pdf_pages(file.getvalue())
+        text = "".join(page + "\n" for page in pages)
+        annotate(pages=len(pages), chars=len(text))
         return text
     except Exception as e:
         st.error(f"Error extracting text from PDF: {str(e)}")
         return None
 
-def analyze_resume_ats(resume_text, job_details):
+def analyze_resume_ats(resume_text, job_details, user_id=None, on_wait=None):
     """Analyze resume against job description using LLM."""
-    prompt = f"""
-You are an expert ATS (Applicant Tracking System) analyst with 15+ years of experience in recruitment and HR technology.
-
-## TASK
-Analyze the provided resume against the job description and provide a detailed ATS compatibility assessment.
-
-## INPUTS
-
-### Job Description:
-{job_details}
-
-### Resume Text:
-{resume_text}
-
-## OUTPUT FORMAT
-Provide your analysis in the following JSON format:
-{{
-    "overall_score": <score out of 100>,
-    "score_breakdown": {{
-        "keyword_match": <score out of 100>,
-        "format_compatibility": <score out of 100>,
-        "content_relevance": <score out of 100>,
-        "experience_alignment": <score out of 100>
-    }},
-    "missing_keywords": [<list of important keywords from job description missing in resume>],
-    "format_issues": [<list of format-related issues>],
-    "content_suggestions": [<list of content improvement suggestions>],
-    "experience_gaps": [<list of experience gaps or misalignments>],
-    "strengths": [<list of resume strengths>],
-    "improvement_areas": [<list of areas needing improvement>]
-}}
-
-Focus on providing specific, actionable feedback that will help improve the resume's ATS compatibility.
-"""
-
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a helpful ATS analysis assistant. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ]
+        response = create_chat_completion(
+            "llm.ats_analysis",
+            user_id=user_id,
+            on_wait=on_wait,
+            messages=ATS_ANALYSIS.messages(resume_text=resume_text, job_details=job_details)
         )
         
         # Get the response content and clean it
@@ -132,6 +97,22 @@ Focus on providing specific, actionable feedback that will help improve the resu
         st.error(f"Error analyzing resume: {str(e)}")
         return None
 
+@traced("ats.keyword_check")
+def render_keyword_check(resume_text, job_description):
+    """Show the taxonomy keyword match right away, before the LLM analysis arrives."""
+    check = compare_skills(resume_text, job_description)
+    annotate(job_skills=len(check["matched"]) + len(check["missing"]), missing=len(check["missing"]))
+    if check["score"] is None:
+        return None
+    st.markdown(f"""
+### Keyword Match: {check['score']}%
+Found {len(check['matched'])} of the {len(check['matched']) + len(check['missing'])} skills this job mentions.
+
+#### Missing Skills
+{chr(10).join([f"- {skill}" for skill in check['missing']]) or "None - every skill the job mentions is on your resume."}
+""")
+    return check
+
 def ats_score_page():
     """Display the ATS score analysis page."""
     # Display user header
@@ -167,15 +148,29 @@ def ats_score_page():
                 resume_text = extract_text_from_pdf(uploaded_file)
                 
                 if resume_text:
+                    # Instant local check while the full analysis runs
+                    st.session_state.ats_keywords = render_keyword_check(resume_text, job_description)
+                    
+                    user_id = getattr(st.user, "sub", None)
+                    # The posting is distilled once and the digest reused by later analyses
+                    description = job_description_for_prompt(
+                        job_description, user_id=user_id, on_wait=queue_position_notifier()
+                    )
+                    
                     # Combine job details
                     job_details = f"""
                     Job Title: {job_title}
                     Company: {company}
-                    Description: {job_description}
+                    Description: {description}
                     """
                     
                     # Get ATS analysis
-                    analysis = analyze_resume_ats(resume_text, job_details)
+                    analysis = analyze_resume_ats(
+                        resume_text,
+                        job_details,
+                        user_id=user_id,
+                        on_wait=queue_position_notifier()
+                    )
                     
                     if analysis:
                         # Display the analysis using markdown
@@ -188,7 +183,8 @@ def ats_score_page():
 
 def main():
     if check_auth():
-        ats_score_page()
+        with profile_run("ats_score"):
+            ats_score_page()
     else:
         st.warning("Please login to access this page.")
 
@@ -1,34 +1,26 @@
 import streamlit as st
 from modules.auth.auth_utils import check_auth
 from modules.database.client import db
-from openai import OpenAI
-import os
+from modules.ai.prompts import GAP_ANALYSIS, OPTIMIZED_RESUME, SECTION_EDITS
+from modules.ai.job_digest import job_description_for_prompt
+from modules.ai.profile_selection import select_profile_items
+from modules.jobs.job_queue import submit_job, wait_for_job
+from modules.utils.ui_utils import job_status_notifier, queue_position_notifier
+from modules.utils.markdown_sections import SectionEditError, apply_section_edits
+from modules.utils.resume_content import to_resume_content
+from modules.monitoring.profiler import profile_run
 import json
 import re
-import tempfile
-from spire.doc import *
-from spire.doc.common import *
 
 # Remove unused imports
 # from modules.ai.ai_utils import generate_resume
 # from modules.utils.ui_utils import display_user_header
 
-_openai_key = st.secrets.get("openai", {}).get("api_key") or os.getenv('OPENAI_API_KEY')
-client = OpenAI(api_key=_openai_key)
-
 
 def extract_markdown_resume(llm_output):
-    """Extract the markdown resume section from the LLM output."""
-    # Look for a markdown code block or the section after 'OPTIMIZED RESUME SECTION'
+    """Unwrap the resume from the fenced markdown block the resume call replies with."""
     match = re.search(r'```markdown(.*?)```', llm_output, re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    # Fallback: try to find the section header
-    match = re.search(r'OPTIMIZED RESUME SECTION.*?\n(.*)', llm_output, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    # Fallback: return everything
-    return llm_output.strip()
+    return (match.group(1) if match else llm_output).strip()
 
 
 def break_long_words(text, max_word_length=60):
@@ -61,32 +53,143 @@ def parse_contact_line(line, pdf):
     return None, None
 
 
-def markdown_to_pdf_spire(markdown_text):
-    # Save markdown to a temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.md', mode='w', encoding='utf-8') as mdfile:
-        mdfile.write(markdown_text)
-        md_path = mdfile.name
-    
-    try:
-        # Create a new Word document and load the markdown
-        document = Document()
-        document.LoadFromFile(md_path)
-        
-        # Create PDF in a new temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmpfile:
-            pdf_path = tmpfile.name
-        
-        # Save as PDF
-        document.SaveToFile(pdf_path, FileFormat.PDF)
-        document.Dispose()
-        
-        return pdf_path
-    finally:
-        # Clean up the markdown temp file
+# Generation runs as two concurrent LLM calls, keyed by part
+GENERATION_PARTS = {
+    "analysis": (GAP_ANALYSIS, "llm.resume_analysis"),
+    "resume": (OPTIMIZED_RESUME, "llm.generate_resume"),
+}
+
+
+def build_generation_messages(profile_data, job_title, company, job_description, resume_format, tone):
+    """Build the messages for each generation part: the gap analysis and the optimized resume."""
+    values = {
+        # Sorted keys keep the serialised profile byte-identical between calls
+        "profile_json": json.dumps(profile_data, indent=2, sort_keys=True),
+        "job_title": job_title,
+        "company": company,
+        "job_description": job_description,
+        "resume_format": resume_format,
+        "tone": tone,
+    }
+    return {part: template.messages(**values) for part, (template, _) in GENERATION_PARTS.items()}
+
+
+def submit_resume_suggestions(messages, operation="llm.generate_resume", user_id=None, response_format=None):
+    """Queue the conversation as a background LLM job and return the job id."""
+    payload = {"operation": operation, "messages": messages, "user_id": user_id}
+    if response_format:
+        payload["response_format"] = response_format
+    return submit_job("llm.chat", payload, user_id=user_id)
+
+
+def wait_for_resume_suggestions(job_id, on_update=None):
+    """Wait for a queued LLM job and return the reply text."""
+    job = wait_for_job(job_id, on_update=on_update)
+    if job is None:
+        raise RuntimeError("The generation job was lost.")
+    if job["status"] != "done":
+        raise RuntimeError(job["error"] or "The generation job failed.")
+    return job["result"]
+
+
+def submit_generation(messages_by_part, user_id=None):
+    """Queue every generation part as its own background job; returns job ids by part."""
+    return {
+        part: submit_resume_suggestions(messages, GENERATION_PARTS[part][1], user_id)
+        for part, messages in messages_by_part.items()
+    }
+
+
+def wait_for_generation(job_ids, on_update=None):
+    """Wait for every part and return the reply texts by part.
+
+    The parts run concurrently in the worker pool, so this takes about as
+    long as the slowest part rather than their sum.
+    """
+    return {part: wait_for_resume_suggestions(job_id, on_update) for part, job_id in job_ids.items()}
+
+
+def submit_improvement(context, user_id=None):
+    """Queue a full regeneration of the resume from the conversation so far."""
+    return {"resume": submit_resume_suggestions(context, operation="llm.improve_resume", user_id=user_id)}
+
+
+def apply_edit_reply(llm_output, reply):
+    """Apply the section edits in an edit reply to the current resume and return the new markdown.
+
+    Raises ValueError (including SectionEditError) when the reply is not
+    valid JSON or an edit does not fit the resume.
+    """
+    if not isinstance(reply, str):
+        raise SectionEditError("The edit reply is not text")
+    data = json.loads(reply)
+    edits = data.get("edits") if isinstance(data, dict) else None
+    return apply_section_edits(extract_markdown_resume(llm_output), edits)
+
+
+def render_resume_pdf(markdown_resume, on_update=None):
+    """Render the resume PDF in a background job and return its bytes."""
+    job = wait_for_job(submit_job("pdf.render", {"markdown": markdown_resume}), on_update=on_update)
+    if job is None or job["status"] != "done":
+        raise RuntimeError(job["error"] if job else "The PDF job was lost.")
+    return job["result"]
+
+
+def collect_pending_suggestions():
+    """Wait for the generation started in an earlier run and store its result.
+
+    The job keeps running if the user leaves the page, so coming back picks
+    it up again instead of paying for a second generation.
+    """
+    pending = st.session_state.pending_job
+    messages = {
+        "generate": "Analyzing and generating suggestions...",
+        "edit": "Applying your feedback...",
+        "improve": "Regenerating the resume with your feedback...",
+    }
+    with st.spinner(messages[pending["action"]]):
+        try:
+            replies = wait_for_generation(pending["ids"], on_update=job_status_notifier())
+        except Exception as e:
+            st.session_state.pending_job = None
+            st.error(f"Error from LLM: {str(e)}")
+            return
+
+    if pending["action"] == "edit":
         try:
-            os.unlink(md_path)
-        except:
-            pass
+            edited = apply_edit_reply(st.session_state.llm_output, replies["edits"])
+        except ValueError as e:
+            # The edits did not fit the resume, so regenerate it in full instead
+            print(f"Error applying resume edits, regenerating instead: {str(e)}")
+            try:
+                job_ids = submit_improvement(pending["context"], user_id=getattr(st.user, "sub", None))
+            except Exception as e:
+                st.session_state.pending_job = None
+                st.error(f"Error from LLM: {str(e)}")
+                return
+            st.session_state.pending_job = {"ids": job_ids, "action": "improve", "context": pending["context"]}
+            st.rerun()
+        except Exception as e:
+            # Anything else would fail again on every rerun, so drop the job
+            st.session_state.pending_job = None
+            st.error(f"Error applying your feedback: {str(e)}")
+            return
+        # Recorded as a full reply so later rounds and fallbacks see the current resume
+        replies = {"resume": f"```markdown\n{edited}```"}
+
+    # Improvements continue the resume conversation; the analysis is kept
+    st.session_state.llm_context = pending["context"] + [{"role": "assistant", "content": replies["resume"]}]
+    st.session_state.llm_output = replies["resume"]
+    if pending["action"] == "generate":
+        st.session_state.llm_analysis = replies["analysis"]
+        st.session_state.llm_last_prompt = pending["prompt"]
+        st.session_state.llm_job_description = pending["job_description"]
+        st.session_state.pdf_path = None
+        st.session_state.resume_db_id = None
+        st.session_state.resume_saved_content = None
+    st.session_state.awaiting_improvement = False
+    st.session_state.pending_job = None
+    st.rerun()
 
 
 def resume_builder_page():
@@ -98,14 +201,25 @@ def resume_builder_page():
         st.session_state.llm_context = None
     if 'llm_output' not in st.session_state:
         st.session_state.llm_output = None
+    if 'llm_analysis' not in st.session_state:
+        st.session_state.llm_analysis = None
     if 'llm_last_prompt' not in st.session_state:
         st.session_state.llm_last_prompt = None
+    if 'llm_job_description' not in st.session_state:
+        st.session_state.llm_job_description = None
     if 'awaiting_improvement' not in st.session_state:
         st.session_state.awaiting_improvement = False
     if 'pdf_path' not in st.session_state:
         st.session_state.pdf_path = None
     if 'resume_db_id' not in st.session_state:
         st.session_state.resume_db_id = None
+    if 'resume_saved_content' not in st.session_state:
+        st.session_state.resume_saved_content = None
+    if 'pending_job' not in st.session_state:
+        st.session_state.pending_job = None
+
+    if st.session_state.pending_job:
+        collect_pending_suggestions()
 
     # 1. Job Details Form (only show if no LLM output yet)
     if st.session_state.llm_output is None or st.session_state.awaiting_improvement:
@@ -142,96 +256,44 @@ def resume_builder_page():
             user_record = db.get_user(user_id=user_id)
             profile_data = user_record.get("profile_data", {}) if user_record else {}
 
-            # Construct LLM prompt
-            prompt = f'''
-You are an expert ATS-optimization specialist and professional resume coach with 15+ years of experience helping candidates secure interviews at top companies.
-
-## YOUR TASK
-Analyze the candidate's resume data against the specific job requirements, then provide:
-1. A detailed gap analysis 
-2. Strategic recommendations
-3. An ATS-optimized resume draft in markdown
-
-## INPUTS
-
-### User Resume Data (JSON):
-{json.dumps(profile_data, indent=2)}
-
-### Target Position:
-Job Title: {job_title}
-Company: {company}
-Job Description:
-{job_description}
-
-### Formatting Preferences:
-Resume Format: {resume_format}
-Writing Tone: {tone}
-
-## OUTPUT INSTRUCTIONS
-
-### 1. ANALYSIS SECTION (25% of response)
-- Provide a keyword/skills match analysis (which skills from the job description are present/missing in the resume)
-- Identify experience gaps and alignment opportunities
-- Calculate an overall match score (1-100) with brief explanation
-- List 3-5 specific strengths in relation to this position
-- Identify 3-5 potential weaknesses or improvement areas
-
-### 2. RECOMMENDATIONS SECTION (25% of response)
-- Suggest specific, actionable changes to improve ATS performance
-- Recommend skills/keywords to add, emphasize, or remove
-- Propose improvements to bullet points, focusing on quantifiable achievements
-- Suggest adjustments to prioritize most relevant experience based on job requirements
-- Recommend sections to expand, condense, or remove entirely
-
-### 3. OPTIMIZED RESUME SECTION (50% of response)
-- Create a fully revised resume in markdown format
-- Incorporate all recommended changes from earlier sections
-- Ensure perfect alignment with job requirements while maintaining honesty
-- Prioritize the most relevant experience and skills first
-- Use strong action verbs and quantifiable results
-- Format according to the specified resume style ({resume_format})
-- Maintain the requested tone ({tone})
-- Ensure the resume is scannable for both ATS and human readers
-- Keep the resume concise (1-2 pages equivalent)
-
-Important: Focus on creating a compelling, honest, and targeted resume that will pass ATS screening and impress hiring managers. Use your expertise to make strategic decisions about what to include, emphasize, or remove based on relevance to this specific position.
-'''
-
-            with st.spinner("Analyzing and generating suggestions..."):
-                try:
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful resume assistant."},
-                            {"role": "user", "content": prompt}
-                        ]
-                    )
-                    llm_suggestions = response.choices[0].message.content
-                except Exception as e:
-                    st.error(f"Error from LLM: {str(e)}")
-                    return
-
-            st.session_state.llm_context = [
-                {"role": "system", "content": "You are a helpful resume assistant."},
-                {"role": "user", "content": prompt},
-                {"role": "assistant", "content": llm_suggestions}
-            ]
-            st.session_state.llm_output = llm_suggestions
-            st.session_state.llm_last_prompt = prompt
-            st.session_state.awaiting_improvement = False
-            st.session_state.pdf_path = None
-            st.session_state.resume_db_id = None
+            # The prompts read a cached digest of the posting rather than the whole text
+            with st.spinner("Reading the job description..."):
+                description = job_description_for_prompt(
+                    job_description, user_id=user_id, on_wait=queue_position_notifier()
+                )
+
+            # Only the profile entries most relevant to the job go into the prompt
+            profile_data = select_profile_items(profile_data, f"{job_title}\n{job_description}")
+
+            # Construct the LLM prompts for the analysis and the resume
+            messages = build_generation_messages(profile_data, job_title, company, description, resume_format, tone)
+            try:
+                job_ids = submit_generation(messages, user_id=user_id)
+            except Exception as e:
+                st.error(f"Error from LLM: {str(e)}")
+                return
+            # The results are collected at the top of the next run
+            st.session_state.pending_job = {
+                "ids": job_ids,
+                "action": "generate",
+                "context": messages["resume"],
+                "prompt": messages["resume"][-1]["content"],
+                "job_description": job_description
+            }
             st.rerun()
 
     # 2. Show LLM output and improvement options
     if st.session_state.llm_output and not st.session_state.awaiting_improvement:
-        st.subheader("LLM Suggestions & Optimized Resume")
-        st.markdown(st.session_state.llm_output)
+        markdown_resume = extract_markdown_resume(st.session_state.llm_output)
+        if st.session_state.llm_analysis:
+            st.subheader("Analysis & Recommendations")
+            st.markdown(st.session_state.llm_analysis)
+        st.subheader("Optimized Resume")
+        with st.container(border=True):
+            st.markdown(markdown_resume)
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Accept & Continue"):
-                # Extract markdown resume
-                markdown_resume = extract_markdown_resume(st.session_state.llm_output)
                 # Save to DB
                 user = st.user
                 user_id = getattr(user, "sub", None)
@@ -242,33 +304,39 @@ Important: Focus on creating a compelling, honest, and targeted resume that will
                 resume_data = {
                     "title": title,
                     "company": title.split('@')[-1].strip() if '@' in title else title,
-                    "job_description": st.session_state.llm_last_prompt.split('Job Description:')[-1].split('### Formatting Preferences:')[0].strip(),
+                    # The prompt carries the digest, so the posting itself is kept separately
+                    "job_description": st.session_state.llm_job_description,
                     "resume_content": markdown_resume,
                     "format_type": st.session_state.llm_last_prompt.split('Resume Format: ')[-1].split('\n')[0],
                     "tone": st.session_state.llm_last_prompt.split('Writing Tone: ')[-1].split('\n')[0],
                     "tags": []
                 }
-                db_resume = db.create_resume(user_id, resume_data)
-                st.session_state.resume_db_id = db_resume.get('id') if db_resume else None
-                # Generate PDF
-                pdf_path = markdown_to_pdf_spire(markdown_resume)
-                st.session_state.pdf_path = pdf_path
+                if st.session_state.resume_db_id:
+                    # Accepting again after improvements updates the saved resume, writing only changed sections
+                    db_resume = db.update_resume(
+                        st.session_state.resume_db_id,
+                        {"resume_content": markdown_resume},
+                        current_content=st.session_state.resume_saved_content
+                    )
+                else:
+                    db_resume = db.create_resume(user_id, resume_data)
+                    st.session_state.resume_db_id = db_resume.get('id') if db_resume else None
+                st.session_state.resume_saved_content = to_resume_content(markdown_resume)
+                # Generate PDF in the background job pool
+                with st.spinner("Generating PDF..."):
+                    try:
+                        pdf_bytes = render_resume_pdf(markdown_resume, on_update=job_status_notifier())
+                    except Exception as e:
+                        st.error(f"Error generating PDF: {str(e)}")
+                        return
                 st.success("Resume saved and PDF generated!")
                 # Show download button
-                try:
-                    with open(pdf_path, "rb") as f:
-                        st.download_button(
-                            label="Download Resume PDF",
-                            data=f.read(),
-                            file_name="resume.pdf",
-                            mime="application/pdf"
-                        )
-                finally:
-                    # Clean up the PDF file
-                    try:
-                        os.unlink(pdf_path)
-                    except:
-                        pass
+                st.download_button(
+                    label="Download Resume PDF",
+                    data=pdf_bytes,
+                    file_name="resume.pdf",
+                    mime="application/pdf"
+                )
         with col2:
             if st.button("Suggest Improvements"):
                 st.session_state.awaiting_improvement = True
@@ -282,30 +350,33 @@ Important: Focus on creating a compelling, honest, and targeted resume that will
             if not user_feedback.strip():
                 st.warning("Please enter your suggestions.")
             else:
-                # Add user feedback to context and re-call LLM
-                context = st.session_state.llm_context or []
-                context.append({"role": "user", "content": f"Please improve the previous resume suggestions based on this feedback: {user_feedback}"})
-                with st.spinner("Regenerating suggestions with your feedback..."):
-                    try:
-                        response = client.chat.completions.create(
-                            model="gpt-4o",
-                            messages=context
-                        )
-                        llm_suggestions = response.choices[0].message.content
-                    except Exception as e:
-                        st.error(f"Error from LLM: {str(e)}")
-                        return
-                # Update session state
-                context.append({"role": "assistant", "content": llm_suggestions})
-                st.session_state.llm_context = context
-                st.session_state.llm_output = llm_suggestions
-                st.session_state.awaiting_improvement = False
+                # Add user feedback to context; a full regeneration continues from it if the edits fail
+                context = list(st.session_state.llm_context or [])
+                context.append({"role": "user", "content": f"Please improve the previous resume based on this feedback, replying with the full resume in the same fenced markdown block: {user_feedback}"})
+                # Ask only for edits to the affected sections, applied locally
+                edit_messages = SECTION_EDITS.messages(
+                    resume_markdown=extract_markdown_resume(st.session_state.llm_output),
+                    feedback=user_feedback
+                )
+                try:
+                    job_id = submit_resume_suggestions(
+                        edit_messages,
+                        operation="llm.edit_resume",
+                        user_id=getattr(st.user, "sub", None),
+                        response_format={"type": "json_object"}
+                    )
+                except Exception as e:
+                    st.error(f"Error from LLM: {str(e)}")
+                    return
+                # The result is collected at the top of the next run
+                st.session_state.pending_job = {"ids": {"edits": job_id}, "action": "edit", "context": context}
                 st.rerun()
 
 
 def main():
     if check_auth():
-        resume_builder_page()
+        with profile_run("resume_builder"):
+            resume_builder_page()
     else:
         st.warning("Please login to access this page.")
 
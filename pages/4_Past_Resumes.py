@@ -2,37 +2,37 @@ import streamlit as st
 from modules.auth.auth_utils import check_auth
 from modules.database.client import db
 from modules.utils.ui_utils import display_user_header
-from spire.doc import *
-from spire.doc.common import *
-import tempfile
-import os
+from modules.utils.pdf_utils import render_pdf_bytes
+from modules.utils.resume_content import resume_markdown
+from modules.monitoring.profiler import profile_run
 
-def markdown_to_pdf_spire(markdown_text):
-    # Save markdown to a temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.md', mode='w', encoding='utf-8') as mdfile:
-        mdfile.write(markdown_text)
-        md_path = mdfile.name
-    
-    try:
-        # Create a new Word document and load the markdown
-        document = Document()
-        document.LoadFromFile(md_path)
-        
-        # Create PDF in a new temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmpfile:
-            pdf_path = tmpfile.name
-        
-        # Save as PDF
-        document.SaveToFile(pdf_path, FileFormat.PDF)
-        document.Dispose()
-        
-        return pdf_path
-    finally:
-        # Clean up the markdown temp file
+def render_version_history(resume, history):
+    """Let the user pick an earlier version of a resume; it is rebuilt only when opened."""
+    resume_id = resume.get('id', '')
+    with st.expander(f"Version history ({len(history)} versions)"):
+        labels = {
+            version['version']: f"Version {version['version']} - {version.get('created_at', 'N/A')}"
+            for version in reversed(history)
+        }
+        selected = st.selectbox("Version", list(labels), format_func=labels.get, key=f"version_{resume_id}")
+        if st.button("Open version", key=f"open_version_{resume_id}"):
+            markdown = db.get_resume_version(resume_id, selected)
+            if markdown is None:
+                st.error("This version could not be loaded.")
+            else:
+                st.markdown(markdown)
+
+def pdf_download(resume):
+    """Deferred PDF for a resume, called by st.download_button when the user clicks it."""
+    content = resume.get('resume_content')
+
+    def render():
         try:
-            os.unlink(md_path)
-        except:
-            pass
+            return render_pdf_bytes(resume_markdown(content))
+        except Exception as e:
+            print(f"Error generating PDF: {str(e)}")
+            raise
+    return render
 
 def past_resumes_page():
     """Display the past resumes page."""
@@ -55,6 +55,11 @@ def past_resumes_page():
         st.info("You haven't created any resumes yet. Go to the Resume Builder to create your first resume!")
         return
     
+    # Version lists for every resume in one query, without their content
+    versions = {}
+    for version in db.get_resume_versions([resume.get('id') for resume in resumes]):
+        versions.setdefault(str(version['resume_id']), []).append(version)
+    
     # Display resumes
     for resume in resumes:
         with st.container(border=True):
@@ -67,31 +72,25 @@ def past_resumes_page():
                 st.text(f"Created: {resume.get('created_at', 'N/A')}")
             
             with col2:
-                if st.button("Download", key=f"download_{resume.get('id', '')}"):
-                    with st.spinner("Generating PDF..."):
-                        try:
-                            # Generate PDF from markdown content
-                            pdf_path = markdown_to_pdf_spire(resume.get('resume_content', ''))
-                            
-                            # Show download button
-                            with open(pdf_path, "rb") as f:
-                                st.download_button(
-                                    label="Click to Download",
-                                    data=f.read(),
-                                    file_name=f"{resume.get('title', 'resume')}.pdf",
-                                    mime="application/pdf",
-                                    key=f"download_btn_{resume.get('id', '')}"
-                                )
-                        finally:
-                            # Clean up the PDF file
-                            try:
-                                os.unlink(pdf_path)
-                            except:
-                                pass
+                # The PDF is rendered (or fetched from the shared cache) only when
+                # the button is clicked, and its bytes are never kept in the session
+                st.download_button(
+                    label="Download",
+                    data=pdf_download(resume),
+                    file_name=f"{resume.get('title', 'resume')}.pdf",
+                    mime="application/pdf",
+                    on_click="ignore",
+                    key=f"download_{resume.get('id', '')}"
+                )
+            
+            history = versions.get(str(resume.get('id')), [])
+            if len(history) > 1:
+                render_version_history(resume, history)
 
 def main():
     if check_auth():
-        past_resumes_page()
+        with profile_run("past_resumes"):
+            past_resumes_page()
     else:
         st.warning("Please login to access this page.")
 
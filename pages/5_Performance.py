@@ -0,0 +1,167 @@
+import streamlit as st
+from datetime import datetime
+from modules.auth.auth_utils import check_auth, is_admin
+from modules.utils.ui_utils import display_user_header
+from modules.ai.scheduler import get_scheduler
+from modules.monitoring.metrics import get_registry
+from modules.monitoring.tracing import get_exporter
+from modules.monitoring.exporters import RingBufferExporter
+from modules.monitoring.profiler import profile_run, render_profiler_toggle
+
+WINDOWS = {
+    "Last 5 minutes": 5 * 60,
+    "Last 15 minutes": 15 * 60,
+    "Last hour": 60 * 60,
+    "Last 24 hours": 24 * 60 * 60,
+}
+
+def render_operations(window_seconds):
+    """Latency, throughput and error rate per traced operation."""
+    rows = get_registry().operation_summary(window_seconds)
+    if not rows:
+        st.info("No traced operations in this window yet.")
+        return
+
+    total_calls = sum(row["calls"] for row in rows)
+    total_errors = sum(row["calls"] * row["error_rate"] for row in rows)
+    llm_rows = [row for row in rows if row["operation"].startswith("llm.")]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Calls", total_calls)
+    col2.metric("Error rate", f"{total_errors / total_calls:.1%}")
+    col3.metric("LLM tokens", sum(row["tokens"] for row in llm_rows))
+
+    st.subheader("Latency by operation")
+    st.dataframe(
+        rows,
+        hide_index=True,
+        column_config={
+            "operation": "Operation",
+            "calls": "Calls",
+            "per_minute": st.column_config.NumberColumn("Calls/min", format="%.2f"),
+            "error_rate": st.column_config.NumberColumn("Error rate", format="percent"),
+            "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.1f"),
+            "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.1f"),
+            "p99_ms": st.column_config.NumberColumn("p99 (ms)", format="%.1f"),
+            "max_ms": st.column_config.NumberColumn("max (ms)", format="%.1f"),
+            "tokens": "Tokens",
+            "ring_full": st.column_config.CheckboxColumn("Window truncated"),
+        },
+    )
+
+    if llm_rows:
+        st.subheader("LLM token spend")
+        st.bar_chart({row["operation"]: row["tokens"] for row in llm_rows}, horizontal=True)
+
+def render_llm_queue():
+    """Live state of the shared LLM scheduler."""
+    queue = get_scheduler().snapshot()
+    st.subheader("LLM queue")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Running", queue["running"])
+    col2.metric("Waiting", queue["waiting"])
+    col3.metric("Token budget left", "unlimited" if queue["tokens_available"] is None else queue["tokens_available"])
+
+def render_caches(window_seconds):
+    """Hit ratio per cache."""
+    rows = get_registry().cache_summary(window_seconds)
+    st.subheader("Cache hit ratios")
+    if not rows:
+        st.info("No cache lookups in this window yet.")
+        return
+    st.dataframe(
+        rows,
+        hide_index=True,
+        column_config={
+            "cache": "Cache",
+            "lookups": "Lookups",
+            "hits": "Hits",
+            "hit_ratio": st.column_config.ProgressColumn("Hit ratio", min_value=0.0, max_value=1.0, format="percent"),
+        },
+    )
+
+def render_hedges(window_seconds):
+    """How often hedged LLM requests were answered by the duplicate."""
+    rows = get_registry().hedge_summary(window_seconds)
+    if not rows:
+        return
+    st.subheader("Hedged LLM requests")
+    st.dataframe(
+        rows,
+        hide_index=True,
+        column_config={
+            "operation": "Operation",
+            "hedged": "Hedged",
+            "hedge_won": "Duplicate won",
+            "win_ratio": st.column_config.ProgressColumn("Win ratio", min_value=0.0, max_value=1.0, format="percent"),
+        },
+    )
+
+def render_recent_problems(slow_ms):
+    """Most recent failed or slow spans, when the ring exporter is enabled."""
+    ring = get_exporter(RingBufferExporter)
+    if ring is None:
+        return
+    problems = [
+        span for span in ring.snapshot()
+        if span.outcome != "ok" or span.duration_ms >= slow_ms
+    ][-50:]
+    st.subheader("Recent slow or failed calls")
+    if not problems:
+        st.info(f"No failed calls or calls slower than {slow_ms:.0f} ms.")
+        return
+    st.dataframe(
+        [
+            {
+                "time": datetime.fromtimestamp(span.start_time).strftime("%H:%M:%S"),
+                "operation": span.name,
+                "duration_ms": round(span.duration_ms, 1),
+                "outcome": span.outcome,
+                "error": span.error or "",
+            }
+            for span in reversed(problems)
+        ],
+        hide_index=True,
+    )
+
+def performance_page():
+    """Display the admin performance page."""
+    display_user_header()
+
+    st.title("Performance")
+    st.caption("Figures cover this server process only and reset when it restarts.")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        window_label = st.selectbox("Window", list(WINDOWS), index=1)
+    with col2:
+        slow_ms = st.number_input("Slow call threshold (ms)", min_value=0, value=2000, step=250)
+    with col3:
+        auto_refresh = st.toggle("Auto-refresh", value=False)
+
+    @st.fragment(run_every="10s" if auto_refresh else None)
+    def live_metrics():
+        window_seconds = WINDOWS[window_label]
+        render_operations(window_seconds)
+        render_llm_queue()
+        render_hedges(window_seconds)
+        render_caches(window_seconds)
+        render_recent_problems(slow_ms)
+
+    live_metrics()
+
+    st.subheader("Profiling")
+    st.caption("Profile each page run in this session with cProfile, or pyinstrument when installed.")
+    render_profiler_toggle()
+
+def main():
+    if not check_auth():
+        st.warning("Please login to access this page.")
+    elif not is_admin():
+        st.error("This page is only available to administrators.")
+    else:
+        with profile_run("performance"):
+            performance_page()
+
+if __name__ == "__main__":
+    main()